@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+from analytics.rollups import refresh
+
+
+class Command(BaseCommand):
+    help = (
+        "Recounts the analytics rollups of profiles whose data changed since "
+        "the last refresh, see analytics.rollups. Meant to run every few "
+        "minutes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        count = refresh(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Refreshed {count} profiles."))
@@ -0,0 +1,63 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('task_count', models.IntegerField(default=0)),
+                ('completed_count', models.IntegerField(default=0)),
+                ('overdue_count', models.IntegerField(default=0)),
+                ('priority_1_count', models.IntegerField(default=0)),
+                ('priority_2_count', models.IntegerField(default=0)),
+                ('priority_3_count', models.IntegerField(default=0)),
+                ('priority_4_count', models.IntegerField(default=0)),
+                ('day', models.DateField(unique=True)),
+                ('tasks_created', models.IntegerField(default=0)),
+                ('active_users', models.IntegerField(default=0)),
+                ('refreshed_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='OwnerStats',
+            fields=[
+                ('task_count', models.IntegerField(default=0)),
+                ('completed_count', models.IntegerField(default=0)),
+                ('overdue_count', models.IntegerField(default=0)),
+                ('priority_1_count', models.IntegerField(default=0)),
+                ('priority_2_count', models.IntegerField(default=0)),
+                ('priority_3_count', models.IntegerField(default=0)),
+                ('priority_4_count', models.IntegerField(default=0)),
+                ('owner_id', models.UUIDField(primary_key=True, serialize=False)),
+                ('data_version', models.PositiveBigIntegerField(default=0)),
+                ('refreshed_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='DailyActivity',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('owner_id', models.UUIDField()),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('day', 'owner_id'), name='unique_daily_activity')],
+            },
+        ),
+    ]
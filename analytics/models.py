@@ -0,0 +1,63 @@
+from django.db import models
+
+
+class TaskTotals(models.Model):
+    task_count = models.IntegerField(default=0)
+    completed_count = models.IntegerField(default=0)
+    # open tasks due before the day of the last refresh
+    overdue_count = models.IntegerField(default=0)
+    priority_1_count = models.IntegerField(default=0)
+    priority_2_count = models.IntegerField(default=0)
+    priority_3_count = models.IntegerField(default=0)
+    priority_4_count = models.IntegerField(default=0)
+
+    class Meta:
+        abstract = True
+
+
+class OwnerStats(TaskTotals):
+    """
+    Task totals of one profile as of ``data_version``, see
+    analytics.rollups. ``owner_id`` is a plain column so the rollup of a
+    deleted profile can still be subtracted from the daily totals.
+    """
+
+    owner_id = models.UUIDField(primary_key=True)
+    data_version = models.PositiveBigIntegerField(default=0)
+    refreshed_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return str(self.owner_id)
+
+
+class DailyStats(TaskTotals):
+    """
+    Site-wide numbers for one day. The totals are the sums of every
+    OwnerStats row as of the day's last refresh.
+    """
+
+    day = models.DateField(unique=True)
+    tasks_created = models.IntegerField(default=0)
+    active_users = models.IntegerField(default=0)
+    # None for days no refresh ran on, their totals are carried over
+    refreshed_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return str(self.day)
+
+
+class DailyActivity(models.Model):
+    """Profiles whose data changed on a day, counted into DailyStats."""
+
+    day = models.DateField()
+    owner_id = models.UUIDField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["day", "owner_id"], name="unique_daily_activity"
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.day}:{self.owner_id}"
@@ -0,0 +1,227 @@
+"""
+Site-wide task analytics, refreshed off each profile's data version.
+
+``OwnerStats`` holds the task totals of every profile together with the
+``data_version`` they were computed at, which acts as a per-profile high
+water mark: a refresh only recounts the profiles whose version moved (plus
+those with tasks that became overdue since the last refresh, and deleted
+ones), adds the differences to today's ``DailyStats`` row and records the
+changed profiles as active. ``tasks_created`` is recounted for the days
+since the last refresh off the ``created_at`` index.
+
+Reads never touch the tasks table, see analytics.views. The
+``refresh_analytics`` command runs a refresh and is meant to be scheduled
+every few minutes.
+"""
+
+from datetime import datetime, time, timedelta
+from django.apps import apps
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Exists, F, Model, OuterRef, Q
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+from .models import DailyActivity, DailyStats, OwnerStats
+
+# Models
+Task: Model = apps.get_model(settings.TASK_MODEL)
+Profile: Model = apps.get_model(settings.PROFILE_MODEL)
+
+TOTAL_FIELDS = (
+    "task_count",
+    "completed_count",
+    "overdue_count",
+    "priority_1_count",
+    "priority_2_count",
+    "priority_3_count",
+    "priority_4_count",
+)
+
+
+def owner_totals(owner_ids, today):
+    """Counts the tasks of the given profiles, to ``{owner_id: {field: n}}``."""
+    is_open = Q(is_completed=False)
+    rows = (
+        Task.objects.filter(owner_id__in=owner_ids)
+        .order_by()
+        .values("owner_id")
+        .annotate(
+            task_count=Count("id"),
+            completed_count=Count("id", filter=Q(is_completed=True)),
+            overdue_count=Count("id", filter=is_open & Q(due_date__lt=today)),
+            **{
+                f"priority_{value}_count": Count("id", filter=Q(priority=value))
+                for value, _ in Task.PRIORITY_CHOICES
+            },
+        )
+    )
+    return {row.pop("owner_id"): row for row in rows}
+
+
+def get_last_refresh():
+    return (
+        DailyStats.objects.filter(refreshed_at__isnull=False).order_by("-day").first()
+    )
+
+
+def get_today_stats(today):
+    """
+    Returns today's row, locked. Days since the last refresh start from its
+    totals, which are only ever changed by differences.
+    """
+    last = get_last_refresh()
+    carried = {}
+    if last is not None and last.day < today:
+        carried = {field: getattr(last, field) for field in TOTAL_FIELDS}
+        DailyStats.objects.bulk_create(
+            [
+                DailyStats(day=last.day + timedelta(days=offset), **carried)
+                for offset in range(1, (today - last.day).days)
+            ],
+            update_conflicts=True,
+            unique_fields=["day"],
+            update_fields=TOTAL_FIELDS,
+        )
+    DailyStats.objects.get_or_create(day=today, defaults=carried)
+    return DailyStats.objects.select_for_update().get(day=today)
+
+
+def dirty_owners(since):
+    """
+    Profiles whose rollup is out of date: changed since their last refresh,
+    never refreshed, deleted, or with open tasks that fell due on or after
+    ``since``.
+    """
+    current = OwnerStats.objects.filter(
+        owner_id=OuterRef("pk"), data_version=OuterRef("data_version")
+    )
+    ids = set(Profile.objects.filter(~Exists(current)).values_list("id", flat=True))
+    ids.update(
+        OwnerStats.objects.exclude(
+            owner_id__in=Profile.objects.values("id")
+        ).values_list("owner_id", flat=True)
+    )
+    if since is not None and since < timezone.localdate():
+        ids.update(
+            Task.objects.filter(
+                is_completed=False,
+                due_date__gte=since,
+                due_date__lt=timezone.localdate(),
+            )
+            .order_by()
+            .values_list("owner_id", flat=True)
+            .distinct()
+        )
+    return sorted(ids)
+
+
+def refresh_owners(owner_ids, today, record_activity=True):
+    """
+    Recounts the given profiles, stores their rollups and adds the
+    differences to today's totals. Profiles whose data changed since their
+    last rollup are counted as active, unless ``record_activity`` is off.
+    """
+    with transaction.atomic():
+        # serializes refreshes, the differences below assume nobody else
+        # is applying theirs
+        stats = get_today_stats(today)
+
+        versions = dict(
+            Profile.objects.filter(id__in=owner_ids).values_list("id", "data_version")
+        )
+        old = {
+            row.owner_id: row
+            for row in OwnerStats.objects.select_for_update().filter(
+                owner_id__in=owner_ids
+            )
+        }
+        new = owner_totals(list(versions), today)
+
+        deltas = dict.fromkeys(TOTAL_FIELDS, 0)
+        rows, active = [], []
+        for owner_id in owner_ids:
+            before = old.get(owner_id)
+            after = new.get(owner_id, dict.fromkeys(TOTAL_FIELDS, 0))
+            for field in TOTAL_FIELDS:
+                deltas[field] += after[field] - (
+                    getattr(before, field) if before else 0
+                )
+            if owner_id not in versions:
+                continue
+            if before is None or before.data_version != versions[owner_id]:
+                active.append(owner_id)
+            rows.append(
+                OwnerStats(owner_id=owner_id, data_version=versions[owner_id], **after)
+            )
+
+        OwnerStats.objects.filter(owner_id__in=set(old) - set(versions)).delete()
+        OwnerStats.objects.bulk_create(
+            rows,
+            update_conflicts=True,
+            unique_fields=["owner_id"],
+            update_fields=["data_version", *TOTAL_FIELDS, "refreshed_at"],
+        )
+
+        if record_activity:
+            DailyActivity.objects.bulk_create(
+                [DailyActivity(day=today, owner_id=owner_id) for owner_id in active],
+                ignore_conflicts=True,
+            )
+        DailyStats.objects.filter(pk=stats.pk).update(
+            **{field: F(field) + delta for field, delta in deltas.items() if delta},
+            active_users=DailyActivity.objects.filter(day=today).count(),
+            refreshed_at=timezone.now(),
+        )
+
+
+def refresh_created(since, today):
+    """Recounts ``tasks_created`` for the days from ``since`` to today."""
+    start = timezone.make_aware(datetime.combine(since, time.min))
+    created = dict(
+        Task.objects.filter(created_at__gte=start)
+        .order_by()
+        .annotate(day=TruncDate("created_at"))
+        .values("day")
+        .annotate(count=Count("id"))
+        .values_list("day", "count")
+    )
+    with transaction.atomic():
+        # days before the first refresh only get their created counts
+        DailyStats.objects.bulk_create(
+            [DailyStats(day=day) for day in created if day <= today],
+            ignore_conflicts=True,
+        )
+        for row in DailyStats.objects.filter(day__gte=min(created, default=since)):
+            if row.day <= today and row.tasks_created != created.get(row.day, 0):
+                row.tasks_created = created.get(row.day, 0)
+                row.save(update_fields=["tasks_created"])
+
+
+def refresh(batch_size=500):
+    """
+    Brings the rollups up to date, returns how many profiles were
+    recounted. The first run counts every profile without marking them
+    active and backfills ``tasks_created`` from the first task on.
+    """
+    today = timezone.localdate()
+    last = get_last_refresh()
+    last_day = last.day if last is not None else None
+
+    owner_ids = dirty_owners(last_day)
+    for start in range(0, len(owner_ids), batch_size):
+        refresh_owners(
+            owner_ids[start : start + batch_size],
+            today,
+            record_activity=last is not None,
+        )
+    if not owner_ids:
+        with transaction.atomic():
+            stats = get_today_stats(today)
+            DailyStats.objects.filter(pk=stats.pk).update(refreshed_at=timezone.now())
+
+    if last_day is None:
+        first = Task.objects.order_by("created_at").values_list("created_at", flat=True)
+        first = first.first()
+        last_day = timezone.localdate(first) if first else today
+    refresh_created(last_day, today)
+    return len(owner_ids)
@@ -0,0 +1,215 @@
+from datetime import timedelta
+from unittest import mock
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+from core.models import User
+from core.testing import create_account
+from tasks.models import Task
+from .models import DailyActivity, DailyStats, OwnerStats
+from .rollups import refresh
+
+
+class RollupTests(TestCase):
+    def setUp(self):
+        account = create_account()
+        self.profile = account.profile
+        other = create_account("other")
+        self.other_profile = other.profile
+        self.lists = {
+            account.profile.pk: account.task_list,
+            other.profile.pk: other.task_list,
+        }
+        self.today = timezone.localdate()
+
+    def task(self, profile=None, **fields):
+        profile = profile or self.profile
+        return Task.objects.create(
+            text="Task",
+            task_list=self.lists[profile.pk],
+            owner=profile,
+            **fields,
+        )
+
+    def stats(self, day=None):
+        return DailyStats.objects.get(day=day or self.today)
+
+    def assertTotals(self, stats, **totals):
+        self.assertEqual(
+            {field: getattr(stats, field) for field in totals}, totals, stats.day
+        )
+
+    def test_first_run_counts_every_profile(self):
+        self.task(is_completed=True, priority=Task.PRIORITY_1)
+        self.task(due_date=self.today - timedelta(days=1))
+        old = self.task(self.other_profile)
+        Task.objects.filter(pk=old.pk).update(
+            created_at=timezone.now() - timedelta(days=3)
+        )
+
+        self.assertEqual(refresh(), 2)
+
+        stats = self.stats()
+        self.assertTotals(
+            stats,
+            task_count=3,
+            completed_count=1,
+            overdue_count=1,
+            priority_1_count=1,
+            priority_4_count=2,
+            tasks_created=2,
+            # existing data is not activity
+            active_users=0,
+        )
+        self.assertIsNotNone(stats.refreshed_at)
+        self.assertEqual(self.stats(self.today - timedelta(days=3)).tasks_created, 1)
+        self.assertEqual(OwnerStats.objects.count(), 2)
+
+        # nothing changed, nothing is counted twice
+        self.assertEqual(refresh(), 0)
+        self.assertTotals(self.stats(), task_count=3, completed_count=1)
+
+    def test_edits_add_their_difference(self):
+        task = self.task()
+        self.task(self.other_profile)
+        refresh()
+
+        task.is_completed = True
+        task.priority = Task.PRIORITY_2
+        task.save()
+        self.task()
+
+        self.assertEqual(refresh(), 1)
+        self.assertTotals(
+            self.stats(),
+            task_count=3,
+            completed_count=1,
+            priority_2_count=1,
+            priority_4_count=2,
+            tasks_created=3,
+            active_users=1,
+        )
+        self.assertTrue(
+            DailyActivity.objects.filter(
+                day=self.today, owner_id=self.profile.pk
+            ).exists()
+        )
+
+    def test_deleted_tasks_are_subtracted(self):
+        self.task(is_completed=True)
+        overdue = self.task(due_date=self.today - timedelta(days=2))
+        refresh()
+
+        Task.objects.filter(owner=self.profile, is_completed=True).delete()
+        overdue.delete()
+
+        self.assertEqual(refresh(), 1)
+        self.assertTotals(
+            self.stats(),
+            task_count=0,
+            completed_count=0,
+            overdue_count=0,
+            priority_4_count=0,
+            active_users=1,
+        )
+
+    def test_deleted_profiles_are_subtracted(self):
+        self.task(is_completed=True)
+        self.task(self.other_profile)
+        self.task(self.other_profile, is_completed=True)
+        refresh()
+
+        self.other_profile.user.delete()
+
+        self.assertEqual(refresh(), 1)
+        self.assertTotals(self.stats(), task_count=1, completed_count=1)
+        self.assertEqual(
+            list(OwnerStats.objects.values_list("owner_id", flat=True)),
+            [self.profile.pk],
+        )
+        self.assertEqual(refresh(), 0)
+        self.assertTotals(self.stats(), task_count=1, completed_count=1)
+
+    def test_day_rollover(self):
+        self.task(due_date=self.today + timedelta(days=1))
+        self.task(is_completed=True, due_date=self.today)
+        refresh()
+
+        later = self.today + timedelta(days=2)
+        with mock.patch.object(timezone, "localdate", return_value=later):
+            # the open task fell due without its profile changing
+            self.assertEqual(refresh(), 1)
+
+        carried = self.stats(self.today + timedelta(days=1))
+        self.assertIsNone(carried.refreshed_at)
+        self.assertTotals(carried, task_count=2, completed_count=1, overdue_count=0)
+        self.assertTotals(
+            self.stats(later),
+            task_count=2,
+            completed_count=1,
+            overdue_count=1,
+            active_users=0,
+        )
+        self.assertTotals(self.stats(), task_count=2, overdue_count=0)
+
+
+class AnalyticsViewTests(TestCase):
+    def setUp(self):
+        account = create_account()
+        self.client = account.client
+        Task.objects.create(
+            text="Done",
+            task_list=account.task_list,
+            owner=account.profile,
+            is_completed=True,
+        )
+        Task.objects.create(
+            text="Open", task_list=account.task_list, owner=account.profile
+        )
+        admin = User.objects.create_user(
+            username="admin", email="admin@example.com", is_superuser=True
+        )
+        self.admin_client = APIClient()
+        self.admin_client.force_authenticate(admin)
+
+    def test_superusers_only(self):
+        self.assertEqual(self.client.get("/auth/analytics/").status_code, 403)
+        self.assertEqual(APIClient().get("/auth/analytics/").status_code, 401)
+
+    def test_reads_the_last_refresh(self):
+        response = self.admin_client.get("/auth/analytics/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["tasks"]["total"], 0)
+        self.assertIsNone(response.json()["tasks"]["completion_rate"])
+
+        refresh()
+
+        response = self.admin_client.get("/auth/analytics/", {"days": 7})
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data["day"], timezone.localdate().isoformat())
+        self.assertEqual(
+            data["tasks"],
+            {
+                "total": 2,
+                "completed": 1,
+                "open": 1,
+                "overdue": 0,
+                "completion_rate": 0.5,
+                "by_priority": {"1": 0, "2": 0, "3": 0, "4": 2},
+            },
+        )
+        self.assertEqual(
+            data["daily"],
+            [
+                {
+                    "day": timezone.localdate().isoformat(),
+                    "tasks_created": 2,
+                    "active_users": 0,
+                }
+            ],
+        )
+
+    def test_invalid_days(self):
+        response = self.admin_client.get("/auth/analytics/", {"days": 0})
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,57 @@
+from datetime import timedelta
+from django.apps import apps
+from django.conf import settings
+from django.db.models import Model
+from django.utils import timezone
+from rest_framework import serializers, status
+from rest_framework.response import Response
+from rest_framework.viewsets import ViewSet
+from core.permisions import IsSuperUser
+from .models import DailyStats
+from .rollups import get_last_refresh
+
+# Models
+Task: Model = apps.get_model(settings.TASK_MODEL)
+
+
+class AnalyticsQuerySerializer(serializers.Serializer):
+    days = serializers.IntegerField(min_value=1, max_value=366, default=30)
+
+
+class AnalyticsViewSet(ViewSet):
+    """
+    Site-wide task numbers, read from the rollups kept by analytics.rollups
+    rather than from the tasks table.
+
+    ``GET /auth/analytics/?days=30``
+    """
+
+    permission_classes = [IsSuperUser]
+
+    def list(self, request):
+        query = AnalyticsQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+
+        latest = get_last_refresh() or DailyStats()
+        since = timezone.localdate() - timedelta(days=query.validated_data["days"])
+        daily = DailyStats.objects.filter(day__gt=since).order_by("day")
+
+        total, completed = latest.task_count, latest.completed_count
+        data = {
+            "day": latest.day,
+            "refreshed_at": latest.refreshed_at,
+            "tasks": {
+                "total": total,
+                "completed": completed,
+                "open": total - completed,
+                "overdue": latest.overdue_count,
+                "completion_rate": round(completed / total, 4) if total else None,
+                "by_priority": {
+                    value: getattr(latest, f"priority_{value}_count")
+                    for value, _ in Task.PRIORITY_CHOICES
+                },
+            },
+            "active_users": latest.active_users,
+            "daily": list(daily.values("day", "tasks_created", "active_users")),
+        }
+        return Response(data, status=status.HTTP_200_OK)
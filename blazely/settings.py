@@ -52,6 +52,12 @@ INSTALLED_APPS = [
     "tasks",
     "tasklists",
     "grouplists",
+    "sync",
+    "search",
+    "reminders",
+    "exports",
+    "imports",
+    "analytics",
 ]
 
 MIDDLEWARE = [
@@ -153,13 +159,20 @@ REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
         "rest_framework_simplejwt.authentication.JWTAuthentication",
     ),
-    "DEFAULT_RENDERER_CLASSES": ("rest_framework.renderers.JSONRenderer",),
+    "DEFAULT_RENDERER_CLASSES": ("core.renderers.ORJSONRenderer",),
+    "DEFAULT_PARSER_CLASSES": (
+        "core.parsers.ORJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ),
+    "DEFAULT_PAGINATION_CLASS": "core.pagination.KeysetPagination",
+    "PAGE_SIZE": 50,
 }
 
 if DEBUG:
     REST_FRAMEWORK["DEFAULT_RENDERER_CLASSES"] = [
         "rest_framework.renderers.BrowsableAPIRenderer",
-        "rest_framework.renderers.JSONRenderer",
+        "core.renderers.ORJSONRenderer",
     ]
 
 
@@ -169,8 +182,18 @@ SIMPLE_JWT = {
     "AUTH_HEADER_TYPES": ("Bearer",),
     "ROTATE_REFRESH_TOKENS": True,
     "BLACKLIST_AFTER_ROTATION": True,
+    "TOKEN_OBTAIN_SERIALIZER": "core.serializers.ClaimsTokenObtainPairSerializer",
+    "TOKEN_REFRESH_SERIALIZER": "core.serializers.SessionTokenRefreshSerializer",
+    "TOKEN_BLACKLIST_SERIALIZER": "core.serializers.SessionTokenBlacklistSerializer",
 }
 
+# Swap JWTAuthentication for "core.authentication.StatelessJWTAuthentication"
+# to authenticate from token claims without loading the user. Revocations
+# (deactivation, superuser or password changes) apply within this interval.
+STATELESS_JWT_REVOCATION_REFRESH = timedelta(seconds=30)
+# A refresh token replaced this recently is still accepted, see core.tokens
+REFRESH_TOKEN_REUSE_INTERVAL = timedelta(seconds=30)
+
 if DEBUG:
     SIMPLE_JWT["ACCESS_TOKEN_LIFETIME"] = timedelta(
         seconds=int(os.getenv("ACCESS_TOKEN_LIFETIME_IN_SECONDS_FOR_DEBUG"))
@@ -185,6 +208,21 @@ SOCIAL_AUTH_GOOGLE_OAUTH2_SECRET = os.getenv("SOCIAL_AUTH_GOOGLE_OAUTH2_SECRET")
 SOCIAL_AUTH_GOOGLE_OAUTH2_REDIRECT_URI = os.getenv(
     "SOCIAL_AUTH_GOOGLE_OAUTH2_REDIRECT_URI"
 )
+# overridable to point at a local stub (manage.py run_google_stub)
+GOOGLE_TOKEN_URL = os.getenv("GOOGLE_TOKEN_URL", "https://oauth2.googleapis.com/token")
+GOOGLE_USERINFO_URL = os.getenv(
+    "GOOGLE_USERINFO_URL", "https://www.googleapis.com/oauth2/v3/userinfo"
+)
+GOOGLE_CERTS_URL = os.getenv(
+    "GOOGLE_CERTS_URL", "https://www.googleapis.com/oauth2/v1/certs"
+)
+# (connect, read) seconds, retries per request, pooled connections per host
+GOOGLE_HTTP_TIMEOUT = (3.05, 10)
+GOOGLE_HTTP_RETRIES = 2
+GOOGLE_HTTP_POOL_SIZE = 10
+# how long expired signing keys are served while they are refreshed, when
+# the certs response does not say
+GOOGLE_KEYS_STALE_WHILE_REVALIDATE = 3600
 
 
 # BLAZELY APP'S MODELS
@@ -202,3 +240,39 @@ TASKLIST_WITHOUT_GROUP_SERIALIZER = (
 
 # Blazely Custom Permissions
 IS_SUPER_USER = "core.permisions.IsSuperUser"
+
+# Blazely delta sync
+# rows committed up to this long before a cursor are sent again
+SYNC_CURSOR_OVERLAP = timedelta(seconds=5)
+# older cursors get a full snapshot, tombstones past this are purged
+SYNC_TOMBSTONE_RETENTION = timedelta(days=30)
+
+# Blazely reminders
+REMINDER_DELIVERY_BACKEND = "reminders.backends.LogBackend"
+REMINDER_FILE_PATH = os.getenv("REMINDER_FILE_PATH", BASE_DIR / "reminders.jsonl")
+# workers claim reminders this far ahead and hold them for the lease
+REMINDER_LOOKAHEAD = timedelta(seconds=60)
+REMINDER_LEASE = timedelta(minutes=5)
+
+# Blazely response cache, see core.response_cache. The shared tier uses the
+# RESPONSE_CACHE_ALIAS cache (local memory unless CACHES says otherwise)
+RESPONSE_CACHE_BACKEND = "core.response_cache.DjangoCacheBackend"
+RESPONSE_CACHE_ALIAS = "default"
+RESPONSE_CACHE_LOCAL_SIZE = 512
+RESPONSE_CACHE_TIMEOUT = 300
+# seconds concurrent misses wait for the request filling the entry
+RESPONSE_CACHE_FILL_TIMEOUT = 5
+
+# Serve list/retrieve reads from values() projections instead of serializer
+# instances, see core.projection
+READ_PROJECTIONS = True
+# rows read and rendered at a time by ?stream=true lists, see core.streaming
+STREAM_CHUNK_SIZE = 100
+
+# rows read and rendered at a time by exports.exporter
+EXPORT_CHUNK_SIZE = 2000
+# bytes of NDJSON written (or gzipped) at a time
+EXPORT_BLOCK_SIZE = 64 * 1024
+
+# tasks and steps inserted per bulk_create by imports.importer
+IMPORT_BATCH_SIZE = 1000
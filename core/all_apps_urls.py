@@ -3,6 +3,10 @@ from profiles.urls import router as profiles_router
 from grouplists.urls import router as group_router
 from tasklists.urls import router as list_router
 from tasks.urls import router as task_router
+from sync.urls import router as sync_router
+from search.urls import router as search_router
+from exports.urls import router as export_router
+from imports.urls import router as import_router
 from tasks.views import TaskViewSet, TaskStepViewSet
 from tasklists.views import TaskListViewSet
 from .urls import router as core_router
@@ -20,6 +24,18 @@ for r in list_router.registry:
 for r in task_router.registry:
     router.registry.append(r)
 
+for r in sync_router.registry:
+    router.registry.append(r)
+
+for r in search_router.registry:
+    router.registry.append(r)
+
+for r in export_router.registry:
+    router.registry.append(r)
+
+for r in import_router.registry:
+    router.registry.append(r)
+
 # for r in core_router.registry:
 #     router.registry.append(r)
 
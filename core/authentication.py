@@ -0,0 +1,150 @@
+"""
+Opt-in stateless JWT authentication.
+
+``StatelessJWTAuthentication`` builds the request user from the access
+token's claims instead of loading it from ``core_user``. To use it, replace
+``JWTAuthentication`` in ``DEFAULT_AUTHENTICATION_CLASSES``.
+
+Revocation: every user has a ``token_version`` which is bumped when the user
+is (de)activated, loses or gains superuser rights or changes password.
+Tokens carry the version they were issued with and are rejected once it is
+behind. The versions of users revoked within the last access token lifetime
+are kept in a per-process cache reloaded in the background every
+``STATELESS_JWT_REVOCATION_REFRESH``, so a revocation takes effect everywhere
+within that interval. Tokens issued before an older revocation have expired.
+"""
+
+import logging
+import threading
+import time
+from datetime import timedelta
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connections, transaction
+from django.utils import timezone
+from rest_framework_simplejwt.authentication import (
+    JWTAuthentication,
+    JWTStatelessUserAuthentication,
+)
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+from profiles.models import Profile
+from .models import RefreshSession
+from .principal import PROFILE_ID_CLAIM
+
+logger = logging.getLogger(__name__)
+
+TOKEN_VERSION_CLAIM = "ver"
+IS_SUPERUSER_CLAIM = "is_superuser"
+
+
+def add_user_claims(token, user):
+    """Adds the claims stateless authentication relies on to ``token``."""
+    token[IS_SUPERUSER_CLAIM] = user.is_superuser
+    token[TOKEN_VERSION_CLAIM] = user.token_version
+    profile_id = Profile.objects.filter(user=user).values_list("id", flat=True).first()
+    if profile_id is not None:
+        token[PROFILE_ID_CLAIM] = str(profile_id)
+    return token
+
+
+def revocation_window():
+    """How long a revocation has to be remembered, the longest a token lives."""
+    leeway = api_settings.LEEWAY
+    if not isinstance(leeway, timedelta):
+        leeway = timedelta(seconds=leeway)
+    return api_settings.ACCESS_TOKEN_LIFETIME + leeway
+
+
+class RevocationCache:
+    """
+    ``user id -> (token_version, is_active)`` of every user whose tokens were
+    revoked (version bumped or deactivated) recently enough that tokens
+    issued before may still be unexpired. Everyone else is absent.
+    """
+
+    def __init__(self, interval):
+        self.interval = interval
+        self.users = {}
+        self.loaded_at = None
+        self.lock = threading.Lock()
+        self.refresher = None
+
+    def is_revoked(self, user_id, token_version):
+        self.ensure_fresh()
+        state = self.users.get(str(user_id))
+        if state is None:
+            return False
+
+        version, is_active = state
+        return not is_active or token_version < version
+
+    def ensure_fresh(self):
+        if self.refresher is None:
+            with self.lock:
+                if self.refresher is None:
+                    self.refresher = threading.Thread(
+                        target=self.refresh_forever, name="jwt-revocations", daemon=True
+                    )
+                    self.refresher.start()
+
+        # first use, a local revocation or a stalled refresher
+        if (
+            self.loaded_at is None
+            or time.monotonic() - self.loaded_at > 2 * self.interval
+        ):
+            self.reload()
+
+    def reload(self):
+        User = get_user_model()
+        rows = User.objects.filter(
+            tokens_revoked_at__gte=timezone.now() - revocation_window()
+        ).values_list("id", "token_version", "is_active")
+        # keyed like the user id claim, which holds a string
+        self.users = {
+            str(user_id): (version, active) for user_id, version, active in rows
+        }
+        self.loaded_at = time.monotonic()
+
+    def refresh_forever(self):
+        while True:
+            time.sleep(self.interval)
+            try:
+                self.reload()
+            except Exception:
+                logger.exception("Reloading JWT revocations failed")
+            finally:
+                connections.close_all()
+
+    def invalidate(self):
+        self.loaded_at = None
+
+
+def revoke_tokens(user):
+    """
+    Bumps the user's token version and ends their refresh sessions, the
+    caller saves the user. Access tokens stop working at once in this
+    process and within the refresh interval elsewhere.
+    """
+    user.token_version += 1
+    user.tokens_revoked_at = timezone.now()
+    RefreshSession.objects.filter(user=user, revoked_at__isnull=True).update(
+        revoked_at=timezone.now()
+    )
+    transaction.on_commit(revocations.invalidate)
+
+
+revocations = RevocationCache(settings.STATELESS_JWT_REVOCATION_REFRESH.total_seconds())
+
+
+class StatelessJWTAuthentication(JWTStatelessUserAuthentication):
+    def get_user(self, validated_token):
+        if TOKEN_VERSION_CLAIM not in validated_token:
+            # issued before the claims existed
+            return JWTAuthentication.get_user(self, validated_token)
+
+        user = TokenUser(validated_token)
+        if revocations.is_revoked(user.id, validated_token[TOKEN_VERSION_CLAIM]):
+            raise AuthenticationFailed("Token has been revoked.", code="token_revoked")
+        return user
@@ -0,0 +1,78 @@
+import hashlib
+from django.utils.cache import patch_cache_control
+from django.utils.http import parse_etags
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from rest_framework.response import Response
+from profiles.versions import get_data_version
+from .principal import get_principal
+
+
+class NotModified(APIException):
+    status_code = status.HTTP_304_NOT_MODIFIED
+
+
+class ConditionalGetViewMixin:
+    """
+    View mixin answering the ``conditional_actions`` with strong ETags built
+    from the caller's data version (see ``profiles.versions``), the URL and
+    the negotiated media type. A request whose ``If-None-Match`` still
+    matches gets a 304 after a single lookup of that version.
+
+    Requests reading other owners' rows (superusers) get no ETag.
+    """
+
+    conditional_actions = ("list", "retrieve")
+
+    def get_data_version(self):
+        principal = get_principal(self.request)
+        if principal.is_superuser or principal.profile_id is None:
+            return None
+        return get_data_version(principal.profile_id)
+
+    def get_etag(self, request):
+        if request.method not in ("GET", "HEAD"):
+            return None
+        if self.action not in self.conditional_actions:
+            return None
+
+        version = self.data_version = self.get_data_version()
+        if version is None:
+            return None
+
+        key = "\n".join(
+            (
+                str(get_principal(request).profile_id),
+                request.get_full_path(),
+                request.accepted_media_type or "",
+            )
+        )
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=12).hexdigest()
+        return f'"{version}-{digest}"'
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        # the version is read before the rows, so a write racing this request
+        # can only make the ETag older than the body, never newer
+        self.data_version = None
+        self.etag = self.get_etag(request)
+        if self.etag is not None and self.etag in parse_etags(
+            request.headers.get("If-None-Match", "")
+        ):
+            raise NotModified()
+
+    def handle_exception(self, exc):
+        if isinstance(exc, NotModified):
+            return Response(status=status.HTTP_304_NOT_MODIFIED)
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        etag = getattr(self, "etag", None)
+        if etag is not None and response.status_code in (
+            status.HTTP_200_OK,
+            status.HTTP_304_NOT_MODIFIED,
+        ):
+            response["ETag"] = etag
+            patch_cache_control(response, private=True, no_cache=True)
+        return response
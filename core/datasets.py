@@ -0,0 +1,397 @@
+"""
+Synthetic datasets for load and performance testing.
+
+``DatasetGenerator`` creates users with their profiles, labels, groups,
+lists, tasks and steps. Account sizes are skewed the way real usage is:
+tasks per user follow a log-normal distribution, and a few "whale"
+accounts hold far more. Everything is drawn from one ``random.Random``
+seeded by the caller, so a seed always produces the same rows. Dates are
+relative to the day of generation.
+
+Rows bypass the ORM: ids are assigned up front, past the current maximum,
+so children can point at parents without reading anything back. Rows are
+written with ``COPY`` on PostgreSQL and ``executemany`` elsewhere, in
+transactions of about ``batch_size`` rows. List and group counters are
+computed while generating. Signals do not run, so search documents and
+analytics have to be rebuilt afterwards (``rebuild_search_index``,
+``refresh_analytics``).
+"""
+
+import io
+import math
+import random
+import uuid
+from datetime import datetime, time, timedelta
+from django.apps import apps
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.color import no_style
+from django.db import DEFAULT_DB_ALIAS, connection, connections, transaction
+from django.db.models import Max, Model
+from django.utils import timezone
+from tasks.models import Label, TaskStep
+
+# Models
+User = get_user_model()
+Profile: Model = apps.get_model(settings.PROFILE_MODEL)
+Task: Model = apps.get_model(settings.TASK_MODEL)
+TaskList: Model = apps.get_model(settings.TASKLIST_MODEL)
+GroupList: Model = apps.get_model(settings.GROUP_LIST_MODEL)
+
+VERBS = (
+    "Buy", "Call", "Email", "Review", "Fix", "Plan", "Book", "Write", "Clean",
+    "Pay", "Schedule", "Prepare", "Read", "Update", "Order", "Send", "Check",
+)  # fmt: skip
+NOUNS = (
+    "groceries", "report", "dentist", "slides", "invoice", "car", "garden",
+    "flights", "budget", "laundry", "newsletter", "tickets", "contract",
+    "presentation", "birthday gift", "taxes", "kitchen", "blog post",
+)  # fmt: skip
+LIST_NAMES = (
+    "Inbox", "Work", "Home", "Errands", "Shopping", "Ideas", "Reading",
+    "Travel", "Fitness", "Finance", "Projects", "Someday",
+)  # fmt: skip
+GROUP_NAMES = ("Personal", "Work", "Family", "Side projects", "Archive")
+LABEL_NAMES = ("urgent", "waiting", "quick", "deep work", "phone", "online")
+# Task.PRIORITY_CHOICES from 1 to 4
+PRIORITY_WEIGHTS = (5, 10, 15, 70)
+
+
+class Table:
+    """
+    Buffered rows of one model. ``fields`` names the columns the generator
+    fills, every other concrete column is written with its default.
+    """
+
+    def __init__(self, model, fields):
+        self.model = model
+        by_name = {field.name: field for field in model._meta.concrete_fields}
+        self.fields = [by_name[name] for name in fields]
+        rest = [field for field in by_name.values() if field.name not in fields]
+        self.defaults = tuple(field.get_default() for field in rest)
+        for field, default in zip(rest, self.defaults):
+            if default is None and not field.null:
+                raise ValueError(f"{model.__name__}.{field.name} needs a value.")
+        self.fields += rest
+        self.rows = []
+        self.written = 0
+
+    def next_id(self):
+        return (self.model.objects.aggregate(last=Max("pk"))["last"] or 0) + 1
+
+    def append(self, *values):
+        self.rows.append(values + self.defaults)
+
+    def flush(self, cursor):
+        if not self.rows:
+            return
+        if connection.vendor == "postgresql":
+            self.copy(cursor)
+        else:
+            self.insert(cursor)
+        self.written += len(self.rows)
+        self.rows = []
+
+    def insert(self, cursor):
+        # the connection itself, attribute lookups on the proxy add up
+        db = connections[DEFAULT_DB_ALIAS]
+        adapters = {
+            "DateField": db.ops.adapt_datefield_value,
+            "DateTimeField": db.ops.adapt_datetimefield_value,
+            "UUIDField": lambda value: (
+                value if db.features.has_native_uuid_field else value and value.hex
+            ),
+        }
+        prepare = []
+        for index, field in enumerate(self.fields):
+            kind = (
+                field.target_field if field.is_relation else field
+            ).get_internal_type()
+            if kind in adapters:
+                prepare.append((index, adapters[kind]))
+
+        rows = self.rows
+        if prepare:
+            rows = []
+            for row in self.rows:
+                row = list(row)
+                for index, adapt in prepare:
+                    row[index] = adapt(row[index])
+                rows.append(row)
+
+        columns = ", ".join(connection.ops.quote_name(f.column) for f in self.fields)
+        cursor.executemany(
+            f"INSERT INTO {connection.ops.quote_name(self.model._meta.db_table)} "
+            f"({columns}) VALUES ({', '.join(['%s'] * len(self.fields))})",
+            rows,
+        )
+
+    def copy(self, cursor):
+        formats = [copy_format(field) for field in self.fields]
+        buffer = io.StringIO()
+        for row in self.rows:
+            buffer.write(
+                "\t".join([format(value) for format, value in zip(formats, row)])
+            )
+            buffer.write("\n")
+        buffer.seek(0)
+
+        columns = ", ".join(connection.ops.quote_name(f.column) for f in self.fields)
+        cursor.cursor.copy_expert(
+            f"COPY {connection.ops.quote_name(self.model._meta.db_table)} "
+            f"({columns}) FROM STDIN",
+            buffer,
+        )
+
+
+COPY_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+
+def copy_format(field):
+    """Returns the function writing the field's values in COPY's text format."""
+    kind = (field.target_field if field.is_relation else field).get_internal_type()
+    if kind == "BooleanField":
+        return {True: "t", False: "f", None: "\\N"}.__getitem__
+    if kind in ("CharField", "TextField", "EmailField", "URLField"):
+        return lambda value: "\\N" if value is None else value.translate(COPY_ESCAPES)
+    return lambda value: "\\N" if value is None else str(value)
+
+
+class DatasetGenerator:
+    def __init__(
+        self,
+        users,
+        seed=0,
+        whales=0,
+        whale_tasks=50_000,
+        median_tasks=40,
+        prefix="load",
+        password=None,
+        days=365,
+        batch_size=50_000,
+        progress=None,
+    ):
+        self.users = users
+        self.rng = random.Random(seed)
+        self.whales = min(whales, users)
+        self.whale_tasks = whale_tasks
+        self.median_tasks = median_tasks
+        self.prefix = prefix
+        self.password = make_password(password)
+        self.batch_size = batch_size
+        self.progress = progress
+
+        self.today = timezone.localdate()
+        self.now = timezone.make_aware(datetime.combine(self.today, time.min))
+        self.start = self.now - timedelta(days=days)
+
+        self.tables = {
+            User: Table(
+                User,
+                ["id", "password", "username", "email", "date_joined", "is_active"],
+            ),
+            Profile: Table(Profile, ["id", "user", "created_at"]),
+            Label: Table(Label, ["id", "name", "owner", "created_at", "updated_at"]),
+            GroupList: Table(
+                GroupList,
+                [
+                    "id",
+                    "name",
+                    "owner",
+                    "task_count",
+                    "completed_count",
+                    "important_count",
+                    "overdue_count",
+                    "created_at",
+                    "updated_at",
+                ],
+            ),
+            TaskList: Table(
+                TaskList,
+                [
+                    "id",
+                    "name",
+                    "owner",
+                    "group",
+                    "task_count",
+                    "completed_count",
+                    "important_count",
+                    "overdue_count",
+                    "created_at",
+                    "updated_at",
+                ],
+            ),
+            Task: Table(
+                Task,
+                [
+                    "id",
+                    "text",
+                    "note",
+                    "is_completed",
+                    "is_important",
+                    "due_date",
+                    "reminder_date",
+                    "priority",
+                    "label",
+                    "task_list",
+                    "owner",
+                    "created_at",
+                    "updated_at",
+                ],
+            ),
+            TaskStep: Table(
+                TaskStep, ["id", "text", "task", "created_at", "updated_at"]
+            ),
+        }
+        self.ids = {}
+
+    def run(self):
+        """Generates every user, returns the rows written per model."""
+        for model, table in self.tables.items():
+            if model is not Profile:
+                self.ids[model] = table.next_id()
+
+        rng = self.rng
+        whales = set(rng.sample(range(self.users), self.whales))
+        # log-normal with the requested median and a long tail
+        mu, sigma = math.log(max(self.median_tasks, 1)), 1.1
+        for number in range(self.users):
+            if number in whales:
+                tasks = int(self.whale_tasks * rng.uniform(0.5, 1.5))
+            else:
+                tasks = min(int(rng.lognormvariate(mu, sigma)), self.whale_tasks // 4)
+            self.add_user(number, tasks)
+            if self.pending() >= self.batch_size:
+                self.flush()
+        self.flush()
+
+        with connection.cursor() as cursor:
+            for sql in connection.ops.sequence_reset_sql(no_style(), list(self.tables)):
+                cursor.execute(sql)
+        return {model: table.written for model, table in self.tables.items()}
+
+    def pending(self):
+        return sum(len(table.rows) for table in self.tables.values())
+
+    def flush(self):
+        with transaction.atomic(), connection.cursor() as cursor:
+            # parents first
+            for table in self.tables.values():
+                table.flush(cursor)
+        if self.progress is not None:
+            self.progress({model: t.written for model, t in self.tables.items()})
+
+    def take_id(self, model):
+        value = self.ids[model]
+        self.ids[model] += 1
+        return value
+
+    def moment(self, after):
+        # a time between ``after`` and now, most of them recent
+        span = (self.now - after).total_seconds()
+        return after + timedelta(seconds=span * (1 - self.rng.random() ** 3))
+
+    def add_user(self, number, tasks):
+        rng = self.rng
+        tables = self.tables
+
+        user_id = self.take_id(User)
+        name = f"{self.prefix}-{user_id}"
+        owner_id = uuid.uuid5(uuid.NAMESPACE_URL, f"{name}@example.com")
+        joined = self.start + (self.now - self.start) * rng.random()
+        tables[User].append(
+            user_id, self.password, name, f"{name}@example.com", joined, True
+        )
+        tables[Profile].append(owner_id, user_id, joined)
+
+        labels = []
+        for index in range(rng.choice((0, 0, 1, 2, 3, 5, 8))):
+            label_id = self.take_id(Label)
+            created = self.moment(joined)
+            name = f"{LABEL_NAMES[index % len(LABEL_NAMES)]} {index}"
+            tables[Label].append(label_id, name, owner_id, created, created)
+            labels.append(label_id)
+
+        list_count = max(1, min(round(tasks / rng.uniform(10, 40)), 200))
+        group_count = rng.randint(1, max(1, list_count // 3)) if list_count > 2 else 0
+        groups = [[self.take_id(GroupList), 0, 0, 0, 0] for _ in range(group_count)]
+        lists = [
+            [self.take_id(TaskList), 0, 0, 0, 0, rng.choice(groups) if groups else None]
+            for _ in range(list_count)
+        ]
+        list_created = [self.moment(joined) for _ in lists]
+
+        steps = tables[TaskStep]
+        for _ in range(tasks):
+            # a few lists hold most of the tasks
+            index = int(list_count * rng.random() ** 2)
+            counters = lists[index]
+            task_id = self.take_id(Task)
+            created = self.moment(list_created[index])
+            updated = self.moment(created)
+
+            is_completed = rng.random() < 0.4
+            is_important = rng.random() < 0.1
+            due_date = reminder = None
+            if rng.random() < 0.35:
+                due_date = self.today + timedelta(days=rng.randint(-30, 60))
+                if rng.random() < 0.15:
+                    reminder = self.now + timedelta(
+                        days=(due_date - self.today).days, hours=rng.randint(8, 20)
+                    )
+
+            counters[1] += 1
+            counters[2] += is_completed
+            counters[3] += is_important and not is_completed
+            counters[4] += (
+                not is_completed and due_date is not None and due_date < self.today
+            )
+            tables[Task].append(
+                task_id,
+                f"{rng.choice(VERBS)} {rng.choice(NOUNS)}",
+                "Remember to check the details" if rng.random() < 0.2 else None,
+                is_completed,
+                is_important,
+                due_date,
+                reminder,
+                str(rng.choices((1, 2, 3, 4), PRIORITY_WEIGHTS)[0]),
+                rng.choice(labels) if labels and rng.random() < 0.2 else None,
+                counters[0],
+                owner_id,
+                created,
+                updated,
+            )
+            if rng.random() < 0.3:
+                for step in range(1 + int(rng.expovariate(0.6))):
+                    steps.append(
+                        self.take_id(TaskStep),
+                        f"Step {step + 1}",
+                        task_id,
+                        updated,
+                        updated,
+                    )
+
+        for index, (list_id, *counts, group) in enumerate(lists):
+            if group is not None:
+                for position, count in enumerate(counts, start=1):
+                    group[position] += count
+            tables[TaskList].append(
+                list_id,
+                f"{LIST_NAMES[index % len(LIST_NAMES)]} {index}",
+                owner_id,
+                group[0] if group is not None else None,
+                *counts,
+                list_created[index],
+                list_created[index],
+            )
+        for index, (group_id, *counts) in enumerate(groups):
+            created = self.moment(joined)
+            tables[GroupList].append(
+                group_id,
+                f"{GROUP_NAMES[index % len(GROUP_NAMES)]} {index}",
+                owner_id,
+                *counts,
+                created,
+                created,
+            )
@@ -0,0 +1,37 @@
+import threading
+from django.db.models.signals import post_delete, pre_delete
+
+
+class DeletionBuffer(threading.local):
+    """
+    Collects the rows removed by one ``delete()``, cascades included, and
+    hands them to ``flush`` together as ``(model, instance)`` pairs.
+
+    Django sends ``pre_delete`` for every collected row before it deletes
+    any, so the buffer is complete at the first ``post_delete`` of the same
+    delete (the same ``origin``), while the rows are gone but the
+    transaction is still open.
+    """
+
+    def __init__(self, flush):
+        self.flush = flush
+        self.origin = None
+        self.instances = None
+
+    def connect(self, *models):
+        for model in models:
+            pre_delete.connect(self.collect, sender=model, weak=False)
+            post_delete.connect(self.release, sender=model, weak=False)
+
+    def collect(self, sender, instance, origin=None, **kwargs):
+        # a delete that failed after its pre_delete signals leaves a stale
+        # buffer behind, the next delete starts over
+        if self.instances is None or self.origin is not origin:
+            self.origin, self.instances = origin, []
+        self.instances.append((sender, instance))
+
+    def release(self, sender, instance, origin=None, **kwargs):
+        if self.instances is None or self.origin is not origin:
+            return
+        instances, self.origin, self.instances = self.instances, None, None
+        self.flush(instances)
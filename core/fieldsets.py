@@ -0,0 +1,133 @@
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import SAFE_METHODS
+
+
+class FieldSet:
+    """
+    Describes which serializer fields a read request asked for.
+
+    Built from the ``?fields=``, ``?omit=`` and ``?depth=`` query parameters.
+    Paths use dots to reach into nested serializers, e.g.
+    ``?fields=id,name,lists.name`` or ``?omit=lists.tasks.steps``.
+    ``depth`` caps how many levels of nested serializers are rendered,
+    ``depth=0`` renders no nested serializers at all.
+    """
+
+    def __init__(self, fields=None, omit=None, depth=None):
+        self.include = self._build_tree(fields) if fields else None
+        self.omit = [tuple(path.split(".")) for path in omit or []]
+        self.depth = depth
+
+    @classmethod
+    def from_query_params(cls, query_params):
+        fields = cls._split(query_params.get("fields"))
+        omit = cls._split(query_params.get("omit"))
+        depth = query_params.get("depth")
+
+        if depth is not None:
+            try:
+                depth = int(depth)
+            except ValueError:
+                depth = -1
+            if depth < 0:
+                raise ValidationError({"depth": "Depth must be a non-negative integer."})
+
+        if not fields and not omit and depth is None:
+            return None
+
+        return cls(fields=fields, omit=omit, depth=depth)
+
+    @staticmethod
+    def _split(value):
+        if not value:
+            return []
+        return [item.strip() for item in value.split(",") if item.strip()]
+
+    @staticmethod
+    def _build_tree(paths):
+        tree = {}
+        for path in paths:
+            node = tree
+            for name in path.split("."):
+                node = node.setdefault(name, {})
+        return tree
+
+    def allows(self, path, nested=False):
+        """
+        Returns whether the field at ``path`` (a tuple of field names from the
+        root serializer) should be rendered. ``nested`` marks serializer
+        fields, which also count against ``depth``.
+        """
+        if nested and self.depth is not None and len(path) > self.depth:
+            return False
+
+        if any(path[: len(omitted)] == omitted for omitted in self.omit):
+            return False
+
+        node = self.include
+        for name in path:
+            # an empty node means everything below it was requested
+            if node is None or not node:
+                return True
+            if name not in node:
+                return False
+            node = node[name]
+
+        return True
+
+    def _key(self):
+        return (repr(self.include), tuple(self.omit), self.depth)
+
+    def __eq__(self, other):
+        return isinstance(other, FieldSet) and self._key() == other._key()
+
+    def __hash__(self):
+        return hash(self._key())
+
+
+class SparseFieldsMixin:
+    """
+    Serializer mixin dropping the fields excluded by the ``fieldset`` found
+    in the serializer context.
+    """
+
+    def get_field_path(self):
+        path = []
+        node = self
+        while node.parent is not None:
+            if node.field_name:
+                path.append(node.field_name)
+            node = node.parent
+
+        return tuple(reversed(path))
+
+    def get_fields(self):
+        fields = super().get_fields()
+        fieldset = self.context.get("fieldset")
+        if fieldset is None:
+            return fields
+
+        path = self.get_field_path()
+        return {
+            name: field
+            for name, field in fields.items()
+            if fieldset.allows(
+                path + (name,), nested=isinstance(field, serializers.BaseSerializer)
+            )
+        }
+
+
+class SparseFieldsViewMixin:
+    """
+    View mixin parsing the request's fieldset. Only safe methods are
+    narrowed, so write validation always sees every field.
+    """
+
+    def get_fieldset(self):
+        if not hasattr(self, "_fieldset"):
+            self._fieldset = None
+            if self.request.method in SAFE_METHODS:
+                self._fieldset = FieldSet.from_query_params(self.request.query_params)
+
+        return self._fieldset
@@ -0,0 +1,162 @@
+"""
+HTTP plumbing for the Google sign-in flows.
+
+- one pooled ``httpx.AsyncClient`` per event loop, closed with the loop,
+  with connect/read timeouts and a bounded retry budget for failed
+  connections (authorization codes are single use, nothing else is retried)
+- a process-wide cache of Google's ID token signing keys which honours the
+  ``Cache-Control`` of the certs endpoint: fresh keys are served from memory,
+  stale ones while a background refresh runs (``stale-while-revalidate``)
+
+The endpoints come from the ``GOOGLE_*_URL`` settings so a local stub
+(``core.google_stub``) can stand in for Google.
+"""
+
+import asyncio
+import logging
+import re
+import threading
+import time
+import weakref
+import httpx
+from django.conf import settings
+from google.auth import jwt as google_jwt
+
+logger = logging.getLogger(__name__)
+
+_async_clients = weakref.WeakKeyDictionary()
+
+
+async def _close_with_loop(client):
+    # asyncio.run() finalizes the async generators still suspended on its
+    # loop before closing it, async_to_sync and the ASGI servers run on it
+    try:
+        yield
+    finally:
+        await client.aclose()
+
+
+async def get_async_http_client():
+    """
+    Returns the pooled async client of the running event loop. It is closed
+    when the loop shuts down, under WSGI that is after every request.
+    """
+    loop = asyncio.get_running_loop()
+    entry = _async_clients.get(loop)
+    if entry is None:
+        connect, read = settings.GOOGLE_HTTP_TIMEOUT
+        transport = httpx.AsyncHTTPTransport(
+            retries=settings.GOOGLE_HTTP_RETRIES,
+            limits=httpx.Limits(max_connections=settings.GOOGLE_HTTP_POOL_SIZE),
+        )
+        client = httpx.AsyncClient(
+            timeout=httpx.Timeout(read, connect=connect), transport=transport
+        )
+        entry = _async_clients[loop] = (client, _close_with_loop(client))
+        await anext(entry[1])
+    return entry[0]
+
+
+def parse_cache_control(value):
+    """Returns ``(max_age, stale_while_revalidate)`` in seconds."""
+    directives = {}
+    for part in (value or "").lower().split(","):
+        name, _, argument = part.strip().partition("=")
+        directives[name] = argument.strip('"')
+
+    if "no-store" in directives or "no-cache" in directives:
+        return 0, 0
+
+    def seconds(name, default):
+        argument = directives.get(name, "")
+        return int(argument) if re.fullmatch(r"\d+", argument) else default
+
+    return (
+        seconds("max-age", 0),
+        seconds(
+            "stale-while-revalidate",
+            settings.GOOGLE_KEYS_STALE_WHILE_REVALIDATE,
+        ),
+    )
+
+
+class GoogleKeyCache:
+    def __init__(self):
+        self.url = None
+        self.keys = None
+        self.fresh_until = 0
+        self.stale_until = 0
+        self.lock = threading.Lock()
+        self.refreshing = False
+
+    def cached(self):
+        """Returns the keys unless they must be fetched before use."""
+        if self.url != settings.GOOGLE_CERTS_URL:
+            self.keys = None
+
+        now = time.monotonic()
+        if self.keys is not None and now < self.fresh_until:
+            return self.keys
+        if self.keys is not None and now < self.stale_until:
+            self.refresh_in_background()
+            return self.keys
+        return None
+
+    async def aget(self):
+        keys = self.cached()
+        if keys is None:
+            await self.afetch()
+            keys = self.keys
+        return keys
+
+    async def afetch(self):
+        url = settings.GOOGLE_CERTS_URL
+        client = await get_async_http_client()
+        self.store(url, await client.get(url))
+
+    def store(self, url, response):
+        response.raise_for_status()
+        max_age, stale = parse_cache_control(response.headers.get("Cache-Control"))
+
+        now = time.monotonic()
+        self.url = url
+        self.keys = response.json()
+        self.fresh_until = now + max_age
+        self.stale_until = now + max_age + stale
+
+    def refresh_in_background(self):
+        with self.lock:
+            if self.refreshing:
+                return
+            self.refreshing = True
+
+        async def refresh():
+            try:
+                await self.afetch()
+            except Exception:
+                logger.exception("Refreshing Google signing keys failed")
+            finally:
+                self.refreshing = False
+
+        # on a loop of its own, the request's may end first (async_to_sync
+        # under WSGI) and cancel it
+        threading.Thread(
+            target=asyncio.run, args=(refresh(),), name="google-keys", daemon=True
+        ).start()
+
+
+key_cache = GoogleKeyCache()
+
+
+async def averify_google_id_token(token):
+    """
+    Verifies a Google ID token against the cached keys and returns its
+    claims. Raises ``ValueError`` for invalid tokens and ``httpx.HTTPError``
+    when the keys cannot be fetched.
+    """
+    return google_jwt.decode(
+        token,
+        certs=await key_cache.aget(),
+        audience=settings.SOCIAL_AUTH_GOOGLE_WEBCLIENT_ID,
+        clock_skew_in_seconds=10,
+    )
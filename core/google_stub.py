@@ -0,0 +1,157 @@
+"""
+A local stand-in for Google's OAuth endpoints, for tests and benchmarks.
+
+    stub = GoogleStub(latency=0.05).start()
+    with override_settings(**stub.settings()):
+        ...  # sign in with stub.mint_id_token("a@example.com")
+    stub.stop()
+
+Authorization codes are the email to sign in as. The stub counts requests
+per path in ``hits``.
+"""
+
+import json
+import threading
+import time
+import uuid
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from django.conf import settings
+from google.auth import crypt
+from google.auth import jwt as google_jwt
+
+ISSUER = "https://accounts.google.com"
+
+
+class GoogleStub:
+    def __init__(self, host="127.0.0.1", port=0, latency=0, max_age=3600):
+        self.latency = latency
+        self.max_age = max_age
+        self.hits = Counter()
+        self.key_id = uuid.uuid4().hex
+
+        key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        private_pem = key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        )
+        self.public_pem = (
+            key.public_key()
+            .public_bytes(
+                serialization.Encoding.PEM,
+                serialization.PublicFormat.SubjectPublicKeyInfo,
+            )
+            .decode()
+        )
+        self.signer = crypt.RSASigner.from_string(private_pem, key_id=self.key_id)
+
+        self.server = ThreadingHTTPServer((host, port), self.build_handler())
+        self.server.daemon_threads = True
+        self.thread = None
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def settings(self):
+        """Setting overrides pointing the Google flows at this stub."""
+        return {
+            "GOOGLE_TOKEN_URL": f"{self.url}/token",
+            "GOOGLE_USERINFO_URL": f"{self.url}/userinfo",
+            "GOOGLE_CERTS_URL": f"{self.url}/certs",
+        }
+
+    def start(self):
+        self.thread = threading.Thread(
+            target=self.server.serve_forever, name="google-stub", daemon=True
+        )
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def profile(self, email):
+        name = email.split("@")[0]
+        return {
+            "email": email,
+            "email_verified": True,
+            "given_name": name.title(),
+            "family_name": "Stub",
+            "picture": f"https://example.com/{name}.png",
+        }
+
+    def mint_id_token(self, email, audience=None, lifetime=3600):
+        now = int(time.time())
+        payload = dict(
+            self.profile(email),
+            iss=ISSUER,
+            aud=audience or settings.SOCIAL_AUTH_GOOGLE_WEBCLIENT_ID,
+            sub=uuid.uuid5(uuid.NAMESPACE_URL, email).hex,
+            iat=now,
+            exp=now + lifetime,
+        )
+        return google_jwt.encode(self.signer, payload).decode()
+
+    def build_handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def send_json(self, payload, status=200, headers=()):
+                body = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                for name, value in headers:
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                stub.hits[self.path] += 1
+                time.sleep(stub.latency)
+                if self.path == "/certs":
+                    cache_control = f"public, max-age={stub.max_age}"
+                    self.send_json(
+                        {stub.key_id: stub.public_pem},
+                        headers=[("Cache-Control", cache_control)],
+                    )
+                elif self.path == "/userinfo":
+                    token = self.headers.get("Authorization", "")
+                    email = token.removeprefix("Bearer stub-")
+                    if "@" not in email:
+                        self.send_json({"error": "invalid_token"}, status=401)
+                    else:
+                        self.send_json(stub.profile(email))
+                else:
+                    self.send_json({"error": "not_found"}, status=404)
+
+            def do_POST(self):
+                stub.hits[self.path] += 1
+                time.sleep(stub.latency)
+                length = int(self.headers.get("Content-Length") or 0)
+                form = parse_qs(self.rfile.read(length).decode())
+                email = form.get("code", [""])[0]
+                if self.path != "/token" or "@" not in email:
+                    self.send_json({"error": "invalid_grant"}, status=400)
+                    return
+
+                self.send_json(
+                    {
+                        "access_token": f"stub-{email}",
+                        "id_token": stub.mint_id_token(email),
+                        "token_type": "Bearer",
+                        "expires_in": 3599,
+                    }
+                )
+
+        return Handler
@@ -0,0 +1,556 @@
+import json
+import math
+import re
+import time
+from io import StringIO
+from django.conf import settings
+from django.core.cache import caches
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Count
+from django.test.utils import (
+    CaptureQueriesContext,
+    setup_test_environment,
+    teardown_test_environment,
+)
+from django.urls import URLResolver, get_resolver
+from django.utils import timezone
+from rest_framework.test import APIClient
+from analytics.rollups import refresh as refresh_analytics
+from core.datasets import NOUNS, DatasetGenerator
+from core.models import User
+from core.response_cache import get_response_cache
+from core.services import get_tokens_for_user
+from profiles.models import Profile
+from tasklists.models import TaskList
+from tasks.models import Label, Task, TaskStep
+from .benchmark_streaming import peak_memory
+
+REPORT_VERSION = 1
+URLCONFS = ("core.all_apps_urls", "core.urls")
+
+# DatasetGenerator arguments of each dataset size
+SIZES = {
+    "small": {"users": 50, "whales": 1, "whale_tasks": 2_000, "median_tasks": 20},
+    "medium": {"users": 200, "whales": 2, "whale_tasks": 10_000, "median_tasks": 40},
+    "large": {"users": 1000, "whales": 3, "whale_tasks": 50_000, "median_tasks": 40},
+}
+
+# the owner with the most tasks, the one with the median amount, a superuser
+WHALE, TYPICAL, SUPERUSER = "whale", "typical", "superuser"
+PRINCIPALS = (WHALE, TYPICAL, SUPERUSER)
+OWNERS = (WHALE, TYPICAL)
+
+PASSWORD = "benchmark"
+
+# routes left out, by url name
+EXCLUDED = {
+    "google_callback": "calls Google",
+    "validate_google_id_token": "calls Google",
+}
+
+# query parameters of GET requests, by route key (see Route.key)
+PARAMS = {
+    "search-list": {"q": NOUNS[1]},
+}
+
+# writes, by route key: (method, principals, body) each. They run in a
+# transaction that is rolled back, every request sees the same data.
+WRITES = {
+    "group-list": [("post", OWNERS, lambda p: {"name": "Benchmark group"})],
+    "group-detail": [
+        ("patch", OWNERS, lambda p: {"name": "Benchmark group"}),
+        ("delete", OWNERS, lambda p: None),
+    ],
+    "list-list": [("post", OWNERS, lambda p: {"name": "Benchmark list"})],
+    "list-detail": [
+        ("patch", OWNERS, lambda p: {"name": "Benchmark list"}),
+        ("delete", OWNERS, lambda p: None),
+    ],
+    "task-list": [("post", OWNERS, lambda p: {"text": "Benchmark task"})],
+    "task-detail": [
+        ("patch", OWNERS, lambda p: {"is_important": True}),
+        ("delete", OWNERS, lambda p: None),
+    ],
+    "task-bulk": [
+        (
+            "post",
+            OWNERS,
+            lambda p: {
+                "operations": [
+                    {"op": "complete", "id": p.ids["task"]},
+                    {
+                        "op": "create",
+                        "text": "Benchmark task",
+                        "task_list": p.ids["list"],
+                    },
+                ]
+            },
+        )
+    ],
+    "step-list": [("post", OWNERS, lambda p: {"text": "Benchmark step"})],
+    "step-detail": [
+        ("patch", OWNERS, lambda p: {"text": "Benchmark step"}),
+        ("delete", OWNERS, lambda p: None),
+    ],
+    "label-list": [("post", OWNERS, lambda p: {"name": "benchmark"})],
+    "label-detail": [
+        ("patch", OWNERS, lambda p: {"name": "benchmark"}),
+        ("delete", OWNERS, lambda p: None),
+    ],
+    "token_create": [
+        (
+            "post",
+            (SUPERUSER,),
+            lambda p: {"username": p.user.username, "password": PASSWORD},
+        )
+    ],
+    "token_refresh": [("post", PRINCIPALS, lambda p: {"refresh": p.refresh})],
+    "token_verify": [("post", PRINCIPALS, lambda p: {"token": p.access})],
+    "token_blacklist": [("post", PRINCIPALS, lambda p: {"refresh": p.refresh})],
+}
+
+# url kwargs and the object ids they take
+URL_KWARGS = {"group_pk": "group", "list_pk": "list", "task_pk": "task"}
+
+
+class Route:
+    """One path of URLCONFS, ``template`` like ``/api/tasks/{pk}/``."""
+
+    def __init__(self, template, name, callback):
+        self.template = template
+        self.name = name
+        self.kwargs = re.findall(r"{(\w+)}", template)
+
+        initkwargs = getattr(callback, "initkwargs", {})
+        actions = getattr(callback, "actions", None)
+        if actions is not None:
+            self.methods = set(actions)
+        else:
+            view_class = callback.view_class
+            self.methods = {
+                method
+                for method in view_class.http_method_names
+                if method != "options" and hasattr(view_class, method)
+            }
+
+        # routes of nested routers differ only by their basename, key them
+        # by the resource they serve: "group-list-task-detail" is "task-detail"
+        basename = initkwargs.get("basename")
+        self.resource = basename.rsplit("-", 1)[-1] if basename else None
+        self.key = name
+        if basename and name and name.startswith(f"{basename}-"):
+            self.key = f"{self.resource}{name[len(basename):]}"
+
+    def path(self, ids):
+        """The path for the given object ids, None if one is missing."""
+        values = {}
+        for kwarg in self.kwargs:
+            kind = URL_KWARGS.get(kwarg, self.resource if kwarg == "pk" else None)
+            if ids.get(kind) is None:
+                return None
+            values[kwarg] = ids[kind]
+        return self.template.format(**values)
+
+
+def get_routes():
+    """Every route of URLCONFS in the order they are matched, by path."""
+    routes = {}
+
+    def walk(patterns, prefix, urlconf):
+        for pattern in patterns:
+            if isinstance(pattern, URLResolver):
+                name = getattr(pattern.urlconf_name, "__name__", None)
+                yield from walk(
+                    pattern.url_patterns,
+                    prefix + str(pattern.pattern),
+                    name if name in URLCONFS else urlconf,
+                )
+            elif urlconf and "format" not in pattern.pattern.regex.groupindex:
+                yield prefix + str(pattern.pattern), pattern
+
+    for route, pattern in walk(get_resolver().url_patterns, "", None):
+        template = re.sub(r"\(\?P<(\w+)>[^)]*\)", r"{\1}", route)
+        template = re.sub(r"<(?:\w+:)?(\w+)>", r"{\1}", template)
+        template = "/" + template.replace("^", "").replace("$", "")
+        routes.setdefault(template, Route(template, pattern.name, pattern.callback))
+    return list(routes.values())
+
+
+def percentile(samples, percent):
+    """Nearest-rank percentile of ``samples``."""
+    ordered = sorted(samples)
+    return ordered[max(math.ceil(len(ordered) * percent / 100) - 1, 0)]
+
+
+class Principal:
+    """A benchmarked caller and the objects its paths point at."""
+
+    # seconds a login is reused, access tokens expire while routes run
+    TOKEN_AGE = 60
+
+    def __init__(self, name, user, ids):
+        self.name = name
+        self.user = user
+        self.ids = ids
+        self.login()
+
+    def login(self):
+        refresh = get_tokens_for_user(self.user)
+        self.refresh = str(refresh)
+        self.access = str(refresh.access_token)
+        self.logged_in = time.monotonic()
+
+    def authenticate(self, client):
+        if time.monotonic() - self.logged_in > self.TOKEN_AGE:
+            self.login()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.access}")
+
+
+class Command(BaseCommand):
+    help = (
+        "Seeds a throwaway test database with generated datasets of several "
+        "sizes and requests every route of core.all_apps_urls and core.urls "
+        "in-process. Reports p50/p95/p99 latency, query count and peak "
+        "memory of each route as JSON and fails on regressions against a "
+        "baseline report."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes", nargs="+", choices=list(SIZES), default=["small", "medium"]
+        )
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--repeat", type=int, default=30)
+        parser.add_argument(
+            "--routes", help="Only benchmark paths matching this regular expression."
+        )
+        parser.add_argument(
+            "-o", "--output", default="endpoint-benchmark.json", help="Report file."
+        )
+        parser.add_argument(
+            "--baseline",
+            help="Report to compare with, taken on the same machine and database.",
+        )
+        parser.add_argument(
+            "--tolerance",
+            type=float,
+            default=0.25,
+            help="Allowed relative growth of p95 latency and peak memory.",
+        )
+        parser.add_argument(
+            "--min-ms",
+            type=float,
+            default=2.0,
+            help="Latency growth below this is noise.",
+        )
+        parser.add_argument(
+            "--min-kib",
+            type=float,
+            default=64.0,
+            help="Memory growth below this is noise.",
+        )
+
+    def handle(self, *args, **options):
+        baseline = None
+        if options["baseline"]:
+            with open(options["baseline"]) as fp:
+                baseline = json.load(fp)
+            if baseline.get("version") != REPORT_VERSION:
+                raise CommandError("The baseline report has another version.")
+            if baseline["database"] != connection.vendor:
+                raise CommandError(
+                    f"The baseline was taken on {baseline['database']}, "
+                    f"not {connection.vendor}."
+                )
+
+        routes = get_routes()
+        if options["routes"]:
+            pattern = re.compile(options["routes"])
+            routes = [route for route in routes if pattern.search(route.template)]
+
+        report = {
+            "version": REPORT_VERSION,
+            "created_at": timezone.now().isoformat(),
+            "database": connection.vendor,
+            "seed": options["seed"],
+            "repeat": options["repeat"],
+            "datasets": {},
+            "results": [],
+            "skipped": [],
+            "regressions": [],
+        }
+
+        setup_test_environment()
+        old_name = connection.settings_dict["NAME"]
+        connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            for size in options["sizes"]:
+                report["datasets"][size] = self.generate(size, options["seed"])
+                self.run(size, routes, options["repeat"], report)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        if baseline is not None:
+            report["regressions"] = self.compare(report, baseline, options)
+        with open(options["output"], "w") as fp:
+            json.dump(report, fp, indent=2)
+        self.stdout.write(f"Wrote {options['output']}.")
+
+        errors = [result for result in report["results"] if result["status"] >= 500]
+        if errors:
+            raise CommandError(f"{len(errors)} requests failed.")
+        if report["regressions"]:
+            for regression in report["regressions"]:
+                self.stdout.write(self.style.ERROR(regression["message"]))
+            raise CommandError(
+                f"{len(report['regressions'])} regressions against "
+                f"{options['baseline']}."
+            )
+        self.stdout.write(self.style.SUCCESS("No regressions."))
+
+    def generate(self, size, seed):
+        call_command("flush", interactive=False, verbosity=0)
+        written = DatasetGenerator(
+            seed=seed, prefix=f"bench-{size}", **SIZES[size]
+        ).run()
+        call_command("rebuild_search_index", stdout=StringIO())
+        refresh_analytics()
+
+        dataset = {model._meta.label: rows for model, rows in written.items()}
+        self.stdout.write(
+            f"{size}: "
+            + ", ".join(f"{rows} {label}" for label, rows in dataset.items())
+        )
+        return dataset
+
+    def get_principals(self):
+        # owners with a step in a grouped list, every route has an object
+        # of theirs to request
+        nested = Task.objects.filter(
+            task_list__group__isnull=False, steps__isnull=False
+        ).values("owner_id")
+        owners = list(
+            Task.objects.filter(owner_id__in=nested)
+            .values_list("owner_id")
+            .annotate(tasks=Count("id"))
+            .order_by("-tasks", "owner_id")
+            .values_list("owner_id", flat=True)
+        )
+        if not owners:
+            raise CommandError("No generated profile has steps in a grouped list.")
+
+        whale = self.get_ids(owners[0])
+        typical = self.get_ids(owners[len(owners) // 2])
+        superuser = User.objects.create_superuser(
+            username="benchmark-admin",
+            email="benchmark-admin@example.com",
+            password=PASSWORD,
+        )
+
+        return [
+            Principal(WHALE, whale.pop("owner"), whale),
+            Principal(TYPICAL, typical.pop("owner"), typical),
+            # a superuser reaches every object, request the whale's
+            Principal(SUPERUSER, superuser, whale),
+        ]
+
+    def get_ids(self, profile_id):
+        profile = Profile.objects.select_related("user").get(pk=profile_id)
+        # the largest grouped list with steps, and its first step
+        task_list = (
+            TaskList.objects.filter(
+                owner=profile, group__isnull=False, tasks__steps__isnull=False
+            )
+            .order_by("-task_count", "pk")
+            .first()
+        )
+        step = (
+            TaskStep.objects.filter(task__task_list=task_list)
+            .order_by("pk")
+            .values("pk", "task_id")
+            .first()
+        )
+        label = (
+            Label.objects.filter(owner=profile)
+            .order_by("pk")
+            .values_list("pk", flat=True)
+            .first()
+        )
+
+        return {
+            "owner": profile.user,
+            "user": profile.user.pk,
+            "profile": profile.pk,
+            "label": label,
+            "group": task_list.group_id,
+            "list": task_list.pk,
+            "task": step["task_id"],
+            "step": step["pk"],
+        }
+
+    def get_requests(self, routes, principals, report):
+        for route in routes:
+            if route.name in EXCLUDED:
+                self.skip(report, route, "*", EXCLUDED[route.name])
+                continue
+
+            requests = []
+            if "get" in route.methods:
+                requests.append(
+                    ("get", PRINCIPALS, lambda p, key=route.key: PARAMS.get(key))
+                )
+            requests.extend(
+                write
+                for write in WRITES.get(route.key, ())
+                if write[0] in route.methods
+            )
+            for method in sorted(route.methods - {"get", "head"}):
+                if not any(request[0] == method for request in requests):
+                    self.skip(report, route, method, "no request to send, see WRITES")
+
+            for method, names, body in requests:
+                for principal in principals:
+                    if principal.name not in names:
+                        continue
+                    path = route.path(principal.ids)
+                    if path is None:
+                        self.skip(
+                            report,
+                            route,
+                            method,
+                            f"{principal.name} has no objects to request",
+                        )
+                        continue
+                    yield route, method, principal, path, body(principal)
+
+    def skip(self, report, route, method, reason):
+        if not any(
+            skipped["route"] == route.template and skipped["method"] == method
+            for skipped in report["skipped"]
+        ):
+            report["skipped"].append(
+                {"route": route.template, "method": method, "reason": reason}
+            )
+
+    def run(self, size, routes, repeat, report):
+        principals = self.get_principals()
+        # server errors end up in the report instead of stopping the run
+        client = APIClient(raise_request_exception=False)
+
+        for route, method, principal, path, data in self.get_requests(
+            routes, principals, report
+        ):
+
+            def send():
+                return self.send(client, method, path, data)
+
+            # warms up whatever the first request of a route loads
+            self.reset(client, principal)
+            send()
+            self.reset(client, principal)
+            with CaptureQueriesContext(connection) as context:
+                response = send()
+            # later requests reset the query log the context reads from
+            queries = len(context)
+
+            timings = []
+            for _ in range(repeat):
+                self.reset(client, principal)
+                start = time.perf_counter()
+                send()
+                timings.append((time.perf_counter() - start) * 1000)
+            self.reset(client, principal)
+            peak = peak_memory(send)
+
+            result = {
+                "size": size,
+                "principal": principal.name,
+                "method": method.upper(),
+                "route": route.template,
+                "path": path,
+                "status": response.status_code,
+                "queries": queries,
+                "p50_ms": round(percentile(timings, 50), 3),
+                "p95_ms": round(percentile(timings, 95), 3),
+                "p99_ms": round(percentile(timings, 99), 3),
+                "peak_kib": round(peak / 1024, 1),
+            }
+            report["results"].append(result)
+            self.stdout.write(
+                f"{size:>6} {principal.name:>9} {result['method']:>5} "
+                f"{route.template:<62} {result['status']} "
+                f"{queries:4d} queries  p50 {result['p50_ms']:8.2f} "
+                f"p95 {result['p95_ms']:8.2f} p99 {result['p99_ms']:8.2f} ms  "
+                f"{result['peak_kib']:9.1f} KiB"
+            )
+
+    def reset(self, client, principal):
+        principal.authenticate(client)
+        # every request renders, none is answered from the response cache
+        get_response_cache().local.clear()
+        caches[settings.RESPONSE_CACHE_ALIAS].clear()
+
+    def send(self, client, method, path, data):
+        if method == "get":
+            response = client.get(path, data)
+            if response.streaming:
+                b"".join(response.streaming_content)
+            return response
+
+        with transaction.atomic():
+            response = getattr(client, method)(path, data, format="json")
+            transaction.set_rollback(True)
+        return response
+
+    def compare(self, report, baseline, options):
+        def key(result):
+            return (
+                result["size"],
+                result["principal"],
+                result["method"],
+                result["route"],
+            )
+
+        previous = {key(result): result for result in baseline["results"]}
+        regressions = []
+        for result in report["results"]:
+            before = previous.get(key(result))
+            if before is None:
+                continue
+
+            problems = []
+            if result["status"] != before["status"]:
+                problems.append(f"status {before['status']} -> {result['status']}")
+            if result["queries"] > before["queries"]:
+                problems.append(f"queries {before['queries']} -> {result['queries']}")
+            if (
+                result["p95_ms"] > before["p95_ms"] * (1 + options["tolerance"])
+                and result["p95_ms"] - before["p95_ms"] > options["min_ms"]
+            ):
+                problems.append(
+                    f"p95 {before['p95_ms']:.2f} -> {result['p95_ms']:.2f} ms"
+                )
+            if (
+                result["peak_kib"] > before["peak_kib"] * (1 + options["tolerance"])
+                and result["peak_kib"] - before["peak_kib"] > options["min_kib"]
+            ):
+                problems.append(
+                    f"peak {before['peak_kib']:.1f} -> {result['peak_kib']:.1f} KiB"
+                )
+
+            if problems:
+                size, principal, method, route = key(result)
+                regressions.append(
+                    {
+                        "size": size,
+                        "principal": principal,
+                        "method": method,
+                        "route": route,
+                        "message": f"{size} {principal} {method} {route}: "
+                        + ", ".join(problems),
+                    }
+                )
+        return regressions
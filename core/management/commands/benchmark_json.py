@@ -0,0 +1,161 @@
+import io
+import timeit
+import uuid
+import orjson
+from datetime import timedelta
+from decimal import Decimal
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from core.parsers import ORJSONParser
+from core.renderers import ORJSONRenderer
+
+
+def group_tree(groups, lists, tasks, steps):
+    """A ``/api/groups/`` page as the serializers return it."""
+    now = timezone.now()
+    counters = {
+        "task_count": tasks,
+        "completed_count": tasks // 3,
+        "important_count": tasks // 5,
+        "overdue_count": tasks // 7,
+    }
+    pk = iter(range(1, 10**9))
+    return {
+        "next": "http://testserver/api/groups/?cursor=WyIyMDI0LTAxLTAxIiwxXQ%3D%3D",
+        "results": [
+            {
+                "id": next(pk),
+                "name": f"Group {g}",
+                "lists": [
+                    {
+                        "id": next(pk),
+                        "name": f"List {g}.{l}",
+                        "emoji": "📃",
+                        "tasks": [
+                            {
+                                "id": next(pk),
+                                "text": f"Task {t} — buy milk, call Zoë",
+                                "note": "Notes\nwith a second line" if t % 4 else None,
+                                "is_completed": t % 3 == 0,
+                                "is_important": t % 5 == 0,
+                                "due_date": str((now + timedelta(days=t)).date())
+                                if t % 2
+                                else None,
+                                "reminder_date": (now + timedelta(hours=t))
+                                .isoformat()
+                                .replace("+00:00", "Z")
+                                if t % 6 == 0
+                                else None,
+                                "priority": str(t % 4 + 1),
+                                "label": t % 3 or None,
+                                "steps": [
+                                    {"id": next(pk), "text": f"Step {s}"}
+                                    for s in range(steps)
+                                ],
+                            }
+                            for t in range(tasks)
+                        ],
+                        **counters,
+                    }
+                    for l in range(lists)
+                ],
+                **counters,
+            }
+            for g in range(groups)
+        ],
+    }
+
+
+def typed_rows(count):
+    """Rows of Python values (``values()`` output), UUIDs, dates, decimals."""
+    now = timezone.now()
+    owner_id = uuid.uuid4()
+    return [
+        {
+            "id": i,
+            "owner_id": owner_id,
+            "text": f"Task {i}",
+            "due_date": (now + timedelta(days=i % 30)).date(),
+            "created_at": now - timedelta(minutes=i, microseconds=i),
+            "estimate": Decimal(i) / 4,
+            "is_completed": bool(i % 2),
+        }
+        for i in range(count)
+    ]
+
+
+# user text JavaScript would reject unescaped, see ORJSONRenderer
+LINE_SEPARATORS = {"text": "one\u2028two\u2029three", "note": ["\u2028"]}
+# formatted differently by orjson, but they parse to the same values
+FLOATS = [0.1, 0.0607927, 6.0795e-05, 1e16, 2.0**53, 1.5e300, -0.0]
+NON_FINITE = [float("nan"), float("inf"), float("-inf")]
+
+
+def check_edge_cases():
+    """Raises ``CommandError`` if the renderers differ more than documented."""
+    renderer = ORJSONRenderer()
+    if renderer.render(LINE_SEPARATORS) != JSONRenderer().render(LINE_SEPARATORS):
+        raise CommandError("line separators: renderers disagree")
+    if orjson.loads(renderer.render(FLOATS)) != FLOATS:
+        raise CommandError("floats: ORJSONRenderer does not round-trip")
+    for value in NON_FINITE:
+        if renderer.render([value]) != b"[null]":
+            raise CommandError(f"{value}: ORJSONRenderer does not render null")
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares DRF's JSONRenderer/JSONParser with the orjson based pair on "
+        "group-tree pages and typed rows, and checks their output is identical "
+        "(floats aside, see ORJSONRenderer)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--groups", type=int, default=10)
+        parser.add_argument("--lists", type=int, default=5)
+        parser.add_argument("--tasks", type=int, default=20)
+        parser.add_argument("--steps", type=int, default=3)
+        parser.add_argument("--rows", type=int, default=5000)
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, **options):
+        payloads = {
+            "group tree": group_tree(
+                options["groups"], options["lists"], options["tasks"], options["steps"]
+            ),
+            "typed rows": typed_rows(options["rows"]),
+        }
+        repeat = options["repeat"]
+        check_edge_cases()
+
+        for name, data in payloads.items():
+            expected = JSONRenderer().render(data)
+            if ORJSONRenderer().render(data) != expected:
+                raise CommandError(f"{name}: renderers disagree")
+
+            self.stdout.write(f"{name} ({len(expected) / 1024:.0f} KiB)")
+            for label, renderer in (
+                ("JSONRenderer", JSONRenderer()),
+                ("ORJSONRenderer", ORJSONRenderer()),
+            ):
+                self.report(label, lambda: renderer.render(data), len(expected), repeat)
+
+            for label, parser in (
+                ("JSONParser", JSONParser()),
+                ("ORJSONParser", ORJSONParser()),
+            ):
+                self.report(
+                    label,
+                    lambda: parser.parse(io.BytesIO(expected)),
+                    len(expected),
+                    repeat,
+                )
+
+    def report(self, label, func, size, repeat):
+        number = max(1, int(0.2 / max(timeit.timeit(func, number=1), 1e-6)))
+        best = min(timeit.repeat(func, number=number, repeat=repeat)) / number
+        self.stdout.write(
+            f"  {label:<16} {best * 1000:8.3f} ms  {size / best / 2**20:8.1f} MiB/s"
+        )
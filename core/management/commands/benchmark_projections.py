@@ -0,0 +1,127 @@
+import statistics
+import time
+from django.conf import settings
+from django.core.cache import caches
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import (
+    CaptureQueriesContext,
+    override_settings,
+    setup_test_environment,
+    teardown_test_environment,
+)
+from rest_framework.test import APIClient
+from core.models import User
+from core.response_cache import get_response_cache
+from core.queryplans import seed
+from profiles.models import Profile
+from grouplists.models import GroupList
+from tasklists.models import TaskList
+from tasks.models import Task
+
+
+class Command(BaseCommand):
+    help = (
+        "Seeds a throwaway test database and compares the latency and query "
+        "counts of projected reads with the serializers'. That both render "
+        "the same bytes is checked by core.tests.ProjectionContractTests."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--profiles", type=int, default=20)
+        parser.add_argument("--groups", type=int, default=3)
+        parser.add_argument("--lists", type=int, default=4)
+        parser.add_argument("--tasks", type=int, default=25)
+        parser.add_argument("--steps", type=int, default=3)
+        parser.add_argument("--repeat", type=int, default=20)
+        parser.add_argument(
+            "--keepdb", action="store_true", help="Reuse the test database."
+        )
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        old_name = connection.settings_dict["NAME"]
+        connection.creation.create_test_db(
+            verbosity=0, autoclobber=True, keepdb=options["keepdb"]
+        )
+        try:
+            if not Task.objects.exists():
+                seed(
+                    options["profiles"],
+                    options["groups"],
+                    options["lists"],
+                    options["tasks"],
+                    options["steps"],
+                )
+            self.compare(options["repeat"])
+        finally:
+            connection.creation.destroy_test_db(
+                old_name, verbosity=0, keepdb=options["keepdb"]
+            )
+            teardown_test_environment()
+
+    def get_requests(self):
+        profile = Profile.objects.order_by("created_at").first()
+        user = profile.user
+        superuser = User.objects.create_superuser(
+            username="projection-admin",
+            email="projection-admin@example.com",
+            password=None,
+        )
+        group = GroupList.objects.filter(owner=profile).first()
+        task_list = TaskList.objects.filter(owner=profile).first()
+        task = Task.objects.filter(owner=profile).first()
+
+        return [
+            (user, "/api/tasks/"),
+            (user, "/api/tasks/?is_completed=false&page_size=200"),
+            (user, f"/api/tasks/{task.pk}/"),
+            (user, f"/api/lists/{task_list.pk}/tasks/"),
+            (user, "/api/lists/"),
+            (user, f"/api/lists/{task_list.pk}/"),
+            (user, "/api/lists/?fields=id,name,tasks.text"),
+            (user, f"/api/groups/{group.pk}/lists/"),
+            (user, "/api/groups/"),
+            (user, f"/api/groups/{group.pk}/"),
+            (user, "/api/groups/?omit=lists.tasks.steps"),
+            (user, "/api/groups/?depth=1"),
+            (superuser, "/api/tasks/?page_size=200"),
+            (superuser, "/api/lists/?page_size=50"),
+            (superuser, "/api/groups/?page_size=20"),
+        ]
+
+    def get(self, client, url):
+        # every request renders, none is answered from the response cache
+        get_response_cache().local.clear()
+        caches[settings.RESPONSE_CACHE_ALIAS].clear()
+        return client.get(url)
+
+    def measure(self, client, url, repeat):
+        with CaptureQueriesContext(connection) as context:
+            response = self.get(client, url)
+        # later requests reset the query log the context reads from
+        queries = len(context)
+        if response.status_code != 200:
+            raise CommandError(f"GET {url} returned {response.status_code}")
+
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            self.get(client, url)
+            timings.append(time.perf_counter() - start)
+        return queries, statistics.median(timings) * 1000
+
+    def compare(self, repeat):
+        client = APIClient()
+
+        for user, url in self.get_requests():
+            client.force_authenticate(user)
+            with override_settings(READ_PROJECTIONS=False):
+                serializer_queries, serializer_ms = self.measure(client, url, repeat)
+            queries, ms = self.measure(client, url, repeat)
+
+            self.stdout.write(
+                f"GET {url}: serializers {serializer_ms:7.2f} ms "
+                f"({serializer_queries} queries), projection {ms:7.2f} ms "
+                f"({queries} queries), {serializer_ms / ms:4.1f}x"
+            )
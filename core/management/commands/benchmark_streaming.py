@@ -0,0 +1,127 @@
+import gc
+import tracemalloc
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import setup_test_environment, teardown_test_environment
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from core.models import User
+from core.planner import get_query_plan
+from core.queryplans import seed
+from core.testing import asgi_get
+from profiles.models import Profile
+from grouplists.models import GroupList
+from grouplists.serializers import GroupListSerializer
+from tasklists.models import TaskList
+from tasklists.serializers import TaskListSerializer
+from tasks.models import Task
+from tasks.serializers import TaskSerializer
+
+ENDPOINTS = [
+    ("/api/groups/", GroupList, GroupListSerializer),
+    ("/api/lists/", TaskList, TaskListSerializer),
+    ("/api/tasks/", Task, TaskSerializer),
+]
+
+
+def peak_memory(func):
+    """Returns the peak of memory allocated while ``func`` runs, in bytes."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+class Command(BaseCommand):
+    help = (
+        "Seeds a throwaway test database at growing sizes and compares the "
+        "peak memory of rendering a whole collection at once with streaming "
+        "it (?stream=true) through the WSGI and the ASGI handler, which "
+        "should not grow with the data."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--scales",
+            type=int,
+            nargs="+",
+            default=[10, 20, 40],
+            help="Profiles seeded for each measurement.",
+        )
+        parser.add_argument("--groups", type=int, default=3)
+        parser.add_argument("--lists", type=int, default=4)
+        parser.add_argument("--tasks", type=int, default=25)
+        parser.add_argument("--steps", type=int, default=3)
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            help="Overrides STREAM_CHUNK_SIZE. Streamed memory grows with the "
+            "chunk until the collection no longer fits in one.",
+        )
+
+    def handle(self, *args, **options):
+        if options["chunk_size"]:
+            with override_settings(STREAM_CHUNK_SIZE=options["chunk_size"]):
+                return self.run(options)
+        return self.run(options)
+
+    def run(self, options):
+        setup_test_environment()
+        old_name = connection.settings_dict["NAME"]
+        connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            superuser = User.objects.create_superuser(
+                username="stream-admin", email="stream-admin@example.com"
+            )
+            client = APIClient()
+            client.force_authenticate(superuser)
+
+            for scale in sorted(options["scales"]):
+                missing = scale - Profile.objects.count()
+                if missing > 0:
+                    seed(
+                        missing,
+                        options["groups"],
+                        options["lists"],
+                        options["tasks"],
+                        options["steps"],
+                        prefix=f"stream-{scale}",
+                    )
+                self.measure(client, superuser, scale)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+    def measure(self, client, user, scale):
+        self.stdout.write(f"{scale} profiles, {Task.objects.count()} tasks")
+        for url, model, serializer_class in ENDPOINTS:
+            rows = model.objects.count()
+
+            def buffered():
+                queryset = get_query_plan(serializer_class).apply(
+                    model.objects.order_by("created_at", "id")
+                )
+                JSONRenderer().render(serializer_class(queryset, many=True).data)
+
+            def wsgi():
+                response = client.get(f"{url}?stream=true")
+                if response.status_code != 200:
+                    raise CommandError(f"GET {url} returned {response.status_code}")
+                for _ in response.streaming_content:
+                    pass
+
+            def asgi():
+                status = asgi_get(f"{url}?stream=true", user, lambda chunk: None)
+                if status != 200:
+                    raise CommandError(f"GET {url} returned {status} under ASGI")
+
+            self.stdout.write(
+                f"  {url:<14} {rows:>7} rows  "
+                f"buffered {peak_memory(buffered) / 2**20:7.1f} MiB  "
+                f"streamed {peak_memory(wsgi) / 2**20:7.1f} MiB (WSGI) "
+                f"{peak_memory(asgi) / 2**20:7.1f} MiB (ASGI)"
+            )
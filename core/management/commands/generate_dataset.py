@@ -0,0 +1,66 @@
+import time
+from django.core.management.base import BaseCommand
+from core.datasets import DatasetGenerator
+
+
+class Command(BaseCommand):
+    help = (
+        "Generates users with skewed amounts of groups, lists, tasks, steps "
+        "and labels for load testing, see core.datasets. The same --seed "
+        "always generates the same data."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=1000)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--whales", type=int, default=3, help="Accounts with --whale-tasks tasks."
+        )
+        parser.add_argument("--whale-tasks", type=int, default=50_000)
+        parser.add_argument(
+            "--median-tasks",
+            type=int,
+            default=40,
+            help="Median tasks of the other accounts.",
+        )
+        parser.add_argument("--prefix", default="load", help="Username prefix.")
+        parser.add_argument(
+            "--password", help="Password of every user, unusable by default."
+        )
+        parser.add_argument(
+            "--days", type=int, default=365, help="How far back accounts go."
+        )
+        parser.add_argument("--batch-size", type=int, default=50_000)
+
+    def handle(self, *args, **options):
+        self.started = time.perf_counter()
+        generator = DatasetGenerator(
+            users=options["users"],
+            seed=options["seed"],
+            whales=options["whales"],
+            whale_tasks=options["whale_tasks"],
+            median_tasks=options["median_tasks"],
+            prefix=options["prefix"],
+            password=options["password"],
+            days=options["days"],
+            batch_size=options["batch_size"],
+            progress=self.progress if options["verbosity"] > 1 else None,
+        )
+        written = generator.run()
+
+        self.stdout.write(self.style.SUCCESS(f"Generated {self.describe(written)}."))
+        self.stdout.write(
+            "Run rebuild_search_index and refresh_analytics to index the new rows."
+        )
+
+    def progress(self, written):
+        self.stdout.write(f"  {self.describe(written)}")
+
+    def describe(self, written):
+        rows = sum(written.values())
+        elapsed = time.perf_counter() - self.started
+        counts = ", ".join(
+            f"{count} {model._meta.verbose_name_plural}"
+            for model, count in written.items()
+        )
+        return f"{rows} rows in {elapsed:.1f}s ({counts})"
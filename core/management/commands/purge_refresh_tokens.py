@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
+from core.models import RefreshSession
+
+
+class Command(BaseCommand):
+    help = (
+        "Deletes expired or revoked refresh sessions, and expired tokens of "
+        "the blacklist app, in chunks."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=5000)
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        sessions = self.purge(
+            RefreshSession.objects.filter(
+                Q(expires_at__lt=now) | Q(revoked_at__isnull=False)
+            ),
+            options["chunk_size"],
+        )
+        # blacklist entries cascade with their outstanding token
+        outstanding = self.purge(
+            OutstandingToken.objects.filter(expires_at__lt=now), options["chunk_size"]
+        )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Purged {sessions} refresh sessions and {outstanding} "
+                "outstanding tokens."
+            )
+        )
+
+    def purge(self, queryset, chunk_size):
+        total = 0
+        while True:
+            ids = list(queryset.values_list("pk", flat=True)[:chunk_size])
+            if not ids:
+                return total
+            queryset.model.objects.filter(pk__in=ids).delete()
+            total += len(ids)
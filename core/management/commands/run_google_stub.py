@@ -0,0 +1,30 @@
+import time
+from django.core.management.base import BaseCommand
+from core.google_stub import GoogleStub
+
+
+class Command(BaseCommand):
+    help = (
+        "Serves a local stand-in for Google's OAuth token, userinfo and certs "
+        "endpoints. Point the GOOGLE_*_URL settings at it."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--host", default="127.0.0.1")
+        parser.add_argument("--port", type=int, default=8765)
+        parser.add_argument(
+            "--latency", type=float, default=0, help="Seconds added to each reply."
+        )
+
+    def handle(self, *args, **options):
+        stub = GoogleStub(
+            options["host"], options["port"], latency=options["latency"]
+        ).start()
+        for name, value in stub.settings().items():
+            self.stdout.write(f"export {name}={value}")
+
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            stub.stop()
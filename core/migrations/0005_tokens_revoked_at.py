@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:01
+
+from django.db import migrations, models
+from django.db.models import Q
+from django.utils import timezone
+
+
+def backfill(apps, schema_editor):
+    # revocations from before the field existed are kept for one more
+    # token lifetime from now
+    User = apps.get_model("core", "User")
+    User.objects.filter(Q(token_version__gt=0) | Q(is_active=False)).update(
+        tokens_revoked_at=timezone.now()
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('core', '0004_refresh_sessions'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='tokens_revoked_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(condition=models.Q(('tokens_revoked_at__isnull', False)), fields=['tokens_revoked_at'], name='user_tokens_revoked_idx'),
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
@@ -1,4 +1,5 @@
-from django.db import models
+import uuid
+from django.db import models, transaction
 from django.contrib.auth.models import AbstractUser
 
 GOOGLE_AUTH_PROVIDER = "google"
@@ -11,7 +12,22 @@ AUTH_PROVIDERS = [
 ]
 
 
-class User(AbstractUser):
+class AtomicSaveMixin:
+    """
+    Runs save() and delete() in a transaction, so what their receivers
+    write (list counters, data versions) commits together with the row.
+    """
+
+    def save(self, *args, **kwargs):
+        with transaction.atomic(using=kwargs.get("using")):
+            super().save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic(using=kwargs.get("using")):
+            return super().delete(*args, **kwargs)
+
+
+class User(AtomicSaveMixin, AbstractUser):
     email = models.EmailField(unique=True)
     auth_provider = models.CharField(
         max_length=30,
@@ -19,6 +35,45 @@ class User(AbstractUser):
         default=EMAIL_AUTH_PROVIDER,
         db_index=True,
     )
+    # bumped to revoke every token issued so far, see core.authentication
+    token_version = models.PositiveIntegerField(default=0)
+    tokens_revoked_at = models.DateTimeField(null=True, blank=True)
 
     class Meta(AbstractUser.Meta):
-        pass
+        indexes = [
+            models.Index(fields=["date_joined", "id"], name="user_joined_id_idx"),
+            # RevocationCache
+            models.Index(
+                fields=["tokens_revoked_at"],
+                condition=models.Q(tokens_revoked_at__isnull=False),
+                name="user_tokens_revoked_idx",
+            ),
+        ]
+
+
+class RefreshSession(models.Model):
+    """
+    One device session. Its refresh tokens carry the session id and the
+    generation they were issued for, only the current generation (and
+    briefly the one it replaced) is accepted, see core.tokens.
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(
+        User, related_name="refresh_sessions", on_delete=models.CASCADE
+    )
+    generation = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_used_at = models.DateTimeField(null=True, blank=True)
+    expires_at = models.DateTimeField(db_index=True)
+    revoked_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            # purge_refresh_tokens
+            models.Index(
+                fields=["revoked_at"],
+                condition=models.Q(revoked_at__isnull=False),
+                name="refresh_session_revoked_idx",
+            ),
+        ]
@@ -0,0 +1,154 @@
+import base64
+import binascii
+import json
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import connections
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+def estimate_count(queryset) -> int:
+    """
+    Returns the planner's row estimate for the queryset on PostgreSQL,
+    falling back to an exact count on backends without planner statistics.
+    """
+    queryset = queryset.order_by()
+    if connections[queryset.db].vendor != "postgresql":
+        return queryset.count()
+
+    plan = json.loads(queryset.explain(format="json"))
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination over a unique ordering such as ``(created_at, id)``.
+
+    Pages are fetched with a ``WHERE (created_at, id) > (...)`` predicate
+    instead of OFFSET, so the cost of a page does not depend on its depth.
+    Views can override the ordering with a ``cursor_ordering`` attribute,
+    the last field of which must be unique.
+    """
+
+    ordering = ("created_at", "id")
+    page_size = api_settings.PAGE_SIZE or 50
+    page_size_query_param = "page_size"
+    max_page_size = 200
+    cursor_query_param = "cursor"
+    count_query_param = "count"
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.ordering = tuple(getattr(view, "cursor_ordering", self.ordering))
+        self.page_size = self.get_page_size(request)
+        self.count = None
+
+        if request.query_params.get(self.count_query_param) == "approx":
+            self.count = estimate_count(queryset)
+
+        queryset = queryset.order_by(*self.ordering)
+        position = self.decode_cursor(request, queryset.model)
+        if position is not None:
+            queryset = queryset.filter(self.get_position_filter(position))
+
+        page = list(queryset[: self.page_size + 1])
+        self.has_next = len(page) > self.page_size
+        page = page[: self.page_size]
+        self.next_position = self.get_position(page[-1]) if self.has_next else None
+        return page
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def get_position(self, instance):
+        values = []
+        for field in self.ordering:
+            # rows are model instances, or dicts on projected reads
+            if isinstance(instance, dict):
+                value = instance[field.lstrip("-")]
+            else:
+                value = getattr(instance, field.lstrip("-"))
+            values.append(value.isoformat() if hasattr(value, "isoformat") else value)
+        return values
+
+    def get_position_filter(self, position):
+        # Expands (a, b) > (x, y) into a >= x AND (a > x OR (a = x AND b > y))
+        # so the leading column still bounds an index range scan.
+        fields = [field.lstrip("-") for field in self.ordering]
+        operators = ["lt" if field.startswith("-") else "gt" for field in self.ordering]
+
+        condition = Q()
+        for index in reversed(range(len(fields))):
+            step = Q(**{f"{fields[index]}__{operators[index]}": position[index]})
+            if index < len(fields) - 1:
+                step |= Q(**{fields[index]: position[index]}) & condition
+            condition = step
+
+        return Q(**{f"{fields[0]}__{operators[0]}e": position[0]}) & condition
+
+    def encode_cursor(self, position):
+        raw = json.dumps(position, default=str, separators=(",", ":"))
+        token = base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+        return replace_query_param(
+            self.request.build_absolute_uri(), self.cursor_query_param, token
+        )
+
+    def decode_cursor(self, request, model):
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None
+
+        try:
+            position = json.loads(base64.urlsafe_b64decode(token.encode("ascii")))
+            if not isinstance(position, list) or len(position) != len(self.ordering):
+                raise ValueError
+            return [
+                model._meta.get_field(field.lstrip("-")).to_python(value)
+                for field, value in zip(self.ordering, position)
+            ]
+        except (
+            binascii.Error,
+            UnicodeError,
+            ValueError,
+            TypeError,
+            DjangoValidationError,
+        ) as e:
+            raise NotFound(self.invalid_cursor_message) from e
+
+    def get_next_link(self):
+        if self.next_position is None:
+            return None
+        return self.encode_cursor(self.next_position)
+
+    def get_paginated_response(self, data):
+        payload = {"next": self.get_next_link()}
+        if self.count is not None:
+            payload["count"] = self.count
+        payload["results"] = data
+        return Response(payload)
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "count": {
+                    "type": "integer",
+                    "description": "Approximate total, only present with ?count=approx.",
+                },
+                "results": schema,
+            },
+        }
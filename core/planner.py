@@ -0,0 +1,180 @@
+from functools import lru_cache
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+from .fieldsets import SparseFieldsViewMixin
+
+
+class QueryPlan:
+    """
+    The ``select_related``/``prefetch_related``/``only()`` calls needed to
+    render one serializer without extra queries.
+
+    ``only`` is None when some field reads an attribute that is not a model
+    column (a property, a method field, ``source="*"``), in which case no
+    columns are deferred.
+    """
+
+    def __init__(self, select=(), prefetch=(), only=None):
+        self.select = tuple(select)
+        self.prefetch = tuple(prefetch)
+        self.only = None if only is None else tuple(only)
+
+    def __repr__(self):
+        return (
+            f"QueryPlan(select={self.select!r}, "
+            f"prefetch={[p.prefetch_through for p in self.prefetch]!r}, "
+            f"only={self.only!r})"
+        )
+
+    def apply(self, queryset, defer=True, required=()):
+        if self.select:
+            queryset = queryset.select_related(*self.select)
+        if self.prefetch:
+            queryset = queryset.prefetch_related(*self.prefetch)
+        if defer and self.only is not None:
+            queryset = queryset.only(*dict.fromkeys(self.only + tuple(required)))
+        return queryset
+
+
+class _Builder:
+    def __init__(self, model):
+        self.model = model
+        self.select = []
+        self.prefetch = []
+        self.only = [model._meta.pk.name]
+        self.restrict = True
+
+    def add_serializer(self, serializer, prefix=""):
+        for field in serializer.fields.values():
+            if field.source == "*" or isinstance(
+                field, serializers.SerializerMethodField
+            ):
+                self.restrict = False
+                continue
+
+            if isinstance(field, serializers.ListSerializer):
+                self.add_many(field, prefix)
+            elif isinstance(field, serializers.BaseSerializer):
+                self.add_one(field, prefix)
+            else:
+                self.add_column(field.source_attrs, prefix)
+
+    def resolve(self, path, prefix):
+        # walks ``prefix`` (already joined through select_related) to its model
+        model = self.model
+        for name in filter(None, prefix.split("__")):
+            model = model._meta.get_field(name).related_model
+        try:
+            return model._meta.get_field(path)
+        except FieldDoesNotExist:
+            return None
+
+    def add_column(self, source_attrs, prefix):
+        lookup = prefix
+        for index, attr in enumerate(source_attrs):
+            model_field = self.resolve(attr, lookup)
+            if (
+                model_field is None
+                or model_field.many_to_many
+                or model_field.one_to_many
+            ):
+                self.restrict = False
+                return
+
+            lookup = f"{lookup}__{attr}" if lookup else attr
+            if index < len(source_attrs) - 1:
+                if not model_field.is_relation:
+                    self.restrict = False
+                    return
+                # dotted sources such as ``user.email`` join the relation
+                self.select.append(lookup)
+                self.only.append(lookup)
+            else:
+                self.only.append(lookup)
+
+    def add_one(self, field, prefix):
+        if len(field.source_attrs) != 1:
+            self.restrict = False
+            return
+
+        model_field = self.resolve(field.source, prefix)
+        if model_field is None or not (
+            model_field.many_to_one or model_field.one_to_one
+        ):
+            self.restrict = False
+            return
+
+        lookup = f"{prefix}__{field.source}" if prefix else field.source
+        self.select.append(lookup)
+        self.only.append(lookup)
+        related_model = model_field.related_model
+        self.only.append(f"{lookup}__{related_model._meta.pk.name}")
+        self.add_serializer(field, prefix=lookup)
+
+    def add_many(self, field, prefix):
+        model_field = self.resolve(field.source, prefix)
+        child = field.child
+        if (
+            model_field is None
+            or not (model_field.one_to_many or model_field.many_to_many)
+            or not isinstance(child, serializers.ModelSerializer)
+        ):
+            self.restrict = False
+            return
+
+        related_model = model_field.related_model
+        builder = _Builder(related_model)
+        builder.add_serializer(child)
+        if model_field.one_to_many:
+            # the reverse foreign key is needed to attach the rows to their parent
+            builder.only.append(model_field.field.name)
+
+        lookup = f"{prefix}__{field.source}" if prefix else field.source
+        queryset = builder.build().apply(related_model._default_manager.all())
+        self.prefetch.append(Prefetch(lookup, queryset=queryset))
+
+    def build(self):
+        return QueryPlan(
+            select=dict.fromkeys(self.select),
+            prefetch=self.prefetch,
+            only=dict.fromkeys(self.only) if self.restrict else None,
+        )
+
+
+@lru_cache(maxsize=256)
+def get_query_plan(serializer_class, fieldset=None):
+    """
+    Builds (and caches per serializer class and fieldset) the query plan
+    for rendering ``serializer_class`` with the fields in ``fieldset``.
+    """
+    meta = getattr(serializer_class, "Meta", None)
+    model = getattr(meta, "model", None)
+    if model is None:
+        return QueryPlan()
+
+    builder = _Builder(model)
+    builder.add_serializer(serializer_class(context={"fieldset": fieldset}))
+    return builder.build()
+
+
+class QueryPlanViewMixin(SparseFieldsViewMixin):
+    """
+    View mixin applying the query plan of the view's serializer and
+    fieldset to read querysets.
+    """
+
+    def plan_queryset(self, queryset):
+        if self.request.method not in SAFE_METHODS:
+            return queryset
+
+        plan = get_query_plan(self.get_serializer_class(), self.get_fieldset())
+        return plan.apply(queryset, required=self.get_required_fields())
+
+    def get_required_fields(self):
+        # columns the paginator reads off each row
+        ordering = getattr(
+            self, "cursor_ordering", getattr(self.paginator, "ordering", ())
+        )
+        return tuple(field.lstrip("-") for field in ordering)
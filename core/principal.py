@@ -0,0 +1,59 @@
+import uuid
+from django.apps import apps
+from django.conf import settings
+from django.utils.functional import cached_property
+from rest_framework_simplejwt.tokens import Token
+
+# access token claim carrying the caller's profile id, when issued with one
+PROFILE_ID_CLAIM = "profile_id"
+
+
+class Principal:
+    """
+    The caller of a request together with the ids Blazely scopes rows by.
+
+    ``profile_id`` is read from the access token when it carries the claim,
+    otherwise looked up once and reused for the rest of the request. It is
+    None for users without a profile.
+    """
+
+    def __init__(self, user, token=None):
+        self.user = user
+        self.token = token
+
+    @property
+    def is_superuser(self):
+        return bool(self.user and self.user.is_superuser)
+
+    @cached_property
+    def profile_id(self):
+        if self.token is not None and PROFILE_ID_CLAIM in self.token:
+            claim = self.token[PROFILE_ID_CLAIM]
+            return uuid.UUID(claim) if claim else None
+
+        if not self.user or not self.user.is_authenticated:
+            return None
+
+        Profile = apps.get_model(settings.PROFILE_MODEL)
+        return (
+            Profile.objects.filter(user_id=self.user.pk)
+            .values_list("id", flat=True)
+            .first()
+        )
+
+
+def get_principal(request):
+    """Returns the request's principal, built on first use."""
+    principal = getattr(request, "_principal", None)
+    if principal is None or principal.user is not request.user:
+        token = request.auth if isinstance(request.auth, Token) else None
+        principal = Principal(request.user, token)
+        request._principal = principal
+
+    return principal
+
+
+class PrincipalViewMixin:
+    @property
+    def principal(self):
+        return get_principal(self.request)
@@ -0,0 +1,185 @@
+from functools import lru_cache
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+from rest_framework.generics import get_object_or_404
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.response import Response
+from .planner import QueryPlanViewMixin
+
+# fields whose to_representation() returns database values unchanged
+IDENTITY_FIELDS = (
+    serializers.IntegerField,
+    serializers.CharField,
+    serializers.BooleanField,
+)
+
+
+class Projection:
+    """
+    Renders what a serializer would, from ``values()`` rows instead of
+    model instances. Nested serializers over reverse foreign keys are
+    fetched with one query per level and attached by parent id.
+
+    ``fields`` holds ``(name, column, to_representation, projection)`` in
+    serializer order. ``to_representation`` is None for columns rendered as
+    is. Nested fields have a ``projection`` and their column is the foreign
+    key of the nested rows.
+    """
+
+    def __init__(self, model, fields):
+        self.model = model
+        self.fields = tuple(fields)
+        self.nested = tuple(field for field in self.fields if field[3] is not None)
+        self.pk = model._meta.pk.attname
+        self.columns = tuple(
+            dict.fromkeys(
+                (self.pk, *(field[1] for field in self.fields if field[3] is None))
+            )
+        )
+
+    def __repr__(self):
+        return (
+            f"Projection({self.model.__name__}, columns={self.columns!r}, "
+            f"nested={[field[0] for field in self.nested]!r})"
+        )
+
+    def values(self, queryset, required=()):
+        # prefetches do not apply to dicts, select_related is ignored
+        return queryset.prefetch_related(None).values(
+            *dict.fromkeys(self.columns + tuple(required))
+        )
+
+    def render(self, rows):
+        rows = list(rows)
+        children = {}
+        if self.nested and rows:
+            ids = [row[self.pk] for row in rows]
+            for name, foreign_key, _, projection in self.nested:
+                children[name] = projection.render_children(foreign_key, ids)
+
+        output = []
+        for row in rows:
+            item = {}
+            for name, column, to_representation, projection in self.fields:
+                if projection is not None:
+                    item[name] = children[name].get(row[self.pk], [])
+                    continue
+                value = row[column]
+                if value is not None and to_representation is not None:
+                    value = to_representation(value)
+                item[name] = value
+            output.append(item)
+        return output
+
+    def render_children(self, foreign_key, parent_ids):
+        # the same query shape as the planner's Prefetch, so rows come back
+        # in the order the serializers would render them
+        queryset = self.model._default_manager.filter(
+            **{f"{foreign_key}__in": parent_ids}
+        )
+        rows = list(self.values(queryset, required=(foreign_key,)))
+        grouped = {}
+        for row, item in zip(rows, self.render(rows)):
+            grouped.setdefault(row[foreign_key], []).append(item)
+        return grouped
+
+
+def _build(serializer):
+    model = serializer.Meta.model
+    fields = []
+
+    for name, field in serializer.fields.items():
+        if field.source == "*" or "." in field.source:
+            return None
+        try:
+            model_field = model._meta.get_field(field.source)
+        except FieldDoesNotExist:
+            return None
+
+        if isinstance(field, serializers.ListSerializer):
+            child = field.child
+            if not model_field.one_to_many or not isinstance(
+                child, serializers.ModelSerializer
+            ):
+                return None
+            projection = _build(child)
+            if projection is None:
+                return None
+            fields.append((name, model_field.field.attname, None, projection))
+        elif isinstance(field, serializers.BaseSerializer) or isinstance(
+            field, serializers.SerializerMethodField
+        ):
+            return None
+        elif isinstance(field, serializers.PrimaryKeyRelatedField):
+            if not model_field.many_to_one or field.pk_field is not None:
+                return None
+            fields.append((name, model_field.attname, None, None))
+        elif model_field.is_relation or isinstance(field, serializers.RelatedField):
+            return None
+        else:
+            identity = type(field) in IDENTITY_FIELDS
+            to_representation = None if identity else field.to_representation
+            fields.append((name, model_field.attname, to_representation, None))
+
+    return Projection(model, fields)
+
+
+@lru_cache(maxsize=256)
+def get_projection(serializer_class, fieldset=None):
+    """
+    Builds (and caches per serializer class and fieldset) the projection
+    rendering ``serializer_class``, None when some field cannot be read off
+    a row (method fields, nested objects, many-to-many, dotted sources).
+    """
+    meta = getattr(serializer_class, "Meta", None)
+    if getattr(meta, "model", None) is None:
+        return None
+
+    return _build(serializer_class(context={"fieldset": fieldset}))
+
+
+class ProjectionViewMixin(QueryPlanViewMixin):
+    """
+    View mixin serving ``list`` and ``retrieve`` from a projection of the
+    view's serializer, skipping model instances and serializer binding.
+    Requests it cannot project fall back to the serializers.
+    """
+
+    projected_actions = ("list", "retrieve")
+
+    def get_projection(self):
+        if (
+            not settings.READ_PROJECTIONS
+            or self.request.method not in SAFE_METHODS
+            or self.action not in self.projected_actions
+        ):
+            return None
+        return get_projection(self.get_serializer_class(), self.get_fieldset())
+
+    def list(self, request, *args, **kwargs):
+        projection = self.get_projection()
+        if projection is None:
+            return super().list(request, *args, **kwargs)
+
+        rows = projection.values(
+            self.filter_queryset(self.get_queryset()),
+            required=self.get_required_fields(),
+        )
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(projection.render(page))
+        return Response(projection.render(rows))
+
+    def retrieve(self, request, *args, **kwargs):
+        projection = self.get_projection()
+        if projection is None:
+            return super().retrieve(request, *args, **kwargs)
+
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        row = get_object_or_404(
+            projection.values(self.filter_queryset(self.get_queryset())),
+            **{self.lookup_field: self.kwargs[lookup_url_kwarg]},
+        )
+        self.check_object_permissions(request, row)
+        return Response(projection.render([row])[0])
@@ -0,0 +1,111 @@
+"""
+Helpers for checking that reads stay on indexes: ``seed`` fills the database
+with evenly sized trees of data and ``explain`` lists the tables a query
+reads by sequential scan.
+"""
+
+import json
+from datetime import timedelta
+from django.db import connection
+from django.utils import timezone
+from core.models import User
+from profiles.models import Profile
+from grouplists.models import GroupList
+from tasklists.models import TaskList
+from tasks.models import Task, TaskStep, Label
+
+# tables large enough that a sequential scan on them is a regression
+CHECKED_TABLES = {
+    GroupList._meta.db_table,
+    TaskList._meta.db_table,
+    Task._meta.db_table,
+    TaskStep._meta.db_table,
+    Label._meta.db_table,
+}
+
+
+def seed(profiles, groups, lists, tasks, steps, prefix="plan"):
+    """Creates ``profiles`` users with evenly sized trees of data."""
+    users = User.objects.bulk_create(
+        User(username=f"{prefix}-{i}", email=f"{prefix}-{i}@example.com")
+        for i in range(profiles)
+    )
+    owners = Profile.objects.bulk_create(Profile(user=user) for user in users)
+    Label.objects.bulk_create(
+        Label(name=f"label-{i}", owner=owner) for owner in owners for i in range(3)
+    )
+    group_rows = GroupList.objects.bulk_create(
+        GroupList(name=f"group-{i}", owner=owner)
+        for owner in owners
+        for i in range(groups)
+    )
+    list_rows = TaskList.objects.bulk_create(
+        (
+            TaskList(name=f"list-{group.pk}-{i}", owner=group.owner, group=group)
+            for group in group_rows
+            for i in range(lists)
+        ),
+        batch_size=2000,
+    )
+    today = timezone.localdate()
+    task_rows = Task.objects.bulk_create(
+        (
+            Task(
+                text=f"task {i}",
+                owner=task_list.owner,
+                task_list=task_list,
+                is_completed=i % 3 == 0,
+                is_important=i % 5 == 0,
+                due_date=today + timedelta(days=i % 14 - 7) if i % 2 else None,
+            )
+            for task_list in list_rows
+            for i in range(tasks)
+        ),
+        batch_size=2000,
+    )
+    TaskStep.objects.bulk_create(
+        (
+            TaskStep(text=f"step {i}", task=task)
+            for task in task_rows
+            for i in range(steps)
+        ),
+        batch_size=2000,
+    )
+
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE")
+
+
+def explain(sql):
+    """
+    Returns the tables the plan of ``sql`` reads in full: by a sequential
+    scan, or by walking a whole index and filtering the rows it finds.
+    """
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}")
+            plan = cursor.fetchone()[0]
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            return list(_postgres_full_scans(plan[0]["Plan"]))
+
+        cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+        scans = []
+        for *_, detail in cursor.fetchall():
+            words = detail.split()
+            # "SCAN table" reads every row, "SCAN table USING INDEX" walks an
+            # index in order and "SEARCH" is a bounded index lookup
+            if words[0] == "SCAN" and "USING" not in words:
+                scans.append(words[1])
+        return scans
+
+
+def _postgres_full_scans(node):
+    if node.get("Node Type") == "Seq Scan":
+        yield node["Relation Name"]
+    # an index scan without an index condition reads the index end to end,
+    # fine for an ordered page, not when it discards rows on the way
+    elif "Filter" in node and "Index Name" in node and "Index Cond" not in node:
+        yield node["Relation Name"]
+    for child in node.get("Plans", []):
+        yield from _postgres_full_scans(child)
@@ -0,0 +1,45 @@
+import orjson
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+_encoder = JSONEncoder()
+
+LINE_SEPARATOR = "\u2028".encode("utf-8")
+PARAGRAPH_SEPARATOR = "\u2029".encode("utf-8")
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    ``JSONRenderer`` encoding with orjson straight to UTF-8 bytes.
+
+    Dates, times and everything orjson does not handle itself (decimals,
+    lazy strings, querysets...) go through DRF's encoder, and U+2028/U+2029
+    are escaped like ``JSONRenderer`` does, so the output is the same except
+    for floats: orjson writes the shortest form that round-trips (``1e16``,
+    not ``1e+16``) and renders NaN and infinities as ``null`` where
+    ``JSONRenderer`` raises. Indented responses (``application/json;
+    indent=4``) and values orjson rejects, such as integers wider than 64
+    bits, are left to ``JSONRenderer``.
+    """
+
+    options = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+
+        renderer_context = renderer_context or {}
+        if self.get_indent(accepted_media_type, renderer_context):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=_encoder.default, option=self.options)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # valid JSON but not valid JavaScript, they can come from user input
+        if LINE_SEPARATOR in ret or PARAGRAPH_SEPARATOR in ret:
+            ret = ret.replace(LINE_SEPARATOR, b"\\u2028").replace(
+                PARAGRAPH_SEPARATOR, b"\\u2029"
+            )
+        return ret
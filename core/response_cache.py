@@ -0,0 +1,251 @@
+"""
+Read-through cache of rendered responses, keyed by endpoint, URL, media
+type, owner and the owner's data version (see ``profiles.versions``).
+A write bumps the version, so entries are never invalidated, they just
+stop being asked for and age out.
+
+Two tiers: a bounded in-process LRU in front of a shared backend chosen by
+``RESPONSE_CACHE_BACKEND``. Concurrent misses for one key share a single
+fill, within a process through an event, across processes through a short
+lock in the shared backend.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+from django.utils.module_loading import import_string
+from rest_framework import status
+from .principal import get_principal
+
+
+class BaseResponseCacheBackend:
+    """Shared tier. Values are ``(status, content type, content)`` tuples."""
+
+    def get(self, key):
+        raise NotImplementedError
+
+    def set(self, key, value, timeout):
+        raise NotImplementedError
+
+    def add(self, key, value, timeout):
+        """Stores ``value`` unless ``key`` exists, returns whether it did."""
+        raise NotImplementedError
+
+    def delete(self, key):
+        raise NotImplementedError
+
+
+class NullBackend(BaseResponseCacheBackend):
+    """No shared tier, only the in-process LRU is used."""
+
+    def get(self, key):
+        return None
+
+    def set(self, key, value, timeout):
+        pass
+
+    def add(self, key, value, timeout):
+        return True
+
+    def delete(self, key):
+        pass
+
+
+class DjangoCacheBackend(BaseResponseCacheBackend):
+    """
+    A Django cache from ``CACHES``, ``RESPONSE_CACHE_ALIAS`` by default:
+    Redis or Memcached in production, the local-memory cache as the
+    stand-in for development and tests.
+    """
+
+    def __init__(self, alias=None):
+        self.cache = caches[alias or settings.RESPONSE_CACHE_ALIAS]
+
+    def get(self, key):
+        return self.cache.get(key)
+
+    def set(self, key, value, timeout):
+        self.cache.set(key, value, timeout)
+
+    def add(self, key, value, timeout):
+        return self.cache.add(key, value, timeout)
+
+    def delete(self, key):
+        self.cache.delete(key)
+
+
+class LRUCache:
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            value = self.entries.get(key)
+            if value is not None:
+                self.entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self.lock:
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+class ResponseCache:
+    def __init__(self, backend=None, local_size=None):
+        self.backend = backend or import_string(settings.RESPONSE_CACHE_BACKEND)()
+        self.local = LRUCache(local_size or settings.RESPONSE_CACHE_LOCAL_SIZE)
+        self.lock = threading.Lock()
+        self.fills = {}
+
+    def get(self, key):
+        value = self.local.get(key)
+        if value is None:
+            value = self.backend.get(key)
+            if value is not None:
+                self.local.set(key, value)
+        return value
+
+    def get_or_fill(self, key, fill):
+        """
+        Returns the cached value of ``key``, calling ``fill`` (which returns
+        the value, or None for an uncacheable response) on a miss. Only one
+        caller fills a key at a time, the others wait for its result.
+        """
+        value = self.get(key)
+        if value is not None:
+            return value, None
+
+        with self.lock:
+            event = self.fills.get(key)
+            leader = event is None
+            if leader:
+                event = self.fills[key] = threading.Event()
+
+        if not leader:
+            event.wait(settings.RESPONSE_CACHE_FILL_TIMEOUT)
+            value = self.local.get(key)
+            if value is not None:
+                return value, None
+            # the fill failed, timed out or was not cacheable
+            return None, fill()
+
+        try:
+            return self.fill_shared(key, fill)
+        finally:
+            with self.lock:
+                del self.fills[key]
+            event.set()
+
+    def fill_shared(self, key, fill):
+        timeout = settings.RESPONSE_CACHE_FILL_TIMEOUT
+        lock_key = f"{key}:fill"
+        locked = self.backend.add(lock_key, 1, timeout)
+        if not locked:
+            # another process is filling, poll for its result
+            deadline = time.monotonic() + timeout
+            while time.monotonic() < deadline:
+                time.sleep(0.05)
+                value = self.get(key)
+                if value is not None:
+                    return value, None
+
+        try:
+            result = fill()
+            value = self.entry(result)
+            if value is not None:
+                self.local.set(key, value)
+                self.backend.set(key, value, settings.RESPONSE_CACHE_TIMEOUT)
+            return value, result
+        finally:
+            if locked:
+                self.backend.delete(lock_key)
+
+    @staticmethod
+    def entry(response):
+        if (
+            response is None
+            or response.streaming
+            or response.status_code != status.HTTP_200_OK
+        ):
+            return None
+        return (response.status_code, response["Content-Type"], response.content)
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_response_cache():
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ResponseCache()
+    return _cache
+
+
+def get_cache_key(view, request):
+    digest = hashlib.blake2b(
+        "\n".join((request.get_full_path(), request.accepted_media_type or "")).encode(
+            "utf-8"
+        ),
+        digest_size=16,
+    ).hexdigest()
+    return ":".join(
+        (
+            "response",
+            f"{type(view).__name__}.{view.action}",
+            str(get_principal(request).profile_id),
+            str(view.data_version),
+            digest,
+        )
+    )
+
+
+def render(view, request, response):
+    if response.streaming:
+        return response
+    # what finalize_response() would set up before Django renders it
+    response.accepted_renderer = request.accepted_renderer
+    response.accepted_media_type = request.accepted_media_type
+    response.renderer_context = view.get_renderer_context()
+    return response.render()
+
+
+def cache_response(action):
+    """
+    Caches the rendered 200 responses of a ``ConditionalGetViewMixin``
+    action, which must be one of its ``conditional_actions`` (the data
+    version is read there).
+    """
+
+    @wraps(action)
+    def wrapper(view, request, *args, **kwargs):
+        if getattr(view, "data_version", None) is None:
+            return action(view, request, *args, **kwargs)
+
+        value, response = get_response_cache().get_or_fill(
+            get_cache_key(view, request),
+            lambda: render(view, request, action(view, request, *args, **kwargs)),
+        )
+        if response is not None:
+            return response
+
+        status_code, content_type, content = value
+        return HttpResponse(content, content_type=content_type, status=status_code)
+
+    return wrapper
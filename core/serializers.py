@@ -2,8 +2,16 @@ from django.db import transaction
 from django.contrib.auth.password_validation import validate_password
 from django.contrib.auth.hashers import make_password
 from rest_framework import serializers
+from rest_framework_simplejwt.serializers import (
+    TokenObtainPairSerializer,
+    TokenRefreshSerializer,
+    TokenBlacklistSerializer,
+)
 from profiles.models import Profile
+from .authentication import revoke_tokens
+from .fieldsets import SparseFieldsMixin
 from .models import User
+from .tokens import SESSION_CLAIM, SessionRefreshToken
 
 
 class UserCreateSerializer(serializers.ModelSerializer):
@@ -116,6 +124,11 @@ class SuperUserUpdateSerializer(serializers.ModelSerializer):
         if password:
             validated_data["password"] = make_password(password)
 
+        if password or validated_data.get("is_superuser", instance.is_superuser) != (
+            instance.is_superuser
+        ):
+            revoke_tokens(instance)
+
         return super().update(instance, validated_data)
 
 
@@ -154,10 +167,37 @@ class UserActivationSerializer(serializers.Serializer):
         elif action == "deactivate":
             self.instance.is_active = False
 
+        revoke_tokens(self.instance)
+
         self.instance.save()
 
 
-class SimpleUserSerializer(serializers.ModelSerializer):
+class SimpleUserSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ["email", "first_name", "last_name"]
+
+
+class ClaimsTokenObtainPairSerializer(TokenObtainPairSerializer):
+    token_class = SessionRefreshToken
+
+
+class SessionTokenRefreshSerializer(TokenRefreshSerializer):
+    def validate(self, attrs):
+        token = SessionRefreshToken(attrs["refresh"])
+        if SESSION_CLAIM not in token:
+            # issued before sessions, tracked by the blacklist app
+            return super().validate(attrs)
+
+        refresh = token.rotate()
+        return {"access": str(refresh.access_token), "refresh": str(refresh)}
+
+
+class SessionTokenBlacklistSerializer(TokenBlacklistSerializer):
+    def validate(self, attrs):
+        token = SessionRefreshToken(attrs["refresh"])
+        if SESSION_CLAIM not in token:
+            return super().validate(attrs)
+
+        token.revoke()
+        return {}
@@ -1,21 +1,22 @@
-import requests
+import httpx
+from asgiref.sync import sync_to_async
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.db import transaction
+from django.http import JsonResponse
 from rest_framework import status
-from rest_framework.response import Response
-from rest_framework.exceptions import ValidationError
-from rest_framework_simplejwt.tokens import RefreshToken
-from google.oauth2 import id_token
-from google.auth.transport import requests as google_requests
+from rest_framework.exceptions import PermissionDenied, ValidationError
 from typing import Dict
 from profiles.models import Profile
 from .models import GOOGLE_AUTH_PROVIDER
 from .models import User
+from .google import averify_google_id_token, get_async_http_client
+from .tokens import SessionRefreshToken
 
 User = get_user_model()
 
 
+@transaction.atomic
 def get_or_create_user(
     email: str, first_name: str = "", last_name: str = "", picture_url: str = None
 ):
@@ -41,8 +42,39 @@ def get_or_create_user(
     return user
 
 
-@transaction.atomic
-def authenticate_google_user(code: str) -> Response:
+def get_tokens_for_user(user) -> SessionRefreshToken:
+    """
+    Opens a refresh session and returns its first token. It carries the
+    user's claims (profile id, superuser flag, token version), which access
+    tokens derived from it inherit.
+    """
+    return SessionRefreshToken.for_user(user)
+
+
+def login_google_user(**user_info) -> Dict[str, str]:
+    """
+    Gets or creates the Google user and opens a refresh session for it.
+    Only this part of a login runs in a transaction, the calls to Google
+    happen before it.
+    """
+    user = get_or_create_user(**user_info)
+    if not user.is_active:
+        raise PermissionDenied("User is inactive.")
+    refresh = get_tokens_for_user(user)
+    return {"access": str(refresh.access_token), "refresh": str(refresh)}
+
+
+async def alogin_google_user(**user_info) -> JsonResponse:
+    try:
+        tokens = await sync_to_async(login_google_user)(**user_info)
+    except ValidationError as e:
+        return JsonResponse(e.detail, status=status.HTTP_400_BAD_REQUEST)
+    except PermissionDenied as e:
+        return JsonResponse({"error": e.detail}, status=status.HTTP_403_FORBIDDEN)
+    return JsonResponse(tokens, status=status.HTTP_200_OK)
+
+
+async def authenticate_google_user(code: str) -> JsonResponse:
     """
     Authenticate a user using Google OAuth2.
 
@@ -50,11 +82,10 @@ def authenticate_google_user(code: str) -> Response:
         code: A string representing the authorization code from Google.
 
     Returns:
-        A Response object with a JSON payload. The payload will contain
-        the access and refresh tokens on success, or an error message and
-        HTTP status on failure.
+        A JsonResponse. The payload will contain the access and refresh
+        tokens on success, or an error message and HTTP status on failure.
     """
-    token_url = "https://oauth2.googleapis.com/token"
+    client = await get_async_http_client()
     data: Dict[str, str] = {
         "code": code,  # The authorization code from Google
         "client_id": settings.SOCIAL_AUTH_GOOGLE_WEBCLIENT_ID,  # Google Client ID
@@ -63,44 +94,35 @@ def authenticate_google_user(code: str) -> Response:
         "grant_type": "authorization_code",
     }
     try:
-        token_response = requests.post(token_url, data=data)
+        token_response = await client.post(settings.GOOGLE_TOKEN_URL, data=data)
         token_response.raise_for_status()  # Ensure request was successful
         tokens = token_response.json()  # Convert response to JSON
-    except requests.exceptions.RequestException as e:
-        return Response(
+    except (httpx.HTTPError, ValueError) as e:
+        return JsonResponse(
             {"error": "Could not retrieve tokens", "details": str(e)},
             status=status.HTTP_400_BAD_REQUEST,
         )
-    user_info_url = "https://www.googleapis.com/oauth2/v3/userinfo"
     headers: Dict[str, str] = {"Authorization": f"Bearer {tokens.get('access_token')}"}  # type: ignore
     try:
-        user_info_response = requests.get(user_info_url, headers=headers)
+        user_info_response = await client.get(
+            settings.GOOGLE_USERINFO_URL, headers=headers
+        )
         user_info_response.raise_for_status()
         user_info = user_info_response.json()
-    except requests.exceptions.RequestException as e:
-        return Response(
+    except (httpx.HTTPError, ValueError) as e:
+        return JsonResponse(
             {"error": "Could not retrieve user info", "details": str(e)},
             status=status.HTTP_400_BAD_REQUEST,
         )
-    user = get_or_create_user(
-        email=user_info["email"],
+    return await alogin_google_user(
+        email=user_info.get("email"),
         first_name=user_info.get("given_name", ""),
         last_name=user_info.get("family_name", ""),
         picture_url=user_info.get("picture", None),
     )
 
-    refresh = RefreshToken.for_user(user)
-    return Response(
-        {
-            "access": str(refresh.access_token),
-            "refresh": str(refresh),
-        },
-        status=status.HTTP_200_OK,
-    )
-
 
-@transaction.atomic
-def authenticate_google_id_token(token: str) -> Response:
+async def authenticate_google_id_token(token: str) -> JsonResponse:
     """
     Authenticate a user using an ID token from Google.
 
@@ -108,42 +130,32 @@ def authenticate_google_id_token(token: str) -> Response:
         token: The ID token received from GoogleSignIn.
 
     Returns:
-        A Response object with app-specific JWT tokens or an error.
+        A JsonResponse with app-specific JWT tokens or an error.
     """
     try:
         # Validate ID token with Google
-        idinfo = id_token.verify_oauth2_token(
-            token,
-            google_requests.Request(),
-            settings.SOCIAL_AUTH_GOOGLE_WEBCLIENT_ID,
-        )
-        # Verify the issuer (an extra check, though verify_oauth2_token usually covers this)
-        if idinfo["iss"] not in ["accounts.google.com", "https://accounts.google.com"]:
-            raise ValidationError({"error": "Wrong issuer."})
-
-    except requests.exceptions.RequestException as e:
-        return Response(
+        idinfo = await averify_google_id_token(token)
+    except (httpx.HTTPError, ValueError) as e:
+        return JsonResponse(
             {"error": "Invalid ID token", "details": str(e)},
             status=status.HTTP_400_BAD_REQUEST,
         )
+    # Verify the issuer (an extra check, though verify_oauth2_token usually covers this)
+    if idinfo.get("iss") not in ["accounts.google.com", "https://accounts.google.com"]:
+        return JsonResponse(
+            {"error": "Wrong issuer."}, status=status.HTTP_400_BAD_REQUEST
+        )
 
     email = idinfo.get("email")
     if not email:
-        return Response({"error": "Email not available in token"}, status=400)
+        return JsonResponse(
+            {"error": "Email not available in token"},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
 
-    user = get_or_create_user(
-        email=idinfo["email"],
+    return await alogin_google_user(
+        email=email,
         first_name=idinfo.get("given_name", ""),
         last_name=idinfo.get("family_name", ""),
         picture_url=idinfo.get("picture", None),
     )
-
-    refresh = RefreshToken.for_user(user)
-    return Response(
-        {
-            "access": str(refresh.access_token),
-            "refresh": str(refresh),
-        },
-        status=status.HTTP_200_OK,
-        content_type="application/json",
-    )
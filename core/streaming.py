@@ -0,0 +1,96 @@
+from itertools import islice
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+from rest_framework.renderers import JSONRenderer
+from .projection import ProjectionViewMixin
+
+
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+async def aiterate(iterator):
+    """
+    Iterates a sync iterator from async code, pulling one item at a time in
+    the request's sync thread. ``StreamingHttpResponse`` would read a sync
+    iterator whole with ``sync_to_async(list)`` under ASGI before sending
+    any of it.
+    """
+    next_item = sync_to_async(next, thread_sensitive=True)
+    end = object()
+    try:
+        while (item := await next_item(iterator, end)) is not end:
+            yield item
+    finally:
+        # a client that went away would leave a generator's cursor open
+        if hasattr(iterator, "close"):
+            await sync_to_async(iterator.close, thread_sensitive=True)()
+
+
+def get_streaming_content(request, iterator):
+    """Returns what a ``StreamingHttpResponse`` should iterate under ``request``."""
+    if isinstance(getattr(request, "_request", request), ASGIRequest):
+        return aiterate(iterator)
+    return iterator
+
+
+class StreamingListViewMixin(ProjectionViewMixin):
+    """
+    View mixin answering ``list`` with ``?stream=true`` by one JSON array of
+    the whole collection instead of a page. Rows are read with
+    ``iterator(chunk_size=STREAM_CHUNK_SIZE)``, nested rows are fetched and
+    rendered a chunk at a time, so memory stays flat however many rows
+    there are. Under ASGI the chunks are pulled by ``aiterate``.
+    """
+
+    stream_query_param = "stream"
+
+    def wants_stream(self, request):
+        renderer = getattr(request, "accepted_renderer", None)
+        return (
+            self.action == "list"
+            and request.query_params.get(self.stream_query_param) in ("1", "true")
+            and isinstance(renderer, JSONRenderer)
+            and not renderer.get_indent(request.accepted_media_type, {})
+        )
+
+    def list(self, request, *args, **kwargs):
+        if not self.wants_stream(request):
+            return super().list(request, *args, **kwargs)
+
+        ordering = getattr(self, "cursor_ordering", self.paginator.ordering)
+        queryset = self.filter_queryset(self.get_queryset()).order_by(*ordering)
+        return StreamingHttpResponse(
+            get_streaming_content(
+                request, self.stream(request, self.get_chunks(queryset))
+            ),
+            content_type=request.accepted_renderer.media_type,
+        )
+
+    def get_chunks(self, queryset):
+        size = settings.STREAM_CHUNK_SIZE
+        projection = self.get_projection()
+        if projection is not None:
+            rows = projection.values(queryset, required=self.get_required_fields())
+            for chunk in chunked(rows.iterator(chunk_size=size), size):
+                yield projection.render(chunk)
+        else:
+            # prefetch_related() runs once per chunk of the iterator
+            for chunk in chunked(queryset.iterator(chunk_size=size), size):
+                yield self.get_serializer(chunk, many=True).data
+
+    def stream(self, request, chunks):
+        renderer = request.accepted_renderer
+        context = self.get_renderer_context()
+        separator = b""
+        yield b"["
+        for data in chunks:
+            # each chunk renders as "[...]", its items are spliced in
+            content = renderer.render(data, request.accepted_media_type, context)
+            yield separator + content[1:-1]
+            separator = b","
+        yield b"]"
@@ -0,0 +1,82 @@
+"""Helpers shared by the tests and the benchmark commands."""
+
+import asyncio
+from collections import namedtuple
+from urllib.parse import urlsplit
+from asgiref.sync import async_to_sync
+from django.apps import apps
+from django.conf import settings
+from django.core.handlers.asgi import ASGIHandler
+from django.db.models import Model
+from rest_framework.test import APIClient
+from profiles.models import Profile
+from .models import User
+from .services import get_tokens_for_user
+
+# Models
+TaskList: Model = apps.get_model(settings.TASKLIST_MODEL)
+GroupList: Model = apps.get_model(settings.GROUP_LIST_MODEL)
+
+Account = namedtuple("Account", ["user", "profile", "group", "task_list", "client"])
+
+
+def create_account(username="owner"):
+    """
+    Creates a user with its profile and a list in a group, and returns them
+    with an ``APIClient`` authenticated as the user.
+    """
+    user = User.objects.create_user(username=username, email=f"{username}@example.com")
+    profile = Profile.objects.create(user=user)
+    group = GroupList.objects.create(name="Group", owner=profile)
+    task_list = TaskList.objects.create(name="List", owner=profile, group=group)
+    client = APIClient()
+    client.force_authenticate(user)
+    return Account(user, profile, group, task_list, client)
+
+
+def asgi_get(url, user=None, consume=None):
+    """
+    Sends ``GET url`` through Django's ``ASGIHandler`` the way an ASGI server
+    would, authenticated as ``user`` by an access token, and returns the
+    response status. Every chunk of the body is passed to ``consume`` as it
+    is sent.
+    """
+    url = urlsplit(url)
+    headers = [(b"host", b"testserver")]
+    if user is not None:
+        token = get_tokens_for_user(user).access_token
+        headers.append((b"authorization", f"Bearer {token}".encode()))
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": url.path,
+        "raw_path": url.path.encode(),
+        "query_string": url.query.encode(),
+        "root_path": "",
+        "headers": headers,
+        "server": ("testserver", 80),
+        "client": ("127.0.0.1", 50000),
+    }
+    requested = False
+    status = None
+
+    async def receive():
+        nonlocal requested
+        if not requested:
+            requested = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        # the client stays connected until the handler is done
+        await asyncio.Future()
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+        elif message.get("body") and consume is not None:
+            consume(message["body"])
+
+    async_to_sync(ASGIHandler())(scope, receive, send)
+    return status
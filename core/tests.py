@@ -1,3 +1,664 @@
-from django.test import TestCase
+import threading
+import time
+import warnings
+from datetime import timedelta
+from io import StringIO
+from unittest import mock, skipUnless
+import orjson
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.signals import request_finished, request_started
+from django.db import close_old_connections, connection
+from django.http import HttpResponse
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
+from rest_framework_simplejwt.tokens import RefreshToken
+from core.models import RefreshSession, User
+from profiles.models import Profile
+from grouplists.models import GroupList
+from tasklists.models import TaskList
+from tasks.models import Label, Task
+from tasks.views import TaskViewSet
+from .authentication import (
+    StatelessJWTAuthentication,
+    revocation_window,
+    revocations,
+)
+from .google import (
+    GoogleKeyCache,
+    get_async_http_client,
+    parse_cache_control,
+)
+from .google_stub import GoogleStub
+from .pagination import estimate_count
+from .renderers import ORJSONRenderer
+from .testing import asgi_get, create_account
+from .response_cache import NullBackend, ResponseCache, get_response_cache
+from .queryplans import CHECKED_TABLES, explain, seed
+from .services import (
+    authenticate_google_id_token,
+    authenticate_google_user,
+    get_tokens_for_user,
+)
+from .tokens import GENERATION_CLAIM, SESSION_CLAIM, SessionRefreshToken
 
-# Create your tests here.
+
+class KeysetPaginationTests(TestCase):
+    def setUp(self):
+        self.user, self.profile, _, task_list, self.client = create_account()
+        for number in range(7):
+            Task.objects.create(
+                text=f"Task {number}", task_list=task_list, owner=self.profile
+            )
+
+    def test_pages_follow_the_ordering(self):
+        ids, url = [], "/api/tasks/?page_size=3"
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            ids += [task["id"] for task in response.json()["results"]]
+            url = response.json()["next"]
+
+        self.assertEqual(ids, sorted(Task.objects.values_list("id", flat=True)))
+
+    def test_approximate_count(self):
+        response = self.client.get("/api/tasks/?page_size=3&count=approx")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIsInstance(response.json()["count"], int)
+        self.assertNotIn("count", self.client.get("/api/tasks/").json())
+
+    def test_invalid_cursor(self):
+        self.assertEqual(self.client.get("/api/tasks/?cursor=invalid").status_code, 404)
+
+    @skipUnless(connection.vendor == "postgresql", "needs planner statistics")
+    def test_estimate_count(self):
+        self.assertIsInstance(estimate_count(Task.objects.all()), int)
+
+
+@skipUnless(connection.vendor == "postgresql", "needs planner statistics")
+class QueryPlanTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        seed(profiles=20, groups=2, lists=2, tasks=10, steps=2)
+        cls.profile = Profile.objects.order_by("created_at")[10]
+        cls.superuser = User.objects.create_superuser(
+            username="plan-admin", email="plan-admin@example.com", password=None
+        )
+
+    def setUp(self):
+        # the seeded tables are small enough to scan, with sequential scans
+        # disabled the planner only picks one when no index can serve a query
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+        self.client = APIClient()
+
+    def assertIndexedReads(self, user, url):
+        self.client.force_authenticate(user)
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+
+        for query in context.captured_queries:
+            if query["sql"].lstrip().upper().startswith("SELECT"):
+                scans = set(explain(query["sql"])) & CHECKED_TABLES
+                self.assertFalse(scans, f"GET {url}: {query['sql']}")
+
+    def test_owner_reads_use_indexes(self):
+        group = GroupList.objects.filter(owner=self.profile).first()
+        task_list = TaskList.objects.filter(owner=self.profile).first()
+        task = Task.objects.filter(owner=self.profile).first()
+
+        for url in [
+            "/api/tasks/",
+            "/api/tasks/?is_completed=false",
+            "/api/tasks/my-day/",
+            "/api/tasks/important/",
+            "/api/tasks/planned/",
+            "/api/tasks/overdue/",
+            f"/api/lists/{task_list.pk}/tasks/",
+            f"/api/lists/{task_list.pk}/tasks/?is_completed=false",
+            f"/api/tasks/{task.pk}/steps/",
+            "/api/lists/",
+            f"/api/groups/{group.pk}/lists/",
+            "/api/groups/",
+            "/api/labels/",
+            "/api/profiles/me/",
+        ]:
+            with self.subTest(url=url):
+                self.assertIndexedReads(self.profile.user, url)
+
+    def test_staff_reads_use_indexes(self):
+        for url in [
+            "/api/tasks/?page_size=10",
+            "/api/lists/?page_size=10",
+            "/api/groups/?page_size=10",
+        ]:
+            with self.subTest(url=url):
+                self.assertIndexedReads(self.superuser, url)
+
+
+@mock.patch.object(TaskViewSet, "authentication_classes", [StatelessJWTAuthentication])
+class RevocationTests(TestCase):
+    def setUp(self):
+        self.user = create_account().user
+        self.admin = APIClient()
+        self.admin.force_authenticate(
+            User.objects.create_superuser(
+                username="admin", email="admin@example.com", password=None
+            )
+        )
+        patcher = mock.patch.object(revocations, "interval", 3600)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        revocations.invalidate()
+
+    def get_tasks(self, user):
+        client = APIClient()
+        token = get_tokens_for_user(user).access_token
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        return lambda: client.get("/api/tasks/").status_code
+
+    def set_active(self, action):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.admin.patch(f"/auth/users/{self.user.pk}/{action}/")
+        self.assertEqual(response.status_code, 200)
+
+    def test_deactivation_revokes_tokens(self):
+        get_tasks = self.get_tasks(self.user)
+        self.assertEqual(get_tasks(), 200)
+
+        self.set_active("deactivate")
+        self.assertEqual(get_tasks(), 401)
+
+        self.set_active("activate")
+        self.assertEqual(get_tasks(), 401)
+        self.assertEqual(self.get_tasks(User.objects.get(pk=self.user.pk))(), 200)
+
+    def test_only_recent_revocations_are_loaded(self):
+        self.set_active("deactivate")
+        revoked_long_ago = User.objects.create_user(
+            username="old", email="old@example.com", is_active=False
+        )
+        User.objects.filter(pk=revoked_long_ago.pk).update(
+            tokens_revoked_at=timezone.now() - revocation_window() - timedelta(1)
+        )
+
+        revocations.reload()
+
+        self.assertEqual(set(revocations.users), {str(self.user.pk)})
+
+
+class SessionRefreshTokenTests(TestCase):
+    def setUp(self):
+        self.user = create_account().user
+        self.client = APIClient()
+
+    def session(self, token):
+        return RefreshSession.objects.get(pk=token[SESSION_CLAIM])
+
+    def refresh(self, token):
+        return self.client.post("/auth/jwt/refresh/", {"refresh": str(token)})
+
+    def test_rotation_bumps_the_generation(self):
+        token = SessionRefreshToken.for_user(self.user)
+
+        rotated = token.rotate()
+
+        session = self.session(token)
+        self.assertEqual((session.generation, rotated[GENERATION_CLAIM]), (1, 1))
+        self.assertEqual(rotated[SESSION_CLAIM], token[SESSION_CLAIM])
+        self.assertIsNotNone(session.last_used_at)
+        self.assertEqual(RefreshSession.objects.count(), 1)
+
+    def test_reuse_revokes_the_session(self):
+        first = SessionRefreshToken.for_user(self.user)
+        latest = first.rotate().rotate()
+
+        with self.assertRaisesMessage(TokenError, "reused"):
+            first.rotate()
+
+        self.assertIsNotNone(self.session(first).revoked_at)
+        with self.assertRaisesMessage(TokenError, "revoked"):
+            latest.rotate()
+
+    def test_concurrent_refreshes_get_the_current_generation(self):
+        token = SessionRefreshToken.for_user(self.user)
+        rotated = token.rotate()
+
+        again = token.rotate()
+
+        self.assertEqual(again[GENERATION_CLAIM], rotated[GENERATION_CLAIM])
+        self.assertEqual(self.session(token).generation, 1)
+        again.rotate()
+
+        # past the reuse interval the replaced token counts as copied
+        RefreshSession.objects.update(
+            last_used_at=timezone.now() - settings.REFRESH_TOKEN_REUSE_INTERVAL * 2
+        )
+        with self.assertRaisesMessage(TokenError, "reused"):
+            rotated.rotate()
+
+    def test_inactive_users_cannot_refresh(self):
+        token = SessionRefreshToken.for_user(self.user)
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+
+        with self.assertRaisesMessage(TokenError, "inactive"):
+            token.rotate()
+
+        self.assertIsNotNone(self.session(token).revoked_at)
+
+    def test_refresh_and_blacklist_endpoints(self):
+        response = self.refresh(SessionRefreshToken.for_user(self.user))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("access", response.json())
+
+        refresh = response.json()["refresh"]
+        response = self.client.post("/auth/jwt/blacklist/", {"refresh": refresh})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.refresh(refresh).status_code, 401)
+
+    def test_tokens_issued_before_sessions(self):
+        token = RefreshToken.for_user(self.user)
+
+        response = self.refresh(token)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn(SESSION_CLAIM, RefreshToken(response.json()["refresh"]))
+        # rotated tokens are blacklisted, and so are logged out ones
+        self.assertEqual(self.refresh(token).status_code, 401)
+        refresh = response.json()["refresh"]
+        self.client.post("/auth/jwt/blacklist/", {"refresh": refresh})
+        self.assertEqual(self.refresh(refresh).status_code, 401)
+        self.assertFalse(RefreshSession.objects.exists())
+
+    def test_purge_refresh_tokens(self):
+        live = self.session(SessionRefreshToken.for_user(self.user))
+        revoked = SessionRefreshToken.for_user(self.user)
+        revoked.revoke()
+        expired = self.session(SessionRefreshToken.for_user(self.user))
+        RefreshSession.objects.filter(pk=expired.pk).update(
+            expires_at=timezone.now() - timedelta(seconds=1)
+        )
+        RefreshToken.for_user(self.user)
+        OutstandingToken.objects.update(
+            expires_at=timezone.now() - timedelta(seconds=1)
+        )
+        RefreshToken.for_user(self.user)
+
+        call_command("purge_refresh_tokens", chunk_size=1, stdout=StringIO())
+
+        self.assertEqual(list(RefreshSession.objects.all()), [live])
+        self.assertEqual(OutstandingToken.objects.count(), 1)
+
+
+class AsyncHttpClientTests(SimpleTestCase):
+    async def get_client(self):
+        client = await get_async_http_client()
+        self.assertIs(await get_async_http_client(), client)
+        return client
+
+    def test_client_is_closed_with_its_loop(self):
+        # async_to_sync runs a loop per call without a surrounding one
+        client = async_to_sync(self.get_client)()
+
+        self.assertTrue(client.is_closed)
+        self.assertIsNot(async_to_sync(self.get_client)(), client)
+
+
+class GoogleStubTestMixin:
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.stub = GoogleStub().start()
+        cls.addClassCleanup(cls.stub.stop)
+        overrides = override_settings(
+            SOCIAL_AUTH_GOOGLE_WEBCLIENT_ID="client-id", **cls.stub.settings()
+        )
+        overrides.enable()
+        cls.addClassCleanup(overrides.disable)
+
+    def setUp(self):
+        self.stub.max_age = 3600
+        self.stub.hits.clear()
+
+
+class GoogleKeyCacheTests(GoogleStubTestMixin, SimpleTestCase):
+    def setUp(self):
+        super().setUp()
+        self.cache = GoogleKeyCache()
+
+    def get_keys(self):
+        return async_to_sync(self.cache.aget)()
+
+    def test_fresh_keys_are_served_from_memory(self):
+        keys = self.get_keys()
+
+        self.assertIn(self.stub.key_id, keys)
+        self.assertIs(self.get_keys(), keys)
+        self.assertEqual(self.stub.hits["/certs"], 1)
+
+    def test_expired_keys_are_fetched_before_use(self):
+        self.get_keys()
+        self.cache.fresh_until = self.cache.stale_until = time.monotonic()
+
+        self.get_keys()
+
+        self.assertEqual(self.stub.hits["/certs"], 2)
+
+    def test_stale_keys_are_served_while_refreshing(self):
+        self.stub.max_age = 0
+        keys = self.get_keys()
+
+        self.assertIs(self.get_keys(), keys)
+
+        for _ in range(100):
+            if not self.cache.refreshing:
+                break
+            time.sleep(0.05)
+        self.assertEqual(self.stub.hits["/certs"], 2)
+        self.assertIsNot(self.cache.keys, keys)
+
+    def test_cache_control(self):
+        self.assertEqual(parse_cache_control("public, max-age=60"), (60, 3600))
+        self.assertEqual(
+            parse_cache_control("max-age=60, stale-while-revalidate=5"), (60, 5)
+        )
+        self.assertEqual(parse_cache_control("no-store, max-age=60"), (0, 0))
+        self.assertEqual(parse_cache_control(None), (0, 3600))
+
+
+class GoogleAuthenticationTests(GoogleStubTestMixin, TestCase):
+    async def test_id_token(self):
+        response = await authenticate_google_id_token(
+            self.stub.mint_id_token("ada@example.com")
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(orjson.loads(response.content)), {"access", "refresh"})
+        user = await User.objects.aget(email="ada@example.com")
+        self.assertEqual(user.first_name, "Ada")
+        self.assertTrue(await Profile.objects.filter(user=user).aexists())
+
+    async def test_invalid_id_tokens(self):
+        for token in [
+            "not-a-token",
+            self.stub.mint_id_token("ada@example.com", audience="other-client"),
+            self.stub.mint_id_token("ada@example.com", lifetime=-3600),
+        ]:
+            with self.subTest(token=token):
+                response = await authenticate_google_id_token(token)
+                self.assertEqual(response.status_code, 400)
+        self.assertFalse(await User.objects.filter(email="ada@example.com").aexists())
+
+    async def test_authorization_code(self):
+        response = await authenticate_google_user("ada@example.com")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.stub.hits["/token"], 1)
+        self.assertEqual(self.stub.hits["/userinfo"], 1)
+        self.assertTrue(await User.objects.filter(email="ada@example.com").aexists())
+
+    async def test_invalid_authorization_code(self):
+        response = await authenticate_google_user("invalid")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            orjson.loads(response.content)["error"], "Could not retrieve tokens"
+        )
+
+
+class GoogleLoginViewTests(GoogleStubTestMixin, TestCase):
+    def validate(self, id_token):
+        return self.async_client.post(
+            "/auth/google/validate-token/",
+            {"id_token": id_token},
+            content_type="application/json",
+        )
+
+    async def assertSignedIn(self, response, email):
+        self.assertEqual(response.status_code, 200, response.content)
+        refresh = SessionRefreshToken(response.json()["refresh"])
+        user = await User.objects.aget(email=email)
+        self.assertEqual(refresh["user_id"], str(user.pk))
+
+    async def test_validate_token(self):
+        response = await self.validate(self.stub.mint_id_token("ada@example.com"))
+
+        await self.assertSignedIn(response, "ada@example.com")
+
+    async def test_validate_invalid_token(self):
+        response = await self.validate("not-a-token")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()["error"], "Invalid ID token")
+
+        response = await self.async_client.post(
+            "/auth/google/validate-token/", b"[]", content_type="application/json"
+        )
+        self.assertEqual(response.status_code, 400)
+
+    async def test_callback(self):
+        response = await self.async_client.get(
+            "/auth/google/callback/", {"code": "ada@example.com"}
+        )
+
+        await self.assertSignedIn(response, "ada@example.com")
+
+    async def test_callback_invalid_code(self):
+        response = await self.async_client.get(
+            "/auth/google/callback/", {"code": "invalid"}
+        )
+        self.assertEqual(response.status_code, 400)
+        response = await self.async_client.get("/auth/google/callback/")
+        self.assertEqual(response.status_code, 400)
+
+    async def test_inactive_users_are_refused(self):
+        await self.validate(self.stub.mint_id_token("ada@example.com"))
+        await User.objects.filter(email="ada@example.com").aupdate(is_active=False)
+        sessions = await RefreshSession.objects.acount()
+
+        for response in [
+            await self.validate(self.stub.mint_id_token("ada@example.com")),
+            await self.async_client.get(
+                "/auth/google/callback/", {"code": "ada@example.com"}
+            ),
+        ]:
+            self.assertEqual(response.status_code, 403)
+            self.assertNotIn("refresh", response.json())
+        self.assertEqual(await RefreshSession.objects.acount(), sessions)
+
+
+class ResponseCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        get_response_cache().local.clear()
+        self.user, profile, self.group, self.task_list, self.client = create_account()
+        Task.objects.create(text="Task", task_list=self.task_list, owner=profile)
+
+    def test_repeated_reads_are_cached(self):
+        for url in [
+            "/api/groups/",
+            "/api/lists/",
+            "/api/profiles/me/",
+            f"/api/groups/{self.group.pk}/lists/",
+        ]:
+            with self.subTest(url=url):
+                first = self.client.get(url)
+                # the profile of the forced login, then its data version
+                with self.assertNumQueries(2):
+                    second = self.client.get(url)
+                self.assertEqual(second.status_code, 200)
+                self.assertEqual(second.content, first.content)
+                self.assertEqual(second["Content-Type"], first["Content-Type"])
+                self.assertEqual(second["ETag"], first["ETag"])
+
+    def test_writes_invalidate(self):
+        self.client.get("/api/groups/")
+        self.client.get("/api/groups/?depth=0")
+
+        self.client.patch(
+            f"/api/lists/{self.task_list.pk}/", {"name": "Renamed"}, format="json"
+        )
+
+        self.assertContains(self.client.get("/api/groups/"), "Renamed")
+        self.assertNotContains(self.client.get("/api/groups/?depth=0"), "Renamed")
+
+    def test_entries_are_per_owner(self):
+        self.client.get("/api/groups/")
+        other = create_account("other")
+        self.client.force_authenticate(other.user)
+
+        groups = self.client.get("/api/groups/").json()["results"]
+        self.assertEqual([group["id"] for group in groups], [other.group.pk])
+
+    def test_concurrent_misses_share_one_fill(self):
+        response_cache = ResponseCache(backend=NullBackend(), local_size=2)
+        fills, results = [], []
+        release = threading.Event()
+
+        def fill():
+            fills.append(1)
+            release.wait(1)
+            return HttpResponse(b"filled", content_type="text/plain")
+
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(response_cache.get_or_fill("key", fill))
+            )
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        # time for the other threads to queue up behind the first fill
+        release.wait(0.2)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(fills), 1)
+        self.assertEqual(len(results), 8)
+
+    def test_local_tier_is_bounded(self):
+        response_cache = ResponseCache(backend=NullBackend(), local_size=2)
+        for key in "abc":
+            response_cache.local.set(key, 1)
+
+        self.assertEqual(list(response_cache.local.entries), ["b", "c"])
+
+
+class ORJSONRendererTests(SimpleTestCase):
+    def test_matches_json_renderer(self):
+        data = {"text": "one\u2028two\u2029three", "emoji": "📃", "ids": [1, None]}
+
+        self.assertEqual(ORJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_floats(self):
+        self.assertEqual(ORJSONRenderer().render([1e16, 0.5]), b"[1e16,0.5]")
+        self.assertEqual(ORJSONRenderer().render([float("nan")]), b"[null]")
+
+
+class ProjectionContractTests(TestCase):
+    """Projected reads must render exactly the bytes the serializers do."""
+
+    @classmethod
+    def setUpTestData(cls):
+        seed(profiles=2, groups=2, lists=2, tasks=6, steps=2)
+        cls.profile = Profile.objects.order_by("created_at").first()
+        # the values seed leaves at their defaults
+        label = Label.objects.filter(owner=cls.profile).first()
+        Task.objects.filter(owner=cls.profile, is_important=True).update(
+            label=label,
+            note="Line one\nline two — “quoted” 📃",
+            reminder_date=timezone.now(),
+            priority="1",
+        )
+        cls.superuser = User.objects.create_superuser(
+            username="admin", email="admin@example.com", password=None
+        )
+
+    def get(self, url):
+        # every request renders, none is answered from the response cache
+        cache.clear()
+        get_response_cache().local.clear()
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response.content
+
+    def assertProjectionMatches(self, user, url):
+        self.client = APIClient()
+        self.client.force_authenticate(user)
+        with override_settings(READ_PROJECTIONS=False):
+            expected = self.get(url)
+        self.assertEqual(self.get(url), expected)
+
+    def test_owner_reads(self):
+        group = GroupList.objects.filter(owner=self.profile).first()
+        task_list = TaskList.objects.filter(owner=self.profile).first()
+        task = Task.objects.filter(owner=self.profile, label__isnull=False).first()
+
+        for url in [
+            "/api/tasks/",
+            "/api/tasks/?is_completed=false",
+            f"/api/tasks/{task.pk}/",
+            f"/api/lists/{task_list.pk}/tasks/",
+            "/api/lists/",
+            f"/api/lists/{task_list.pk}/",
+            "/api/lists/?fields=id,name,tasks.text",
+            f"/api/groups/{group.pk}/lists/",
+            "/api/groups/",
+            f"/api/groups/{group.pk}/",
+            "/api/groups/?omit=lists.tasks.steps",
+            "/api/groups/?depth=1",
+        ]:
+            with self.subTest(url=url):
+                self.assertProjectionMatches(self.profile.user, url)
+
+    def test_staff_reads(self):
+        for url in ["/api/tasks/", "/api/lists/", "/api/groups/"]:
+            with self.subTest(url=url):
+                self.assertProjectionMatches(self.superuser, url)
+
+
+@override_settings(STREAM_CHUNK_SIZE=2)
+class StreamingTests(TestCase):
+    def setUp(self):
+        self.user, profile, _, task_list, self.client = create_account()
+        for number in range(7):
+            Task.objects.create(
+                text=f"Task {number}", task_list=task_list, owner=profile
+            )
+
+    def test_stream_renders_every_row(self):
+        response = self.client.get("/api/tasks/?stream=true")
+
+        self.assertTrue(response.streaming)
+        self.assertEqual(
+            [task["id"] for task in orjson.loads(b"".join(response.streaming_content))],
+            sorted(Task.objects.values_list("id", flat=True)),
+        )
+
+    def test_stream_under_asgi(self):
+        expected = b"".join(self.client.get("/api/tasks/?stream=true"))
+        # what the test client does around its requests, the connection
+        # holds the test transaction
+        for signal in (request_started, request_finished):
+            signal.disconnect(close_old_connections)
+            self.addCleanup(signal.connect, close_old_connections)
+        chunks = []
+
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            status = asgi_get("/api/tasks/?stream=true", self.user, chunks.append)
+
+        self.assertEqual(status, 200)
+        self.assertEqual(b"".join(chunks), expected)
+        # a sync iterator would have been read whole first
+        self.assertFalse(
+            [w for w in caught if "synchronous iterators" in str(w.message)]
+        )
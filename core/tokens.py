@@ -0,0 +1,119 @@
+"""
+Session-family refresh tokens.
+
+Every login opens a ``RefreshSession`` row and each refresh token names its
+session (``sid``) and generation (``gen``). Refreshing bumps the session's
+generation and returns the next token, so a device needs a single row no
+matter how often it refreshes. Presenting an older generation means the
+token was copied: the whole session is revoked.
+
+The generation just replaced is still accepted for
+``REFRESH_TOKEN_REUSE_INTERVAL`` after the refresh that replaced it, so two
+concurrent refreshes from one device do not log it out. Both get a token of
+the current generation. A copied token replayed within that interval is not
+detected.
+"""
+
+from datetime import datetime, timezone as dt_timezone
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken, Token
+from .authentication import add_user_claims
+from .models import RefreshSession
+
+SESSION_CLAIM = "sid"
+GENERATION_CLAIM = "gen"
+
+
+class SessionRefreshToken(Token):
+    token_type = "refresh"
+    lifetime = api_settings.REFRESH_TOKEN_LIFETIME
+    no_copy_claims = (
+        api_settings.TOKEN_TYPE_CLAIM,
+        "exp",
+        api_settings.JTI_CLAIM,
+        "jti",
+        "iat",
+        SESSION_CLAIM,
+        GENERATION_CLAIM,
+    )
+    access_token_class = AccessToken
+
+    @property
+    def access_token(self):
+        access = self.access_token_class()
+        access.set_exp(from_time=self.current_time)
+        for claim, value in self.payload.items():
+            if claim not in self.no_copy_claims:
+                access[claim] = value
+        return access
+
+    @property
+    def expires_at(self):
+        return datetime.fromtimestamp(self["exp"], tz=dt_timezone.utc)
+
+    @classmethod
+    def for_user(cls, user, session=None):
+        """Opens a new session for ``user`` unless one is given."""
+        token = super().for_user(user)
+        if session is None:
+            session = RefreshSession.objects.create(
+                user=user, expires_at=token.expires_at
+            )
+
+        token[SESSION_CLAIM] = str(session.pk)
+        token[GENERATION_CLAIM] = session.generation
+        return add_user_claims(token, user)
+
+    def rotate(self):
+        """Returns the session's next token, revoking it on reuse."""
+        error = None
+        with transaction.atomic():
+            session = (
+                RefreshSession.objects.select_for_update()
+                .select_related("user")
+                .filter(pk=self[SESSION_CLAIM], revoked_at__isnull=True)
+                .first()
+            )
+            if session is None:
+                error = "Session has been revoked."
+            elif not (
+                self[GENERATION_CLAIM] == session.generation
+                or self.replaced_just_now(session)
+            ):
+                # an older generation came back, the token was copied
+                error = "Refresh token was reused, session revoked."
+            elif not session.user.is_active:
+                error = "User is inactive."
+            else:
+                # a concurrent refresh of the token just replaced gets the
+                # current generation again and does not extend the interval
+                if self[GENERATION_CLAIM] == session.generation:
+                    session.generation += 1
+                    session.last_used_at = timezone.now()
+                token = type(self).for_user(session.user, session=session)
+                session.expires_at = token.expires_at
+                session.save(update_fields=["generation", "expires_at", "last_used_at"])
+                return token
+
+            if session is not None:
+                session.revoked_at = timezone.now()
+                session.save(update_fields=["revoked_at"])
+
+        raise TokenError(error)
+
+    def replaced_just_now(self, session):
+        return (
+            self[GENERATION_CLAIM] == session.generation - 1
+            and session.last_used_at is not None
+            and timezone.now() - session.last_used_at
+            <= settings.REFRESH_TOKEN_REUSE_INTERVAL
+        )
+
+    def revoke(self):
+        RefreshSession.objects.filter(
+            pk=self[SESSION_CLAIM], revoked_at__isnull=True
+        ).update(revoked_at=timezone.now())
@@ -6,9 +6,11 @@ from rest_framework_simplejwt.views import (
     TokenBlacklistView,
 )
 from rest_framework import routers
+from analytics.views import AnalyticsViewSet
 
 router = routers.DefaultRouter()
 router.register("users", views.UserViewSet, basename="user")
+router.register("analytics", AnalyticsViewSet, basename="analytics")
 
 urlpatterns = [
     path("google/login/", views.GoogleLoginView.as_view(), name="google_login"),
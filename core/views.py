@@ -1,5 +1,10 @@
+import json
 from django.conf import settings
+from django.http import JsonResponse
 from django.shortcuts import get_object_or_404
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
 from django.contrib.auth import get_user_model
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.views import APIView
@@ -7,7 +12,6 @@ from rest_framework.decorators import action
 from rest_framework.viewsets import ModelViewSet
 from rest_framework.response import Response
 from rest_framework import status
-from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
 from .serializers import (
     UserCreateSerializer,
@@ -16,19 +20,22 @@ from .serializers import (
     UserUpdateSerializer,
     SuperUserUpdateSerializer,
     UserActivationSerializer,
+    ClaimsTokenObtainPairSerializer,
 )
 from .permisions import IsSuperUser
+from .planner import QueryPlanViewMixin
 from .services import authenticate_google_user, authenticate_google_id_token
 
 User = get_user_model()
 
 
-class UserViewSet(ModelViewSet):
+class UserViewSet(QueryPlanViewMixin, ModelViewSet):
     permission_classes = [IsSuperUser]
     http_method_names = ["get", "post", "patch", "head", "options"]
+    cursor_ordering = ("date_joined", "id")
 
     def get_queryset(self):
-        return User.objects.all()
+        return self.plan_queryset(User.objects.all())
 
     def get_serializer_class(self):
         if self.action == "activate" or self.action == "deactivate":
@@ -55,6 +62,9 @@ class UserViewSet(ModelViewSet):
     )
     def me(self, request):
         user = request.user
+        if not isinstance(user, User):
+            # stateless authentication only carries the token's claims
+            user = get_object_or_404(User, pk=user.pk)
 
         if request.method == "PATCH":
             serializer = self.get_serializer(user, data=request.data, partial=True)
@@ -108,7 +118,7 @@ class SuperUserOnlyTokenObtainPairView(APIView):
     Regular users should use Google OAuth for authentication.
     """
 
-    serializer_class = TokenObtainPairSerializer
+    serializer_class = ClaimsTokenObtainPairSerializer
 
     def post(self, request):
         serializer = self.serializer_class(data=request.data)
@@ -145,32 +155,49 @@ class GoogleLoginView(APIView):
         return Response({"login_url": login_url}, status=status.HTTP_200_OK)
 
 
-class GoogleCallbackView(APIView):
-    """View to handle Google OAuth callback"""
+class GoogleCallbackView(View):
+    """
+    View to handle Google OAuth callback.
 
-    def get(self, request):
-        # Extract the authorization code from the request body
-        code = request.query_params.get("code")
+    Async, so a worker is not held while Google answers; only creating the
+    user runs in a (short) transaction.
+    """
+
+    async def get(self, request):
+        # Extract the authorization code from the query string
+        code = request.GET.get("code")
         # Validate that a code is provided
         if not code:
-            return Response(
+            return JsonResponse(
                 {"error": "No authorization code provided"},
                 status=status.HTTP_400_BAD_REQUEST,
             )
         # Authenticate the user with the provided authorization code
-        return authenticate_google_user(code)
-
-
-class GoogleIdTokenView(APIView):
-    """View to handle Google ID token validation"""
-
-    def post(self, request):
-        # Extract the ID token from the request body
-        id_token = request.data.get("id_token")
+        return await authenticate_google_user(code)
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class GoogleIdTokenView(View):
+    """View to handle Google ID token validation, async like the callback"""
+
+    async def post(self, request):
+        # Extract the ID token from the request body, JSON or form encoded
+        if request.content_type == "application/json":
+            try:
+                data = json.loads(request.body or b"{}")
+            except ValueError:
+                data = None
+            if not isinstance(data, dict):
+                return JsonResponse(
+                    {"error": "Invalid JSON body"}, status=status.HTTP_400_BAD_REQUEST
+                )
+        else:
+            data = request.POST
+        id_token = data.get("id_token")
         # Validate that an ID token is provided
         if not id_token:
-            return Response(
+            return JsonResponse(
                 {"error": "No ID token provided"}, status=status.HTTP_400_BAD_REQUEST
             )
         # Authenticate the user with the provided ID token
-        return authenticate_google_id_token(id_token)
+        return await authenticate_google_id_token(id_token)
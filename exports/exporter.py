@@ -0,0 +1,100 @@
+import zlib
+import orjson
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+from core.projection import get_projection
+from core.streaming import chunked
+from .serializers import (
+    GroupExportSerializer,
+    ListExportSerializer,
+    TaskExportSerializer,
+    StepExportSerializer,
+    LabelExportSerializer,
+)
+
+# export format version, bumped when records change incompatibly
+EXPORT_VERSION = 1
+
+# (record type, serializer, owner lookup), parents before their children
+EXPORTED_TABLES = [
+    ("label", LabelExportSerializer, "owner_id"),
+    ("group", GroupExportSerializer, "owner_id"),
+    ("list", ListExportSerializer, "owner_id"),
+    ("task", TaskExportSerializer, "owner_id"),
+    ("step", StepExportSerializer, "task__owner_id"),
+]
+
+
+def export_lines(profile_id):
+    """
+    Yields a profile's data as NDJSON lines: an ``export`` header, then one
+    ``{"type": ..., "data": {...}}`` record per row, table by table in
+    primary key order.
+
+    Rows are read through ``iterator()``, a server-side cursor on
+    PostgreSQL, and rendered ``EXPORT_CHUNK_SIZE`` at a time, so memory
+    does not grow with the account. On PostgreSQL every table is read from
+    the same REPEATABLE READ snapshot.
+
+    The transaction stays open until the last line is read, so a download
+    holds it for as long as the client takes. Under ASGI the view pulls the
+    lines with ``core.streaming.aiterate``, always in the request's sync
+    thread and so on the same connection. A client that disconnects closes
+    the generator there, which rolls the transaction back.
+    """
+    size = settings.EXPORT_CHUNK_SIZE
+    # the isolation level can only be set by the transaction's first query
+    outermost = not connection.in_atomic_block
+    with transaction.atomic():
+        if outermost and connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SET TRANSACTION ISOLATION LEVEL REPEATABLE READ READ ONLY"
+                )
+
+        yield _dumps(
+            {
+                "type": "export",
+                "version": EXPORT_VERSION,
+                "profile": str(profile_id),
+                "exported_at": timezone.now().isoformat(),
+            }
+        )
+        for kind, serializer_class, owner_lookup in EXPORTED_TABLES:
+            projection = get_projection(serializer_class)
+            model = serializer_class.Meta.model
+            rows = projection.values(
+                model._default_manager.filter(**{owner_lookup: profile_id})
+            ).order_by("pk")
+            for chunk in chunked(rows.iterator(chunk_size=size), size):
+                for data in projection.render(chunk):
+                    yield _dumps({"type": kind, "data": data})
+
+
+def export_bytes(profile_id, compress=False):
+    """
+    Joins ``export_lines()`` into blocks of about ``EXPORT_BLOCK_SIZE``
+    bytes, gzipped when ``compress`` is set.
+    """
+    compressor = zlib.compressobj(wbits=31) if compress else None
+    block, length = [], 0
+    for line in export_lines(profile_id):
+        block.append(line)
+        length += len(line)
+        if length >= settings.EXPORT_BLOCK_SIZE:
+            data = b"".join(block)
+            block, length = [], 0
+            data = compressor.compress(data) if compressor else data
+            if data:
+                yield data
+
+    data = b"".join(block)
+    if compressor:
+        data = compressor.compress(data) + compressor.flush()
+    if data:
+        yield data
+
+
+def _dumps(record):
+    return orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE)
@@ -0,0 +1,47 @@
+import sys
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from profiles.models import Profile
+from exports.exporter import export_bytes
+
+
+class Command(BaseCommand):
+    help = (
+        "Writes a profile's groups, lists, tasks, steps and labels as NDJSON "
+        "to a file or stdout, see exports.exporter."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("profile", help="Profile id, or username with --user.")
+        parser.add_argument(
+            "--user", action="store_true", help="Look the profile up by username."
+        )
+        parser.add_argument("-o", "--output", help="Output file, stdout by default.")
+        parser.add_argument("--gzip", action="store_true", help="Gzip the output.")
+
+    def handle(self, *args, **options):
+        lookup = "user__username" if options["user"] else "id"
+        try:
+            profile_id = Profile.objects.values_list("id", flat=True).get(
+                **{lookup: options["profile"]}
+            )
+        except (Profile.DoesNotExist, ValidationError):
+            raise CommandError(f"Profile {options['profile']} not found.")
+
+        output = options["output"]
+        stream = open(output, "wb") if output else sys.stdout.buffer
+        written = 0
+        try:
+            for block in export_bytes(profile_id, compress=options["gzip"]):
+                stream.write(block)
+                written += len(block)
+        finally:
+            if output:
+                stream.close()
+            else:
+                stream.flush()
+
+        if output:
+            self.stdout.write(
+                self.style.SUCCESS(f"Exported profile {profile_id}: {written} bytes.")
+            )
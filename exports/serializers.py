@@ -0,0 +1,53 @@
+from django.apps import apps
+from django.conf import settings
+from django.db.models import Model
+from rest_framework import serializers
+from tasks.models import Task, TaskStep, Label
+
+# Models
+TaskList: Model = apps.get_model(settings.TASKLIST_MODEL)
+GroupList: Model = apps.get_model(settings.GROUP_LIST_MODEL)
+
+
+class GroupExportSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = GroupList
+        fields = ["id", "name", "archived", "created_at", "updated_at"]
+
+
+class ListExportSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = TaskList
+        fields = ["id", "name", "emoji", "group", "archived", "created_at", "updated_at"]
+
+
+class TaskExportSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Task
+        fields = [
+            "id",
+            "text",
+            "note",
+            "is_completed",
+            "is_important",
+            "due_date",
+            "reminder_date",
+            "priority",
+            "label",
+            "task_list",
+            "archived",
+            "created_at",
+            "updated_at",
+        ]
+
+
+class StepExportSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = TaskStep
+        fields = ["id", "text", "task", "created_at", "updated_at"]
+
+
+class LabelExportSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Label
+        fields = ["id", "name", "created_at", "updated_at"]
@@ -0,0 +1,109 @@
+import gzip
+import warnings
+from contextlib import aclosing
+import orjson
+from asgiref.sync import async_to_sync, sync_to_async
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, override_settings
+from core.models import User
+from core.streaming import aiterate
+from core.testing import asgi_get, create_account
+from tasks.models import Label, Task, TaskStep
+from .exporter import export_lines
+
+
+def create_exported_account(username):
+    account = create_account(username)
+    label = Label.objects.create(name="Label", owner=account.profile)
+    for number in range(3):
+        task = Task.objects.create(
+            text=f"Task {number}",
+            task_list=account.task_list,
+            owner=account.profile,
+            label=label,
+        )
+        TaskStep.objects.create(text="Step", task=task)
+    return account
+
+
+@override_settings(EXPORT_CHUNK_SIZE=2, EXPORT_BLOCK_SIZE=100)
+class ExportTests(TestCase):
+    def setUp(self):
+        account = create_exported_account("owner")
+        self.user, self.client = account.user, account.client
+        create_exported_account("other")
+
+    def export(self, url="/api/export/"):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return b"".join(response.streaming_content)
+
+    def test_records(self):
+        lines = [orjson.loads(line) for line in self.export().splitlines()]
+
+        self.assertEqual(lines[0]["type"], "export")
+        self.assertEqual(
+            [line["type"] for line in lines[1:]],
+            ["label", "group", "list"] + ["task"] * 3 + ["step"] * 3,
+        )
+        tasks = [line["data"] for line in lines if line["type"] == "task"]
+        self.assertEqual(
+            [task["id"] for task in tasks],
+            list(
+                Task.objects.filter(owner__user=self.user)
+                .order_by("pk")
+                .values_list("pk", flat=True)
+            ),
+        )
+
+    def test_gzip(self):
+        body = self.export().splitlines()
+        unzipped = gzip.decompress(self.export("/api/export/?gzip=true")).splitlines()
+
+        # the headers differ by their timestamp
+        self.assertEqual(unzipped[1:], body[1:])
+
+    def test_profile_is_required(self):
+        self.client.force_authenticate(
+            User.objects.create_superuser(
+                username="admin", email="admin@example.com", password=None
+            )
+        )
+
+        self.assertEqual(self.client.get("/api/export/").status_code, 400)
+
+
+class ExportSnapshotTests(TransactionTestCase):
+    def setUp(self):
+        account = create_exported_account("owner")
+        self.user, self.client = account.user, account.client
+
+    def test_asgi_download(self):
+        expected = b"".join(self.client.get("/api/export/").streaming_content)
+        chunks = []
+
+        with override_settings(EXPORT_BLOCK_SIZE=100):
+            with warnings.catch_warnings(record=True) as caught:
+                warnings.simplefilter("always")
+                status = asgi_get("/api/export/", self.user, chunks.append)
+
+        self.assertEqual(status, 200)
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual(b"".join(chunks).splitlines()[1:], expected.splitlines()[1:])
+        # a sync iterator would have been read whole first
+        self.assertFalse(
+            [w for w in caught if "synchronous iterators" in str(w.message)]
+        )
+
+    def test_disconnect_ends_the_transaction(self):
+        profile_id = self.user.profile.pk
+        # aiterate pulls the lines in this thread, so on this connection
+        in_atomic_block = sync_to_async(lambda: connection.in_atomic_block)
+
+        async def read_header():
+            async with aclosing(aiterate(export_lines(profile_id))) as lines:
+                await anext(lines)
+                return await in_atomic_block()
+
+        self.assertTrue(async_to_sync(read_header)())
+        self.assertFalse(connection.in_atomic_block)
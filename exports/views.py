@@ -0,0 +1,39 @@
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.viewsets import ViewSet
+from core.principal import get_principal
+from core.streaming import get_streaming_content
+from .exporter import export_bytes
+
+
+class ExportViewSet(ViewSet):
+    """
+    Downloads every group, list, task, step and label of the caller's
+    profile as NDJSON, see exports.exporter.
+
+    ``GET /api/export/`` or ``GET /api/export/?gzip=true`` for a gzipped file.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def list(self, request):
+        owner_id = get_principal(request).profile_id
+        if owner_id is None:
+            return Response(
+                {"owner": "Profile is required to export."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        compress = request.query_params.get("gzip") in ("1", "true")
+        filename = f"blazely-export-{timezone.now():%Y%m%d}.ndjson"
+        if compress:
+            filename += ".gz"
+        response = StreamingHttpResponse(
+            get_streaming_content(request, export_bytes(owner_id, compress=compress)),
+            content_type="application/gzip" if compress else "application/x-ndjson",
+        )
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
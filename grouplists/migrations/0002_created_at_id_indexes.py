@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('grouplists', '0001_initial'),
+        ('profiles', '0002_created_at_id_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='grouplist',
+            index=models.Index(fields=['created_at', 'id'], name='grouplist_created_id_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('grouplists', '0002_created_at_id_indexes'),
+        ('profiles', '0002_created_at_id_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='grouplist',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddIndex(
+            model_name='grouplist',
+            index=models.Index(fields=['owner', 'updated_at'], name='grouplist_owner_updated_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('grouplists', '0003_updated_at'),
+        ('profiles', '0002_created_at_id_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='grouplist',
+            index=models.Index(fields=['owner', 'created_at', 'id'], name='grouplist_owner_created_idx'),
+        ),
+    ]
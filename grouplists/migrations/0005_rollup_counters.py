@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('grouplists', '0004_owner_scoped_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='grouplist',
+            name='completed_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='grouplist',
+            name='important_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='grouplist',
+            name='overdue_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='grouplist',
+            name='task_count',
+            field=models.IntegerField(default=0),
+        ),
+    ]
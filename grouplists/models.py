@@ -1,17 +1,24 @@
 from django.db import models
 from django.conf import settings
+from core.models import AtomicSaveMixin
 
 PROFILE_MODEL = settings.PROFILE_MODEL
 
 
 # Create your models here.
-class GroupList(models.Model):
+class GroupList(AtomicSaveMixin, models.Model):
     name = models.CharField(max_length=150)
     archived = models.BooleanField(default=False)
+    # sums of the counters of the group's lists, see tasklists.counters
+    task_count = models.IntegerField(default=0)
+    completed_count = models.IntegerField(default=0)
+    important_count = models.IntegerField(default=0)
+    overdue_count = models.IntegerField(default=0)
     owner = models.ForeignKey(
         PROFILE_MODEL, related_name="group_lists", on_delete=models.CASCADE
     )
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return self.name
@@ -19,4 +26,13 @@ class GroupList(models.Model):
     class Meta:
         constraints = [
             models.UniqueConstraint(fields=["name", "owner"], name="unique_group_list")
+        ]
+        indexes = [
+            models.Index(fields=["created_at", "id"], name="grouplist_created_id_idx"),
+            models.Index(
+                fields=["owner", "created_at", "id"], name="grouplist_owner_created_idx"
+            ),
+            models.Index(
+                fields=["owner", "updated_at"], name="grouplist_owner_updated_idx"
+            ),
         ]
\ No newline at end of file
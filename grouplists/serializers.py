@@ -1,13 +1,16 @@
 from django.db.models import Model
 from django.db import transaction
+from django.utils import timezone
 from django.conf import settings
 from django.apps import apps
 from django.utils.module_loading import import_string
 from rest_framework import serializers
+from core.fieldsets import SparseFieldsMixin
+from tasklists.counters import COUNTER_FIELDS, recompute_groups
+from profiles.versions import bump_data_versions
 from .models import GroupList
 
 # Models
-Profile: Model = apps.get_model(settings.PROFILE_MODEL)
 TaskList: Model = apps.get_model(settings.TASKLIST_MODEL)
 
 # Serializers
@@ -16,27 +19,29 @@ TaskListWithoutGroupSerializer: serializers.ModelSerializer = import_string(
 )
 
 
-class GroupListSerializer(serializers.ModelSerializer):
+class GroupListSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     lists = TaskListWithoutGroupSerializer(many=True, read_only=True)
 
     class Meta:
         model = GroupList
-        fields = ["id", "name", "lists"]
+        fields = ["id", "name", "lists", *COUNTER_FIELDS]
+        read_only_fields = COUNTER_FIELDS
 
     def create(self, validated_data):
-        user = self.context.get("user")
-        owner = Profile.objects.filter(user=user).first()
-        if GroupList.objects.filter(name=validated_data["name"], owner=owner).exists():
+        owner_id = self.context["principal"].profile_id
+        if GroupList.objects.filter(
+            name=validated_data["name"], owner_id=owner_id
+        ).exists():
             raise serializers.ValidationError(
                 {"name": "Group list with given name already exists."}
             )
 
-        if not owner:
+        if not owner_id:
             raise serializers.ValidationError(
                 {"owner": "Profile is required to create a group list."}
             )
 
-        validated_data["owner"] = owner
+        validated_data["owner_id"] = owner_id
         return super().create(validated_data)
 
 
@@ -82,10 +87,22 @@ class ManageListsOnGroupSerializer(serializers.Serializer):
         tasklist_ids = self.validated_data.get("tasklist_ids", [])
 
         with transaction.atomic():
+            old_group_ids = set(
+                TaskList.objects.filter(id__in=tasklist_ids).values_list(
+                    "group_id", flat=True
+                )
+            )
             # Your existing save logic here
+            # update() skips auto_now, so updated_at is set for delta sync
             if action == "add":
-                TaskList.objects.filter(id__in=tasklist_ids).update(group=group)
+                TaskList.objects.filter(id__in=tasklist_ids).update(
+                    group=group, updated_at=timezone.now()
+                )
             elif action == "remove":
-                TaskList.objects.filter(id__in=tasklist_ids).update(group=None)
+                TaskList.objects.filter(id__in=tasklist_ids).update(
+                    group=None, updated_at=timezone.now()
+                )
+            recompute_groups(old_group_ids | {group.id})
+            bump_data_versions([group.owner_id])
 
         return group
@@ -1,3 +1,44 @@
 from django.test import TestCase
+from core.testing import create_account
+from tasks.models import Task
 
-# Create your tests here.
+
+class GroupListFieldsetTests(TestCase):
+    def setUp(self):
+        account = create_account()
+        self.group, self.client = account.group, account.client
+        Task.objects.create(
+            text="Task",
+            note="Note",
+            task_list=account.task_list,
+            owner=account.profile,
+        )
+
+    def test_depth_zero_renders_the_group_only(self):
+        response = self.client.get("/api/groups/?depth=0")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("lists", response.json()["results"][0])
+
+    def test_negative_depth_is_rejected(self):
+        for depth in ("-1", "deep"):
+            response = self.client.get(f"/api/groups/?depth={depth}")
+            self.assertEqual(response.status_code, 400)
+            self.assertEqual(
+                response.json()["depth"], "Depth must be a non-negative integer."
+            )
+
+    def test_fields_and_omit(self):
+        response = self.client.get("/api/groups/?fields=name,lists.name")
+        self.assertEqual(
+            response.json()["results"][0],
+            {"name": "Group", "lists": [{"name": "List"}]},
+        )
+
+        response = self.client.get(
+            "/api/groups/?omit=lists.tasks.steps,lists.tasks.note"
+        )
+        task = response.json()["results"][0]["lists"][0]["tasks"][0]
+        self.assertEqual(task["text"], "Task")
+        self.assertNotIn("steps", task)
+        self.assertNotIn("note", task)
@@ -5,6 +5,10 @@ from rest_framework.decorators import action
 from rest_framework.viewsets import ModelViewSet
 from rest_framework.permissions import IsAuthenticated, BasePermission
 from django_filters.rest_framework import DjangoFilterBackend
+from core.conditional import ConditionalGetViewMixin
+from core.streaming import StreamingListViewMixin
+from core.response_cache import cache_response
+from core.principal import PrincipalViewMixin
 from .models import GroupList
 from .serializers import GroupListSerializer, ManageListsOnGroupSerializer
 from .filters import GroupListFilter
@@ -13,7 +17,9 @@ from .filters import GroupListFilter
 IsSuperUser: BasePermission = import_string("core.permisions.IsSuperUser")
 
 
-class GroupListViewSet(ModelViewSet):
+class GroupListViewSet(
+    ConditionalGetViewMixin, PrincipalViewMixin, StreamingListViewMixin, ModelViewSet
+):
     permission_classes = [IsAuthenticated]
     serializer_class = GroupListSerializer
     filter_backends = [DjangoFilterBackend]
@@ -22,24 +28,31 @@ class GroupListViewSet(ModelViewSet):
     def get_queryset(self):
         user = self.request.user
 
+        # core.planner derives the prefetches from the requested fieldset
+        queryset = self.plan_queryset(GroupList.objects.all())
+
         if user.is_superuser:
-            return GroupList.objects.prefetch_related("lists__tasks__steps").order_by(
-                "created_at"
-            )
+            return queryset.order_by("created_at")
 
-        return (
-            GroupList.objects.prefetch_related("lists__tasks__steps")
-            .filter(owner__user=user)
-            .order_by("created_at")
+        return queryset.filter(owner_id=self.principal.profile_id).order_by(
+            "created_at"
         )
 
+    @cache_response
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
     def get_serializer_class(self):
         if self.action == "manage_lists":
             return ManageListsOnGroupSerializer
         return GroupListSerializer
 
     def get_serializer_context(self):
-        return {"user": self.request.user}
+        return {
+            "user": self.request.user,
+            "principal": self.principal,
+            "fieldset": self.get_fieldset(),
+        }
 
     @action(detail=True, methods=["patch"])
     def manage_lists(self, request, pk=None):
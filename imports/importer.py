@@ -0,0 +1,170 @@
+from collections import Counter
+from django.apps import apps
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Model
+from tasks.models import Task, TaskStep, Label
+from tasks.signals import tasks_bulk_changed, steps_bulk_changed
+
+# Models
+TaskList: Model = apps.get_model(settings.TASKLIST_MODEL)
+GroupList: Model = apps.get_model(settings.GROUP_LIST_MODEL)
+
+# keys of Importer.counts
+COUNTED = {GroupList: "groups", TaskList: "lists", Label: "labels"}
+
+# list receiving tasks whose list is not named in the file
+DEFAULT_LIST_NAME = "Imported"
+
+
+def fit(value, model, field):
+    return value[: model._meta.get_field(field).max_length] if value else value
+
+
+class Importer:
+    """
+    Creates a profile's groups, lists, labels, tasks and steps from the
+    records of an imports.parsers parser.
+
+    Groups, lists and labels are few and created as they come, reusing the
+    profile's rows of the same name. Tasks and steps are buffered and
+    inserted with ``bulk_create`` every ``IMPORT_BATCH_SIZE`` rows, their
+    foreign keys resolved through maps from file keys to the new ids. Each
+    batch sends tasks_bulk_changed/steps_bulk_changed for list counters,
+    search and data versions. ``progress(counts)`` is called after every
+    batch.
+    """
+
+    def __init__(self, owner_id, batch_size=None, progress=None):
+        self.owner_id = owner_id
+        self.batch_size = batch_size or settings.IMPORT_BATCH_SIZE
+        self.progress = progress
+        self.counts = Counter()
+
+        # names the profile already uses, to id
+        self.group_names = self.names(GroupList)
+        self.list_names = self.names(TaskList)
+        self.label_names = self.names(Label)
+        # file keys to ids
+        self.groups = {}
+        self.lists = {}
+        self.tasks = {}
+        # step keys to the key of their task, for sub-tasks of sub-tasks
+        self.step_tasks = {}
+
+        self.pending_tasks = []
+        self.pending_steps = []
+        # steps read ahead of their task, retried after every batch
+        self.orphans = []
+
+    def names(self, model):
+        return dict(
+            model.objects.filter(owner_id=self.owner_id).values_list("name", "id")
+        )
+
+    def run(self, records):
+        with transaction.atomic():
+            for kind, key, fields in records:
+                getattr(self, f"add_{kind}")(key, fields)
+            self.flush()
+            self.counts["skipped"] += len(self.orphans)
+        return self.counts
+
+    def get_or_create(self, model, names, name, **fields):
+        if name not in names:
+            names[name] = model.objects.create(
+                name=name, owner_id=self.owner_id, **fields
+            ).pk
+            self.counts[COUNTED[model]] += 1
+        return names[name]
+
+    def add_group(self, key, fields):
+        name = fit(fields["name"], GroupList, "name") or "Untitled"
+        self.groups[key] = self.get_or_create(GroupList, self.group_names, name)
+
+    def add_list(self, key, fields):
+        name = fit(fields["name"], TaskList, "name") or "Untitled"
+        group_id = self.groups.get(fields.get("group"))
+        self.lists[key] = self.get_or_create(
+            TaskList, self.list_names, name, group_id=group_id
+        )
+
+    def add_task(self, key, fields):
+        fields = dict(fields)
+        list_id = self.lists.get(fields.pop("list"))
+        if list_id is None:
+            list_id = self.get_or_create(TaskList, self.list_names, DEFAULT_LIST_NAME)
+
+        label = fit(fields.pop("label"), Label, "name")
+        label_id = self.get_or_create(Label, self.label_names, label) if label else None
+
+        fields.update(
+            text=fit(fields["text"], Task, "text") or "",
+            note=fit(fields["note"], Task, "note"),
+        )
+        self.pending_tasks.append(
+            (
+                key,
+                Task(
+                    owner_id=self.owner_id,
+                    task_list_id=list_id,
+                    label_id=label_id,
+                    **fields,
+                ),
+            )
+        )
+        if len(self.pending_tasks) >= self.batch_size:
+            self.flush()
+
+    def add_step(self, key, fields):
+        task_key = self.step_tasks.get(fields["task"], fields["task"])
+        self.step_tasks[key] = task_key
+        self.pending_steps.append((task_key, TaskStep(text=fields["text"])))
+        if len(self.pending_steps) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        self.flush_tasks()
+        steps, self.pending_steps = self.orphans + self.pending_steps, []
+        self.orphans = []
+        for task_key, step in steps:
+            step.task_id = self.tasks.get(task_key)
+            if step.task_id is None:
+                self.orphans.append((task_key, step))
+            else:
+                self.pending_steps.append((task_key, step))
+        self.flush_steps()
+        if self.progress is not None:
+            self.progress(self.counts)
+
+    def flush_tasks(self):
+        if not self.pending_tasks:
+            return
+        created = Task.objects.bulk_create(
+            [task for _, task in self.pending_tasks], batch_size=self.batch_size
+        )
+        for (key, _), task in zip(self.pending_tasks, created):
+            self.tasks[key] = task.pk
+        self.pending_tasks = []
+        self.counts["tasks"] += len(created)
+        tasks_bulk_changed.send(
+            sender=Task,
+            task_ids=[task.pk for task in created],
+            task_list_ids={task.task_list_id for task in created},
+            fields=None,
+        )
+
+    def flush_steps(self):
+        if not self.pending_steps:
+            return
+        created = TaskStep.objects.bulk_create(
+            [step for _, step in self.pending_steps], batch_size=self.batch_size
+        )
+        self.pending_steps = []
+        self.counts["steps"] += len(created)
+        steps_bulk_changed.send(
+            sender=TaskStep,
+            step_ids=[step.pk for step in created],
+            task_ids={step.task_id for step in created},
+            fields=None,
+        )
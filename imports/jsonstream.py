@@ -0,0 +1,117 @@
+import codecs
+import json
+
+
+class JSONStreamError(ValueError):
+    pass
+
+
+class JSONStream:
+    """
+    A cursor over a JSON document read from ``fp`` (text or bytes) a block
+    at a time. ``value()`` reads the next value whole, ``members()`` and
+    ``elements()`` step into an object or array instead, yielding before
+    each member or element, which the caller reads (with ``value()`` or by
+    stepping into it) before asking for the next one.
+    """
+
+    def __init__(self, fp, size=64 * 1024):
+        self.fp = fp
+        self.size = size
+        self.buffer = ""
+        self.pos = 0
+        self.decoder = json.JSONDecoder()
+        self.text = codecs.getincrementaldecoder("utf-8-sig")()
+
+    def fill(self):
+        # reads at least what is buffered, so a value parsed again after
+        # every read is parsed a logarithmic number of times
+        data = self.fp.read(max(self.size, len(self.buffer) - self.pos))
+        if not data:
+            return False
+        if isinstance(data, bytes):
+            data = self.text.decode(data)
+        self.buffer = self.buffer[self.pos :] + data
+        self.pos = 0
+        return True
+
+    def peek(self):
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in " \t\r\n":
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill():
+                return ""
+
+    def expect(self, chars):
+        char = self.peek()
+        if not char or char not in chars:
+            raise JSONStreamError(f"Expected one of {chars!r}, found {char!r}.")
+        self.pos += 1
+        return char
+
+    def value(self):
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError as e:
+                if not self.fill():
+                    raise JSONStreamError(str(e)) from e
+                continue
+            # a number ending the buffer may go on in the next read
+            if end == len(self.buffer) and self.fill():
+                continue
+            self.pos = end
+            return value
+
+    def members(self):
+        """Yields the key of each member of the next object."""
+        self.expect("{")
+        if self.peek() == "}":
+            self.pos += 1
+            return
+        while True:
+            key = self.value()
+            if not isinstance(key, str):
+                raise JSONStreamError("Expected an object key.")
+            self.expect(":")
+            yield key
+            if self.expect(",}") == "}":
+                return
+
+    def elements(self):
+        """Yields the position of each element of the next array."""
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        index = 0
+        while True:
+            yield index
+            index += 1
+            if self.expect(",]") == "]":
+                return
+
+
+def iter_json(fp, size=64 * 1024):
+    """
+    Reads a JSON document from ``fp`` (text or bytes) a block at a time and
+    yields ``(key, value)`` for each member of the top-level object. Arrays
+    are yielded one element at a time, each as ``(key, element)``, so only
+    one element is held in memory. A top-level array yields
+    ``(None, element)``.
+    """
+    stream = JSONStream(fp, size)
+    if stream.peek() == "[":
+        for _ in stream.elements():
+            yield None, stream.value()
+        return
+
+    for key in stream.members():
+        if stream.peek() == "[":
+            for _ in stream.elements():
+                yield key, stream.value()
+        else:
+            yield key, stream.value()
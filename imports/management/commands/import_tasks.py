@@ -0,0 +1,53 @@
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from profiles.models import Profile
+from imports.importer import Importer
+from imports.parsers import PARSERS, ImportFormatError
+
+
+class Command(BaseCommand):
+    help = (
+        "Imports a Todoist, Microsoft To Do or iCalendar export into a "
+        "profile, see imports.parsers."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("profile", help="Profile id, or username with --user.")
+        parser.add_argument("file")
+        parser.add_argument("--source", choices=sorted(PARSERS), required=True)
+        parser.add_argument(
+            "--user", action="store_true", help="Look the profile up by username."
+        )
+        parser.add_argument("--list", help="List to import single-list formats into.")
+        parser.add_argument("--batch-size", type=int)
+
+    def handle(self, *args, **options):
+        lookup = "user__username" if options["user"] else "id"
+        try:
+            profile_id = Profile.objects.values_list("id", flat=True).get(
+                **{lookup: options["profile"]}
+            )
+        except (Profile.DoesNotExist, ValidationError):
+            raise CommandError(f"Profile {options['profile']} not found.")
+
+        self.verbosity = options["verbosity"]
+        importer = Importer(
+            profile_id, batch_size=options["batch_size"], progress=self.progress
+        )
+        parse = PARSERS[options["source"]]
+        try:
+            with open(options["file"], "rb") as fp:
+                counts = importer.run(parse(fp, options["list"]))
+        except (OSError, ImportFormatError, UnicodeDecodeError) as e:
+            raise CommandError(str(e))
+
+        self.stdout.write(self.style.SUCCESS(f"Imported {self.describe(counts)}."))
+
+    def progress(self, counts):
+        if self.verbosity > 1:
+            self.stdout.write(f"  {self.describe(counts)}")
+
+    @staticmethod
+    def describe(counts):
+        kinds = ("groups", "lists", "labels", "tasks", "steps", "skipped")
+        return ", ".join(f"{counts[kind]} {kind}" for kind in kinds)
@@ -0,0 +1,552 @@
+"""
+Parsers turning exports of other task apps into import records, see
+imports.importer.
+
+Every parser is a generator of ``(kind, key, fields)`` records:
+
+* ``("group", key, {"name"})``
+* ``("list", key, {"name", "group"})`` where ``group`` is a group key or None
+* ``("task", key, {"text", "note", "is_completed", "is_important",
+  "due_date", "reminder_date", "priority", "list", "label"})`` where
+  ``list`` is a list key (None for the default list) and ``label`` a name
+* ``("step", key, {"text", "task"})`` where ``task`` is the key of a task,
+  or of another step for deeper sub-tasks
+
+Keys only need to be unique within one file. Parents should come before
+their children, sub-tasks read ahead of their task are held back until it
+shows up.
+"""
+
+import csv
+import io
+from datetime import datetime, timezone as dt_timezone
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from .jsonstream import JSONStream, JSONStreamError, iter_json
+
+
+class ImportFormatError(ValueError):
+    pass
+
+
+JSON_TYPES = {
+    dict: "an object",
+    list: "an array",
+    str: "a string",
+    bool: "a boolean",
+    int: "a number",
+    float: "a number",
+    type(None): "null",
+}
+
+
+def invalid(what, expected, value):
+    found = JSON_TYPES.get(type(value), type(value).__name__)
+    return ImportFormatError(f"{what} should be {expected}, not {found}.")
+
+
+def expect_object(value, what):
+    """Returns ``value``, a dict, an empty one for missing values."""
+    if not value:
+        return {}
+    if not isinstance(value, dict):
+        raise invalid(what, "an object", value)
+    return value
+
+
+def expect_array(value, what):
+    """Returns ``value``, a list, an empty one for missing values."""
+    if not value:
+        return []
+    if not isinstance(value, list):
+        raise invalid(what, "an array", value)
+    return value
+
+
+def expect_text(value, what):
+    """Returns ``value``, a string or None."""
+    if value is not None and not isinstance(value, str):
+        raise invalid(what, "a string", value)
+    return value
+
+
+def require(record, key, what):
+    if record.get(key) is None:
+        raise ImportFormatError(f"{what} has no {key!r}.")
+    return record[key]
+
+
+def task(key, text, list_key=None, **fields):
+    return (
+        "task",
+        key,
+        {
+            "text": expect_text(text, "Task text"),
+            "note": expect_text(fields.get("note"), "Task note") or None,
+            "is_completed": bool(fields.get("is_completed")),
+            "is_important": bool(fields.get("is_important")),
+            "due_date": fields.get("due_date"),
+            "reminder_date": fields.get("reminder_date"),
+            "priority": fields.get("priority") or "4",
+            "list": list_key,
+            "label": expect_text(fields.get("label"), "Label") or None,
+        },
+    )
+
+
+def step(key, text, task_key):
+    return ("step", key, {"text": expect_text(text, "Step text"), "task": task_key})
+
+
+def text_stream(fp):
+    if isinstance(fp, io.TextIOBase):
+        return fp
+    return io.TextIOWrapper(fp, encoding="utf-8-sig", newline="")
+
+
+def to_date(value):
+    # dates may come with a time part, e.g. "2024-05-01T10:00:00"
+    if not value:
+        return None
+    try:
+        return parse_date(str(value)[:10])
+    except ValueError as e:
+        # well formed but out of range, e.g. "2024-13-45"
+        raise ImportFormatError(f"Invalid date {value!r}: {e}") from e
+
+
+def to_datetime(value, zone=None):
+    if not value:
+        return None
+    try:
+        moment = parse_datetime(str(value))
+    except ValueError as e:
+        raise ImportFormatError(f"Invalid date and time {value!r}: {e}") from e
+    if moment is None:
+        return None
+    if timezone.is_naive(moment):
+        try:
+            zone = ZoneInfo(zone) if zone else dt_timezone.utc
+        except (ZoneInfoNotFoundError, ValueError):
+            # Microsoft Graph may send Windows zone names
+            zone = dt_timezone.utc
+        moment = moment.replace(tzinfo=zone)
+    return moment
+
+
+def json_members(fp):
+    try:
+        yield from iter_json(fp)
+    except JSONStreamError as e:
+        raise ImportFormatError(f"Invalid JSON: {e}") from e
+
+
+def json_object(stream, what):
+    """Steps into the object ``what``, yielding its keys."""
+    if stream.peek() == "{":
+        yield from stream.members()
+    else:
+        expect_object(stream.value(), what)
+
+
+def json_elements(stream, what):
+    """Steps into the array ``what``, yielding the element positions."""
+    if stream.peek() == "[":
+        yield from stream.elements()
+    else:
+        expect_array(stream.value(), what)
+
+
+# Todoist
+
+
+def todoist_priority(value):
+    # the API counts priorities up, 4 is what the app shows as p1
+    try:
+        return str(5 - min(max(int(value), 1), 4))
+    except (TypeError, ValueError):
+        return "4"
+
+
+def parse_todoist_json(fp, list_name=None):
+    """
+    Todoist Sync API data (``projects``, ``labels`` and ``items``). Top-level
+    projects with sub-projects become groups, every project a list, items a
+    task and sub-items steps. Projects are read in a first pass over the
+    file, so ``fp`` has to be seekable.
+    """
+    projects = {}
+    for key, value in json_members(fp):
+        if key == "projects":
+            project = expect_object(value, "A Todoist project")
+            if project and not project.get("is_deleted"):
+                project_key = str(require(project, "id", "A Todoist project"))
+                if not project.get("inbox_project"):
+                    expect_text(
+                        require(project, "name", f"Todoist project {project_key}"),
+                        f"The name of Todoist project {project_key}",
+                    )
+                projects[project_key] = project
+
+    parents = {
+        key: str(project["parent_id"])
+        for key, project in projects.items()
+        if project.get("parent_id")
+    }
+    roots = {}
+    for key in projects:
+        root, seen = key, {key}
+        while parents.get(root) in projects and parents[root] not in seen:
+            root = parents[root]
+            seen.add(root)
+        roots[key] = root
+
+    grouped = {roots[key] for key in parents}
+    for key in sorted(grouped):
+        yield ("group", key, {"name": projects[key]["name"]})
+    for key, project in projects.items():
+        name = "Inbox" if project.get("inbox_project") else project["name"]
+        group = roots[key] if roots[key] in grouped else None
+        yield ("list", key, {"name": name, "group": group})
+    del projects, parents, roots
+
+    fp.seek(0)
+    for key, item in json_members(fp):
+        if key != "items":
+            continue
+        item = expect_object(item, "A Todoist item")
+        if not item or item.get("is_deleted"):
+            continue
+        text = item.get("content") or ""
+        item_key = str(require(item, "id", "A Todoist item"))
+        if item.get("parent_id"):
+            yield step(item_key, text, str(item["parent_id"]))
+            continue
+        due = expect_object(item.get("due"), f"The due of Todoist item {item_key}")
+        labels = expect_array(
+            item.get("labels"), f"The labels of Todoist item {item_key}"
+        )
+        yield task(
+            item_key,
+            text,
+            str(item.get("project_id")) if item.get("project_id") else None,
+            note=item.get("description"),
+            is_completed=item.get("checked"),
+            due_date=to_date(due.get("date")),
+            priority=todoist_priority(item.get("priority")),
+            label=labels[0] if labels else None,
+        )
+
+
+def parse_todoist_csv(fp, list_name=None):
+    """
+    One Todoist project exported as CSV, imported into the list
+    ``list_name``. Rows indented under a task become its steps, sections
+    and notes are skipped.
+    """
+    reader = csv.DictReader(text_stream(fp))
+    if not reader.fieldnames or "CONTENT" not in reader.fieldnames:
+        raise ImportFormatError("Not a Todoist CSV export, CONTENT is missing.")
+
+    list_key = "list"
+    yield ("list", list_key, {"name": list_name or "Todoist", "group": None})
+    # keys of the last task or step seen at each indent level
+    parents = {}
+    for number, row in enumerate(reader, start=1):
+        if (row.get("TYPE") or "task").strip().lower() != "task":
+            continue
+        text = (row.get("CONTENT") or "").strip()
+        if not text:
+            continue
+        try:
+            indent = max(int(row.get("INDENT") or 1), 1)
+        except ValueError:
+            indent = 1
+
+        key = str(number)
+        parent = next(
+            (parents[level] for level in range(indent - 1, 0, -1) if level in parents),
+            None,
+        )
+        parents = {level: k for level, k in parents.items() if level < indent}
+        parents[indent] = key
+        if parent is not None:
+            yield step(key, text, parent)
+            continue
+        yield task(
+            key,
+            text,
+            list_key,
+            note=row.get("DESCRIPTION"),
+            due_date=to_date(row.get("DATE")),
+            priority=todoist_priority(row.get("PRIORITY")),
+        )
+
+
+# Microsoft To Do
+
+
+def todo_lists(stream):
+    # a list of lists, or an object with one under "value" or "lists"
+    if stream.peek() == "[":
+        yield from stream.elements()
+        return
+    for key in json_object(stream, "A To Do export"):
+        if key not in ("value", "lists"):
+            stream.value()
+        elif stream.peek() == "[":
+            yield from stream.elements()
+        else:
+            yield key
+
+
+def todo_tasks(stream, list_key):
+    what = f"The tasks of list {list_key}"
+    if stream.peek() != "{":
+        yield from json_elements(stream, what)
+        return
+    for key in stream.members():
+        if key == "value":
+            yield from json_elements(stream, what)
+        else:
+            stream.value()
+
+
+def todo_task(stream, list_key, number):
+    item, task_key = {}, None
+    for key in json_object(stream, f"A task of list {list_key}"):
+        if key != "checklistItems":
+            item[key] = stream.value()
+            continue
+        # steps may come before their task, the importer holds them back
+        task_key = task_key or f"{list_key}:{item.get('id') or number}"
+        for position in json_elements(stream, f"The checklist of task {task_key}"):
+            checklist_item = expect_object(
+                stream.value(), f"A checklist item of task {task_key}"
+            )
+            yield step(
+                f"{task_key}:{position}",
+                checklist_item.get("displayName") or "",
+                task_key,
+            )
+
+    task_key = task_key or f"{list_key}:{item.get('id') or number}"
+    body = expect_object(item.get("body"), f"The body of task {task_key}")
+    due = expect_object(item.get("dueDateTime"), f"The due date of task {task_key}")
+    reminder = expect_object(
+        item.get("reminderDateTime"), f"The reminder of task {task_key}"
+    )
+    categories = expect_array(
+        item.get("categories"), f"The categories of task {task_key}"
+    )
+    yield task(
+        task_key,
+        item.get("title") or "",
+        list_key,
+        note=body.get("content"),
+        is_completed=item.get("status") == "completed",
+        is_important=item.get("importance") == "high",
+        due_date=to_date(due.get("dateTime")),
+        reminder_date=(
+            to_datetime(reminder.get("dateTime"), reminder.get("timeZone"))
+            if item.get("isReminderOn")
+            else None
+        ),
+        label=categories[0] if categories else None,
+    )
+
+
+def todo_list_record(todo_list, list_key):
+    name = expect_text(todo_list.get("displayName"), f"The name of list {list_key}")
+    return ("list", list_key, {"name": name or "Tasks", "group": None})
+
+
+def todo_records(stream):
+    for index, _ in enumerate(todo_lists(stream)):
+        todo_list, list_key = {}, None
+        for key in json_object(stream, "A To Do list"):
+            if key != "tasks":
+                todo_list[key] = stream.value()
+                continue
+            # the list is named by what comes before its tasks
+            if list_key is None:
+                list_key = str(todo_list.get("id") or index)
+                yield todo_list_record(todo_list, list_key)
+            for number in todo_tasks(stream, list_key):
+                yield from todo_task(stream, list_key, number)
+        if list_key is None:
+            list_key = str(todo_list.get("id") or index)
+            yield todo_list_record(todo_list, list_key)
+
+
+def parse_microsoft_todo(fp, list_name=None):
+    """
+    Microsoft To Do lists as returned by Microsoft Graph, either a list of
+    ``todoTaskList`` objects or ``{"value": [...]}``, each carrying its
+    ``tasks`` (a list or ``{"value": [...]}``) with their ``checklistItems``.
+    Lists, tasks and checklist items are stepped into, so only one task is
+    held at a time, without its checklist.
+    """
+    try:
+        yield from todo_records(JSONStream(fp))
+    except JSONStreamError as e:
+        raise ImportFormatError(f"Invalid JSON: {e}") from e
+
+
+# iCalendar
+
+
+def ical_lines(fp):
+    # unfolds continuation lines (RFC 5545 3.1)
+    current = None
+    for line in text_stream(fp):
+        line = line.rstrip("\r\n")
+        if line[:1] in (" ", "\t") and current is not None:
+            current += line[1:]
+            continue
+        if current is not None:
+            yield current
+        current = line
+    if current:
+        yield current
+
+
+def ical_unescape(value):
+    return (
+        value.replace("\\n", "\n")
+        .replace("\\N", "\n")
+        .replace("\\,", ",")
+        .replace("\\;", ";")
+        .replace("\\\\", "\\")
+    )
+
+
+def ical_split(value):
+    # splits on commas not escaped with a backslash
+    parts, current, escaped = [], "", False
+    for char in value:
+        if escaped:
+            current += "\\" + char
+            escaped = False
+        elif char == "\\":
+            escaped = True
+        elif char == ",":
+            parts.append(current)
+            current = ""
+        else:
+            current += char
+    parts.append(current)
+    return [ical_unescape(part).strip() for part in parts if part.strip()]
+
+
+def ical_moment(value, params):
+    """Returns a date for all-day values, an aware datetime otherwise."""
+    value = value.strip()
+    try:
+        if params.get("VALUE") == "DATE" or len(value) == 8:
+            return datetime.strptime(value[:8], "%Y%m%d").date()
+        moment = datetime.strptime(value.rstrip("Z"), "%Y%m%dT%H%M%S")
+    except ValueError:
+        return None
+    if value.endswith("Z"):
+        return moment.replace(tzinfo=dt_timezone.utc)
+    return to_datetime(moment.isoformat(), params.get("TZID"))
+
+
+def ical_priority(value):
+    # RFC 5545: 1-4 high, 5 medium, 6-9 low, 0 undefined
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        return "4"
+    if 1 <= value <= 4:
+        return "1"
+    if value == 5:
+        return "2"
+    if 6 <= value <= 9:
+        return "3"
+    return "4"
+
+
+def parse_ical(fp, list_name=None):
+    """
+    VTODO components of an iCalendar file, imported into the list
+    ``list_name`` (by default the calendar's X-WR-CALNAME). To-dos with a
+    RELATED-TO parent become steps of that parent.
+    """
+    list_key = None
+    calendar_name = None
+    component = None
+    # components nested in the to-do, such as VALARM
+    nested = 0
+    found = False
+
+    for number, line in enumerate(ical_lines(fp)):
+        name, _, value = line.partition(":")
+        name, *raw_params = name.split(";")
+        name = name.upper()
+        params = dict(param.split("=", 1) for param in raw_params if "=" in param)
+
+        if name == "BEGIN" and value.upper() == "VCALENDAR":
+            found = True
+        elif name == "X-WR-CALNAME" and component is None:
+            calendar_name = ical_unescape(value)
+        elif name == "BEGIN" and value.upper() == "VTODO":
+            component = {"params": {}, "line": number}
+        elif component is None:
+            continue
+        elif name == "BEGIN":
+            nested += 1
+        elif name == "END" and nested:
+            nested -= 1
+        elif name == "END" and value.upper() == "VTODO":
+            if list_key is None:
+                list_key = "calendar"
+                yield (
+                    "list",
+                    list_key,
+                    {"name": list_name or calendar_name or "Calendar", "group": None},
+                )
+            yield ical_todo(component, list_key)
+            component = None
+        elif not nested and name not in component:
+            component[name] = value
+            component["params"][name] = params
+
+    if not found:
+        raise ImportFormatError("Not an iCalendar file, BEGIN:VCALENDAR is missing.")
+
+
+def ical_todo(component, list_key):
+    key = component.get("UID") or f"line:{component['line']}"
+    text = ical_unescape(component.get("SUMMARY", ""))
+    parent = component.get("RELATED-TO")
+    reltype = component["params"].get("RELATED-TO", {}).get("RELTYPE", "PARENT")
+    if parent and reltype.upper() == "PARENT":
+        return step(key, text, parent)
+
+    due = ical_moment(component.get("DUE", ""), component["params"].get("DUE", {}))
+    categories = ical_split(component.get("CATEGORIES", ""))
+    return task(
+        key,
+        text,
+        list_key,
+        note=ical_unescape(component.get("DESCRIPTION", "")),
+        is_completed=(
+            component.get("STATUS", "").upper() == "COMPLETED"
+            or "COMPLETED" in component
+        ),
+        due_date=due.date() if isinstance(due, datetime) else due,
+        priority=ical_priority(component.get("PRIORITY")),
+        label=categories[0] if categories else None,
+    )
+
+
+# name -> parser, for the import endpoint and command
+PARSERS = {
+    "todoist": parse_todoist_json,
+    "todoist-csv": parse_todoist_csv,
+    "microsoft-todo": parse_microsoft_todo,
+    "ical": parse_ical,
+}
@@ -0,0 +1,167 @@
+import datetime
+import io
+import tracemalloc
+from collections import Counter
+import orjson
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase
+from core.testing import create_account
+from tasklists.models import TaskList
+from tasks.models import Task, TaskStep
+from .jsonstream import iter_json
+from .parsers import (
+    ImportFormatError,
+    parse_microsoft_todo,
+    to_date,
+    to_datetime,
+)
+
+TODOIST = {
+    "projects": [
+        {"id": "1", "name": "Inbox", "inbox_project": True},
+        {"id": "2", "name": "Shopping"},
+    ],
+    "items": [
+        {
+            "id": "10",
+            "content": "Buy milk",
+            "project_id": "2",
+            "priority": 4,
+            "due": {"date": "2024-05-01T10:00:00"},
+            "labels": ["errand"],
+        },
+        {"id": "11", "content": "Bring a bag", "project_id": "2", "parent_id": "10"},
+    ],
+}
+
+MICROSOFT_TODO = {
+    "value": [
+        {
+            "id": "L1",
+            "displayName": "Work",
+            "tasks": [
+                {
+                    "id": "T1",
+                    "title": "Report",
+                    "dueDateTime": {"dateTime": "2024-07-01T00:00:00.0000000"},
+                    "checklistItems": [{"displayName": "Draft"}],
+                }
+            ],
+        }
+    ]
+}
+
+
+class ImportTests(TestCase):
+    def setUp(self):
+        account = create_account()
+        self.profile, self.client = account.profile, account.client
+
+    def post(self, source, data):
+        upload = SimpleUploadedFile("export.json", orjson.dumps(data))
+        return self.client.post(
+            "/api/import/", {"file": upload, "source": source}, format="multipart"
+        )
+
+    def assertRejected(self, source, data):
+        lists = TaskList.objects.filter(owner=self.profile).count()
+        response = self.post(source, data)
+        self.assertEqual(response.status_code, 400, response.content)
+        self.assertIn("file", response.json())
+        self.assertEqual(TaskList.objects.filter(owner=self.profile).count(), lists)
+        return response.json()["file"]
+
+    def test_todoist(self):
+        response = self.post("todoist", TODOIST)
+        self.assertEqual(response.status_code, 201)
+        task = Task.objects.get(owner=self.profile)
+        self.assertEqual(task.text, "Buy milk")
+        self.assertEqual(task.task_list.name, "Shopping")
+        self.assertEqual(task.due_date, datetime.date(2024, 5, 1))
+        self.assertEqual(task.label.name, "errand")
+        self.assertEqual(TaskStep.objects.get(task=task).text, "Bring a bag")
+
+    def test_microsoft_todo(self):
+        response = self.post("microsoft-todo", MICROSOFT_TODO)
+        self.assertEqual(response.status_code, 201)
+        task = Task.objects.get(owner=self.profile)
+        self.assertEqual((task.text, task.task_list.name), ("Report", "Work"))
+        self.assertEqual(task.due_date, datetime.date(2024, 7, 1))
+        self.assertEqual(TaskStep.objects.get(task=task).text, "Draft")
+
+    def test_invalid_date(self):
+        data = orjson.loads(orjson.dumps(TODOIST))
+        data["items"][0]["due"]["date"] = "2024-13-45"
+        self.assertIn("2024-13-45", self.assertRejected("todoist", data))
+
+    def test_missing_key(self):
+        data = orjson.loads(orjson.dumps(TODOIST))
+        del data["projects"][1]["name"]
+        self.assertIn("'name'", self.assertRejected("todoist", data))
+
+        data = orjson.loads(orjson.dumps(TODOIST))
+        del data["items"][0]["id"]
+        self.assertIn("'id'", self.assertRejected("todoist", data))
+
+    def test_wrong_shapes(self):
+        data = orjson.loads(orjson.dumps(MICROSOFT_TODO))
+        data["value"][0]["tasks"] = ["Report"]
+        self.assertIn("an object", self.assertRejected("microsoft-todo", data))
+
+        data = orjson.loads(orjson.dumps(MICROSOFT_TODO))
+        data["value"][0]["tasks"][0]["title"] = {"text": "Report"}
+        self.assertIn("a string", self.assertRejected("microsoft-todo", data))
+
+        data = orjson.loads(orjson.dumps(TODOIST))
+        data["items"][0]["labels"] = "errand"
+        self.assertIn("an array", self.assertRejected("todoist", data))
+
+    def test_large_microsoft_todo_list_is_streamed(self):
+        tasks = [
+            {
+                "id": f"T{number}",
+                "title": f"Task {number}",
+                "body": {"content": "note " * 10},
+                "checklistItems": [{"displayName": "Step"}] * 3,
+            }
+            for number in range(25000)
+        ]
+        data = orjson.dumps({"value": [{"id": "L1", "tasks": tasks}]})
+        self.assertGreater(len(data), 4 * 1024 * 1024)
+        del tasks
+
+        tracemalloc.start()
+        try:
+            counts = Counter(
+                kind for kind, _, _ in parse_microsoft_todo(io.BytesIO(data))
+            )
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        self.assertEqual(counts, {"list": 1, "task": 25000, "step": 75000})
+        # one task at a time, not the whole list
+        self.assertLess(peak, 1024 * 1024)
+
+    def test_large_values_are_read_in_growing_blocks(self):
+        class Reads(io.BytesIO):
+            count = 0
+
+            def read(self, size=-1):
+                self.count += 1
+                return super().read(size)
+
+        note = "x" * (4 * 1024 * 1024)
+        fp = Reads(orjson.dumps({"items": [{"content": note}]}))
+
+        self.assertEqual(list(iter_json(fp)), [("items", {"content": note})])
+        self.assertLess(fp.count, 16)
+
+    def test_dates(self):
+        # natural language dates of Todoist CSV exports are skipped
+        self.assertIsNone(to_date("every monday"))
+        self.assertIsNone(to_datetime("tomorrow"))
+        with self.assertRaises(ImportFormatError):
+            to_date("2024-02-30")
+        with self.assertRaises(ImportFormatError):
+            to_datetime("2024-05-01T25:00:00")
@@ -0,0 +1,6 @@
+from rest_framework_nested import routers
+from . import views
+
+# Main router
+router = routers.DefaultRouter()
+router.register("import", views.ImportViewSet, basename="import")
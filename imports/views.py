@@ -0,0 +1,48 @@
+from rest_framework import serializers, status
+from rest_framework.parsers import MultiPartParser
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.viewsets import ViewSet
+from core.principal import get_principal
+from .importer import Importer
+from .parsers import PARSERS, ImportFormatError
+
+
+class ImportSerializer(serializers.Serializer):
+    file = serializers.FileField()
+    source = serializers.ChoiceField(choices=sorted(PARSERS))
+    list = serializers.CharField(max_length=150, required=False)
+
+
+class ImportViewSet(ViewSet):
+    """
+    Imports a Todoist, Microsoft To Do or iCalendar export into the caller's
+    profile, see imports.parsers.
+
+    ``POST /api/import/`` with a multipart ``file``, its ``source`` (one of
+    ``ical``, ``microsoft-todo``, ``todoist``, ``todoist-csv``) and,
+    for single-list formats, the ``list`` to import into.
+    """
+
+    permission_classes = [IsAuthenticated]
+    parser_classes = [MultiPartParser]
+
+    def create(self, request):
+        serializer = ImportSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        owner_id = get_principal(request).profile_id
+        if owner_id is None:
+            return Response(
+                {"owner": "Profile is required to import."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        data = serializer.validated_data
+        records = PARSERS[data["source"]](data["file"], data.get("list"))
+        try:
+            counts = Importer(owner_id).run(records)
+        except (ImportFormatError, UnicodeDecodeError) as e:
+            return Response({"file": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(dict(counts), status=status.HTTP_201_CREATED)
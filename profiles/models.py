@@ -1,5 +1,6 @@
 import uuid
 from django.db import models
+from django.db.models import F
 from django.conf import settings
 
 class Profile(models.Model):
@@ -11,4 +12,20 @@ class Profile(models.Model):
     )
     birth_date = models.DateField(null=True, blank=True)
     profile_picture_url = models.URLField(null=True, blank=True)
-    created_at = models.DateTimeField(auto_now_add=True)
\ No newline at end of file
+    created_at = models.DateTimeField(auto_now_add=True)
+    # bumped by every write to the profile's data, see profiles.versions
+    data_version = models.PositiveBigIntegerField(default=0, editable=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["created_at", "id"], name="profile_created_id_idx"),
+        ]
+
+    def save(self, *args, **kwargs):
+        # incremented in the UPDATE itself, never overwritten with the
+        # (possibly stale) value loaded into this instance
+        if not self._state.adding:
+            self.data_version = F("data_version") + 1
+            if kwargs.get("update_fields") is not None:
+                kwargs["update_fields"] = {*kwargs["update_fields"], "data_version"}
+        super().save(*args, **kwargs)
\ No newline at end of file
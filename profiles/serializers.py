@@ -3,6 +3,7 @@ from django.apps import apps
 from django.conf import settings
 from django.utils.module_loading import import_string
 from rest_framework import serializers
+from core.fieldsets import SparseFieldsMixin
 from .models import Profile
 
 
@@ -11,7 +12,7 @@ SimpleUserSerializer: serializers.ModelSerializer = import_string(
     settings.SIMPLE_USER_SERIALIZER
 )
 
-class ProfileSerializer(serializers.ModelSerializer):
+class ProfileSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     user = SimpleUserSerializer(read_only=True)
 
     class Meta:
@@ -0,0 +1,56 @@
+from django.apps import apps
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from tasks.models import Task, TaskStep, Label
+from tasks.signals import tasks_bulk_changed, steps_bulk_changed
+from .models import Profile
+from .versions import bump_data_versions
+
+# Models
+TaskList = apps.get_model(settings.TASKLIST_MODEL)
+GroupList = apps.get_model(settings.GROUP_LIST_MODEL)
+User = get_user_model()
+
+
+def is_cascade(sender, origin):
+    # rows removed by deleting their list, group or profile, whose own
+    # receiver bumps the version once (or whose profile is gone)
+    return origin is not None and getattr(origin, "model", type(origin)) is not sender
+
+
+@receiver(post_save, sender=GroupList)
+@receiver(post_save, sender=TaskList)
+@receiver(post_save, sender=Task)
+@receiver(post_save, sender=Label)
+@receiver(post_delete, sender=GroupList)
+@receiver(post_delete, sender=TaskList)
+@receiver(post_delete, sender=Task)
+@receiver(post_delete, sender=Label)
+def bump_owner_version(sender, instance, origin=None, **kwargs):
+    if not is_cascade(sender, origin):
+        bump_data_versions([instance.owner_id])
+
+
+@receiver(post_save, sender=TaskStep)
+@receiver(post_delete, sender=TaskStep)
+def bump_step_owner_version(sender, instance, origin=None, **kwargs):
+    if not is_cascade(sender, origin):
+        bump_data_versions(
+            Task.objects.filter(pk=instance.task_id).values("owner_id")
+        )
+
+
+@receiver(tasks_bulk_changed)
+@receiver(steps_bulk_changed)
+def bump_bulk_changed_owner_versions(sender, task_ids, **kwargs):
+    bump_data_versions(Task.objects.filter(pk__in=task_ids).values("owner_id"))
+
+
+@receiver(post_save, sender=User)
+def bump_user_profile_version(sender, instance, created, update_fields=None, **kwargs):
+    # profiles embed their user; logins only touch last_login
+    if created or (update_fields is not None and set(update_fields) <= {"last_login"}):
+        return
+    bump_data_versions(Profile.objects.filter(user_id=instance.pk).values("id"))
@@ -1,3 +1,94 @@
 from django.test import TestCase
+from core.testing import create_account
+from tasks.models import Task, TaskStep
+from .models import Profile
 
-# Create your tests here.
+
+class ConditionalGetTests(TestCase):
+    def setUp(self):
+        self.user, self.profile, self.group, self.task_list, self.client = (
+            create_account()
+        )
+        self.task = Task.objects.create(
+            text="Task", task_list=self.task_list, owner=self.profile
+        )
+
+    def data_version(self):
+        return Profile.objects.get(pk=self.profile.pk).data_version
+
+    def assertWriteChangesEtag(self, write, url="/api/groups/"):
+        etag = self.client.get(url)["ETag"]
+        version = self.data_version()
+
+        write()
+
+        self.assertGreater(self.data_version(), version)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_unchanged_reads_are_not_modified(self):
+        for url in [
+            "/api/groups/",
+            "/api/lists/",
+            "/api/profiles/me/",
+            "/api/tasks/",
+            f"/api/tasks/{self.task.pk}/steps/",
+        ]:
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertIn("no-cache", response["Cache-Control"])
+
+                # the profile of the forced login, then its data version
+                with self.assertNumQueries(2):
+                    unchanged = self.client.get(
+                        url, HTTP_IF_NONE_MATCH=response["ETag"]
+                    )
+                self.assertEqual(unchanged.status_code, 304)
+                self.assertEqual(unchanged.content, b"")
+                self.assertNotEqual(
+                    self.client.get(url, {"depth": 0})["ETag"], response["ETag"]
+                )
+
+    def test_writes_bump_the_data_version(self):
+        self.assertWriteChangesEtag(
+            lambda: self.client.patch(
+                f"/api/tasks/{self.task.pk}/", {"is_completed": True}, format="json"
+            )
+        )
+        self.assertWriteChangesEtag(
+            lambda: self.client.post(
+                f"/api/tasks/{self.task.pk}/steps/", {"text": "Step"}, format="json"
+            )
+        )
+        self.assertWriteChangesEtag(lambda: TaskStep.objects.get().delete())
+        self.assertWriteChangesEtag(
+            lambda: self.client.post("/api/labels/", {"name": "Label"}, format="json")
+        )
+        self.assertWriteChangesEtag(
+            lambda: self.client.post(
+                "/api/tasks/bulk/",
+                {"operations": [{"op": "update", "id": self.task.pk, "text": "Bulk"}]},
+                format="json",
+            )
+        )
+        self.assertWriteChangesEtag(
+            lambda: self.client.patch(
+                f"/api/profiles/{self.profile.pk}/",
+                {"birth_date": "2000-01-01"},
+                format="json",
+            ),
+            url="/api/profiles/me/",
+        )
+        self.assertWriteChangesEtag(lambda: self.task_list.delete())
+
+    def test_cascades_bump_once(self):
+        for number in range(3):
+            Task.objects.create(
+                text=f"Task {number}", task_list=self.task_list, owner=self.profile
+            )
+        version = self.data_version()
+
+        self.group.delete()
+
+        self.assertEqual(self.data_version(), version + 1)
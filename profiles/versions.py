@@ -0,0 +1,22 @@
+from django.db.models import F
+from .models import Profile
+
+
+def bump_data_versions(owner_ids):
+    """
+    Increments the data version of the given profiles, a list of ids or a
+    ``values("owner_id")`` queryset. Runs inside the transaction of the
+    write, so the new version commits together with the change.
+    """
+    Profile.objects.filter(pk__in=owner_ids).update(
+        data_version=F("data_version") + 1
+    )
+
+
+def get_data_version(profile_id):
+    """Returns the profile's data version, None if it does not exist."""
+    return (
+        Profile.objects.filter(pk=profile_id)
+        .values_list("data_version", flat=True)
+        .first()
+    )
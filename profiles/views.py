@@ -7,6 +7,9 @@ from rest_framework.viewsets import ModelViewSet
 from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from rest_framework.permissions import SAFE_METHODS
+from core.conditional import ConditionalGetViewMixin
+from core.planner import QueryPlanViewMixin
+from core.response_cache import cache_response
 from .models import Profile
 from .serializers import ProfileSerializer, ProfileUpdateSerializer
 
@@ -15,8 +18,9 @@ IsSuperUser: BasePermission = import_string("core.permisions.IsSuperUser")
 
 
 # Create your views here.
-class ProfileViewSet(ModelViewSet):
+class ProfileViewSet(ConditionalGetViewMixin, QueryPlanViewMixin, ModelViewSet):
     serializer_class = ProfileSerializer
+    conditional_actions = ("me",)
     http_method_names = ["get", "patch", "head", "options"]
 
     def get_permissions(self):
@@ -27,13 +31,9 @@ class ProfileViewSet(ModelViewSet):
 
     def get_queryset(self):
         if self.request.user.is_superuser:
-            return Profile.objects.all()
+            return self.plan_queryset(Profile.objects.all())
 
-        return (
-            Profile.objects.prefetch_related("group_lists__lists__tasks__steps")
-            .filter(user=self.request.user)
-            .select_related("user")
-        )
+        return self.plan_queryset(Profile.objects.filter(user_id=self.request.user.pk))
 
     def get_serializer_class(self):
         if self.request.method in SAFE_METHODS:
@@ -41,10 +41,14 @@ class ProfileViewSet(ModelViewSet):
         return ProfileUpdateSerializer
 
     def get_serializer_context(self):
-        return {"user": self.request.user}
+        return {"user": self.request.user, "fieldset": self.get_fieldset()}
 
     @action(detail=False, methods=["get"])
+    @cache_response
     def me(self, request):
         user = self.request.user
-        profile = get_object_or_404(Profile, user=user)
-        return Response(ProfileSerializer(profile).data, status=status.HTTP_200_OK)
+        profile = get_object_or_404(
+            self.plan_queryset(Profile.objects.all()), user_id=user.pk
+        )
+        serializer = ProfileSerializer(profile, context=self.get_serializer_context())
+        return Response(serializer.data, status=status.HTTP_200_OK)
@@ -0,0 +1,59 @@
+import json
+import logging
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+
+class BaseDeliveryBackend:
+    """
+    Delivers fired reminders. ``deliver`` receives a list of
+    ``reminders.dispatcher.Reminder`` and raises to have them retried.
+    """
+
+    def deliver(self, reminders):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class LogBackend(BaseDeliveryBackend):
+    def deliver(self, reminders):
+        for reminder in reminders:
+            logger.info(
+                "Reminder for task %s (%s) due at %s",
+                reminder.task_id,
+                reminder.text,
+                reminder.reminder_date.isoformat(),
+            )
+
+
+class FileBackend(BaseDeliveryBackend):
+    """Appends one JSON line per reminder to ``REMINDER_FILE_PATH``."""
+
+    def __init__(self, path=None):
+        self.file = open(path or settings.REMINDER_FILE_PATH, "a", encoding="utf-8")
+
+    def deliver(self, reminders):
+        for reminder in reminders:
+            self.file.write(
+                json.dumps(
+                    {
+                        "task": reminder.task_id,
+                        "owner": str(reminder.owner_id),
+                        "text": reminder.text,
+                        "reminder_date": reminder.reminder_date.isoformat(),
+                    }
+                )
+                + "\n"
+            )
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+def get_delivery_backend():
+    return import_string(settings.REMINDER_DELIVERY_BACKEND)()
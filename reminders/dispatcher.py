@@ -0,0 +1,221 @@
+"""
+Fires ``Task.reminder_date``.
+
+Workers claim reminders due within ``lookahead`` in batches with
+``SELECT ... FOR UPDATE SKIP LOCKED`` and stamp them with a lease
+(``reminder_claimed_until``), so concurrent workers never claim the same
+reminder. Claimed reminders wait in an in-memory min-heap until they are
+due, when the worker checks its lease still holds, marks them sent and
+hands them to the delivery backend.
+
+Marking happens before delivery: a crash can drop a reminder but never
+deliver it twice. Leases of a stopped worker are released, those of a
+crashed one expire and the reminders are claimed again.
+"""
+
+import heapq
+import logging
+import time
+from collections import namedtuple
+from django.apps import apps
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Model, Q
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+# Models
+Task: Model = apps.get_model(settings.TASK_MODEL)
+
+Reminder = namedtuple("Reminder", ["task_id", "owner_id", "text", "reminder_date"])
+
+PENDING = Q(
+    is_completed=False, reminder_date__isnull=False, reminder_sent_at__isnull=True
+)
+
+
+class LagMetrics:
+    """
+    Delivery counts since start and lags (fired at minus reminder_date, in
+    seconds) since the last reset.
+    """
+
+    def __init__(self):
+        self.lags = []
+        self.delivered = 0
+        self.failed = 0
+
+    def record(self, reminders, fired_at):
+        self.delivered += len(reminders)
+        self.lags.extend(
+            (fired_at - reminder.reminder_date).total_seconds()
+            for reminder in reminders
+        )
+
+    def snapshot(self):
+        lags = sorted(self.lags)
+
+        def percentile(p):
+            if not lags:
+                return None
+            return round(lags[min(len(lags) - 1, int(len(lags) * p))], 3)
+
+        return {
+            "delivered": self.delivered,
+            "failed": self.failed,
+            "lag_p50": percentile(0.50),
+            "lag_p95": percentile(0.95),
+            "lag_max": percentile(1),
+        }
+
+    def reset(self):
+        self.lags = []
+
+
+class Dispatcher:
+    def __init__(self, backend, batch_size=500, lookahead=None, lease=None):
+        self.backend = backend
+        self.batch_size = batch_size
+        self.lookahead = lookahead or settings.REMINDER_LOOKAHEAD
+        self.lease = lease or settings.REMINDER_LEASE
+        if self.lease <= self.lookahead:
+            raise ValueError("The lease must be longer than the lookahead.")
+
+        self.heap = []
+        self.metrics = LagMetrics()
+        self.stopping = False
+
+    def claim(self, horizon=None):
+        """Claims one batch of unclaimed reminders due before ``horizon``."""
+        now = timezone.now()
+        horizon = horizon or now + self.lookahead
+        lease_until = now + self.lease
+
+        with transaction.atomic():
+            rows = list(
+                Task.objects.select_for_update(skip_locked=True)
+                .filter(PENDING, reminder_date__lte=horizon)
+                .filter(
+                    Q(reminder_claimed_until__isnull=True)
+                    | Q(reminder_claimed_until__lt=now)
+                )
+                .order_by("reminder_date")
+                .values_list("id", "owner_id", "text", "reminder_date")[
+                    : self.batch_size
+                ]
+            )
+            Task.objects.filter(id__in=[row[0] for row in rows]).update(
+                reminder_claimed_until=lease_until
+            )
+
+        for row in rows:
+            reminder = Reminder(*row)
+            heapq.heappush(
+                self.heap,
+                (reminder.reminder_date, reminder.task_id, lease_until, reminder),
+            )
+        return len(rows)
+
+    def held(self, entries):
+        """
+        Matches the tasks of heap ``entries`` still claimed with their lease.
+        The entries of one claim share a lease, so this is one ``IN`` per
+        claim rather than one term per task.
+        """
+        leases = {}
+        for _, task_id, lease_until, _ in entries:
+            leases.setdefault(lease_until, []).append(task_id)
+
+        held = Q(pk__in=[])
+        for lease_until, task_ids in leases.items():
+            held |= Q(pk__in=task_ids, reminder_claimed_until=lease_until)
+        return held
+
+    def fire_due(self):
+        """Delivers the claimed reminders that are due, returns how many."""
+        now = timezone.now()
+        due = []
+        while self.heap and self.heap[0][0] <= now:
+            due.append(heapq.heappop(self.heap))
+        if not due:
+            return 0
+
+        # a reminder edited, completed or reclaimed since no longer holds our lease
+        with transaction.atomic():
+            ids = set(
+                Task.objects.select_for_update(skip_locked=True)
+                .filter(PENDING, self.held(due))
+                .values_list("id", flat=True)
+            )
+            Task.objects.filter(id__in=ids).update(reminder_sent_at=now)
+
+        reminders = [item[3] for item in due if item[1] in ids]
+        if not reminders:
+            return 0
+
+        try:
+            self.backend.deliver(reminders)
+        except Exception:
+            logger.exception("Delivering %s reminders failed", len(reminders))
+            self.metrics.failed += len(reminders)
+            Task.objects.filter(id__in=ids, reminder_sent_at=now).update(
+                reminder_sent_at=None, reminder_claimed_until=None
+            )
+            return 0
+
+        self.metrics.record(reminders, now)
+        return len(reminders)
+
+    def release(self):
+        """Hands the reminders still waiting in the heap back to other workers."""
+        Task.objects.filter(PENDING, self.held(self.heap)).update(
+            reminder_claimed_until=None
+        )
+        self.heap = []
+
+    def backlog(self):
+        """Number of pending reminders already due, claimed or not."""
+        return Task.objects.filter(PENDING, reminder_date__lte=timezone.now()).count()
+
+    def run_once(self):
+        """Fires every reminder due now and returns."""
+        while True:
+            claimed = self.claim(horizon=timezone.now())
+            self.fire_due()
+            if claimed < self.batch_size:
+                break
+        return self.metrics.snapshot()
+
+    def run(self, poll_interval=None, report_interval=60, report=None):
+        """
+        Claims every ``poll_interval`` (half the lookahead by default) and
+        sleeps until the earliest of the next claim and the next reminder.
+        """
+        poll_interval = (poll_interval or self.lookahead / 2).total_seconds()
+        next_claim = next_report = time.monotonic()
+
+        try:
+            while not self.stopping:
+                if time.monotonic() >= next_claim:
+                    full = self.claim() == self.batch_size
+                    next_claim = time.monotonic() + (0 if full else poll_interval)
+
+                self.fire_due()
+
+                if report and time.monotonic() >= next_report:
+                    report(dict(self.metrics.snapshot(), backlog=self.backlog()))
+                    self.metrics.reset()
+                    next_report = time.monotonic() + report_interval
+
+                wait = next_claim - time.monotonic()
+                if self.heap:
+                    until_due = (self.heap[0][0] - timezone.now()).total_seconds()
+                    wait = min(wait, until_due)
+                time.sleep(min(max(wait, 0), 1))
+        finally:
+            self.release()
+            self.backend.close()
+
+    def stop(self, *args):
+        self.stopping = True
@@ -0,0 +1,62 @@
+import json
+import signal
+from datetime import timedelta
+from django.core.management.base import BaseCommand
+from reminders.backends import get_delivery_backend
+from reminders.dispatcher import Dispatcher
+
+
+class Command(BaseCommand):
+    help = (
+        "Runs a reminder dispatch worker. Any number of workers can run "
+        "side by side, each reminder is delivered by one of them."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument(
+            "--lookahead",
+            type=int,
+            help="Seconds ahead to claim reminders (REMINDER_LOOKAHEAD).",
+        )
+        parser.add_argument(
+            "--lease",
+            type=int,
+            help="Seconds a claim is held before other workers may take it over "
+            "(REMINDER_LEASE).",
+        )
+        parser.add_argument(
+            "--report-interval",
+            type=int,
+            default=60,
+            help="Seconds between lag metric reports.",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Fire the reminders due now and exit.",
+        )
+
+    def handle(self, *args, **options):
+        seconds = lambda value: value and timedelta(seconds=value)  # noqa: E731
+        dispatcher = Dispatcher(
+            get_delivery_backend(),
+            batch_size=options["batch_size"],
+            lookahead=seconds(options["lookahead"]),
+            lease=seconds(options["lease"]),
+        )
+
+        if options["once"]:
+            try:
+                self.report(dispatcher.run_once())
+            finally:
+                dispatcher.backend.close()
+            return
+
+        signal.signal(signal.SIGINT, dispatcher.stop)
+        signal.signal(signal.SIGTERM, dispatcher.stop)
+        dispatcher.run(report_interval=options["report_interval"], report=self.report)
+        self.report(dispatcher.metrics.snapshot())
+
+    def report(self, metrics):
+        self.stdout.write(json.dumps(metrics))
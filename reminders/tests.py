@@ -0,0 +1,226 @@
+import threading
+from datetime import timedelta
+from importlib import import_module
+from unittest import skipUnless
+from django.apps import apps
+from django.db import connection, transaction
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from core.testing import create_account
+from tasks.models import Task
+from .backends import BaseDeliveryBackend
+from .dispatcher import Dispatcher
+
+
+class FakeBackend(BaseDeliveryBackend):
+    def __init__(self):
+        self.delivered = []
+        self.failing = False
+        self.closed = False
+
+    def deliver(self, reminders):
+        if self.failing:
+            raise ConnectionError("delivery failed")
+        self.delivered += reminders
+
+    def close(self):
+        self.closed = True
+
+
+class DispatcherTestMixin:
+    def setUp(self):
+        self.user, self.profile, _, self.task_list, self.client = create_account()
+        self.backend = FakeBackend()
+
+    def dispatcher(self, **kwargs):
+        kwargs.setdefault("lookahead", timedelta(seconds=60))
+        kwargs.setdefault("lease", timedelta(minutes=5))
+        return Dispatcher(self.backend, **kwargs)
+
+    def reminder(self, seconds, text="Task", **fields):
+        return Task.objects.create(
+            text=text,
+            task_list=self.task_list,
+            owner=self.profile,
+            reminder_date=timezone.now() + timedelta(seconds=seconds),
+            **fields,
+        )
+
+
+class DispatcherTests(DispatcherTestMixin, TestCase):
+    def test_claim_leases_pending_reminders_within_the_lookahead(self):
+        due = self.reminder(-60)
+        soon = self.reminder(30)
+        later = self.reminder(600)
+        completed = self.reminder(-60, is_completed=True)
+        sent = self.reminder(-60, reminder_sent_at=timezone.now())
+
+        self.assertEqual(self.dispatcher().claim(), 2)
+
+        claimed = set(
+            Task.objects.filter(reminder_claimed_until__isnull=False).values_list(
+                "id", flat=True
+            )
+        )
+        self.assertEqual(claimed, {due.pk, soon.pk})
+        self.assertNotIn(later.pk, claimed)
+        self.assertNotIn(completed.pk, claimed)
+        self.assertNotIn(sent.pk, claimed)
+        # held leases are not claimed again, expired ones are
+        self.assertEqual(self.dispatcher().claim(), 0)
+        Task.objects.filter(pk=due.pk).update(
+            reminder_claimed_until=timezone.now() - timedelta(seconds=1)
+        )
+        self.assertEqual(self.dispatcher().claim(), 1)
+
+    def test_fire_due_marks_and_delivers_due_reminders(self):
+        due = self.reminder(-60, text="Due")
+        self.reminder(30)
+        dispatcher = self.dispatcher()
+        dispatcher.claim()
+
+        self.assertEqual(dispatcher.fire_due(), 1)
+
+        self.assertEqual(
+            [(r.task_id, r.owner_id, r.text) for r in self.backend.delivered],
+            [(due.pk, self.profile.pk, "Due")],
+        )
+        due.refresh_from_db()
+        self.assertIsNotNone(due.reminder_sent_at)
+        self.assertEqual(len(dispatcher.heap), 1)
+        self.assertEqual(dispatcher.fire_due(), 0)
+        self.assertEqual(dispatcher.metrics.snapshot()["delivered"], 1)
+
+    def test_fire_due_checks_leases_once_per_claim(self):
+        dispatcher = self.dispatcher(batch_size=3)
+        for _ in range(6):
+            self.reminder(-60)
+        dispatcher.claim()
+        dispatcher.claim()
+
+        with CaptureQueriesContext(connection) as context:
+            self.assertEqual(dispatcher.fire_due(), 6)
+
+        (select,) = [
+            query["sql"]
+            for query in context.captured_queries
+            if query["sql"].startswith("SELECT")
+        ]
+        self.assertEqual(select.count('"reminder_claimed_until" ='), 2)
+
+    def test_failed_delivery_is_retried(self):
+        task = self.reminder(-60)
+        dispatcher = self.dispatcher()
+        dispatcher.claim()
+        self.backend.failing = True
+
+        with self.assertLogs("reminders.dispatcher", "ERROR"):
+            self.assertEqual(dispatcher.fire_due(), 0)
+
+        task.refresh_from_db()
+        self.assertIsNone(task.reminder_sent_at)
+        self.assertIsNone(task.reminder_claimed_until)
+        self.assertEqual(dispatcher.metrics.failed, 1)
+
+        self.backend.failing = False
+        self.assertEqual(dispatcher.run_once()["delivered"], 1)
+
+    def test_edited_reminder_loses_its_lease(self):
+        task = self.reminder(-60)
+        dispatcher = self.dispatcher()
+        dispatcher.claim()
+
+        moved = timezone.now() - timedelta(seconds=30)
+        response = self.client.patch(
+            f"/api/tasks/{task.pk}/", {"reminder_date": moved}, format="json"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(dispatcher.fire_due(), 0)
+
+        # and the moved reminder fires again once sent
+        self.assertEqual(dispatcher.run_once()["delivered"], 1)
+        self.client.patch(
+            f"/api/tasks/{task.pk}/",
+            {"reminder_date": moved - timedelta(seconds=10)},
+            format="json",
+        )
+        task.refresh_from_db()
+        self.assertIsNone(task.reminder_sent_at)
+        self.assertIsNone(task.reminder_claimed_until)
+
+    def test_release_hands_back_waiting_reminders(self):
+        task = self.reminder(30)
+        dispatcher = self.dispatcher()
+        dispatcher.claim()
+
+        dispatcher.release()
+
+        self.assertEqual(dispatcher.heap, [])
+        task.refresh_from_db()
+        self.assertIsNone(task.reminder_claimed_until)
+        self.assertEqual(self.dispatcher().claim(), 1)
+
+    def test_release_keeps_leases_taken_over_by_another_worker(self):
+        task = self.reminder(30)
+        dispatcher = self.dispatcher()
+        dispatcher.claim()
+        lease = timezone.now() + timedelta(minutes=10)
+        Task.objects.filter(pk=task.pk).update(reminder_claimed_until=lease)
+
+        dispatcher.release()
+
+        task.refresh_from_db()
+        self.assertEqual(task.reminder_claimed_until, lease)
+
+    def test_run_once_fires_every_due_reminder_in_batches(self):
+        for _ in range(5):
+            self.reminder(-60)
+        self.reminder(30)
+
+        snapshot = self.dispatcher(batch_size=2).run_once()
+
+        self.assertEqual(snapshot["delivered"], 5)
+        self.assertEqual(len(self.backend.delivered), 5)
+        self.assertEqual(Task.objects.filter(reminder_sent_at__isnull=True).count(), 1)
+
+    def test_migration_skips_past_reminders(self):
+        migration = import_module("tasks.migrations.0006_reminder_dispatch")
+        past = self.reminder(-60)
+        future = self.reminder(600)
+
+        migration.skip_past_reminders(apps, None)
+
+        past.refresh_from_db()
+        future.refresh_from_db()
+        self.assertEqual(past.reminder_sent_at, past.reminder_date)
+        self.assertIsNone(future.reminder_sent_at)
+
+
+@skipUnless(connection.vendor == "postgresql", "needs row locks")
+class SkipLockedTests(DispatcherTestMixin, TransactionTestCase):
+    def test_claim_skips_rows_locked_by_another_worker(self):
+        locked = self.reminder(-60)
+        free = self.reminder(-60)
+        has_lock, done = threading.Event(), threading.Event()
+
+        def hold_lock():
+            try:
+                with transaction.atomic():
+                    list(Task.objects.select_for_update().filter(pk=locked.pk))
+                    has_lock.set()
+                    done.wait(10)
+            finally:
+                connection.close()
+
+        thread = threading.Thread(target=hold_lock)
+        thread.start()
+        try:
+            has_lock.wait(10)
+            dispatcher = self.dispatcher()
+            self.assertEqual(dispatcher.claim(), 1)
+        finally:
+            done.set()
+            thread.join()
+
+        self.assertEqual([entry[1] for entry in dispatcher.heap], [free.pk])
@@ -0,0 +1,137 @@
+import re
+from django.db import connection
+from django.db.models import Q
+from .models import SearchDocument
+
+TABLE = SearchDocument._meta.db_table
+FTS_TABLE = f"{TABLE}_fts"
+TERM_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def get_terms(query: str):
+    return TERM_RE.findall(query.lower())
+
+
+class BaseSearchBackend:
+    """
+    Returns owner-scoped, ranked hits as dicts with ``kind``, ``object_id``,
+    ``title`` and ``rank`` (higher is better).
+    """
+
+    def search(self, owner_id, query, kinds, limit):
+        raise NotImplementedError
+
+    def owner_param(self, owner_id):
+        field = SearchDocument._meta.get_field("owner_id")
+        return field.get_db_prep_value(owner_id, connection)
+
+    def fetch(self, sql, params):
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return [
+                {"kind": kind, "object_id": object_id, "title": title, "rank": rank}
+                for kind, object_id, title, rank in cursor.fetchall()
+            ]
+
+
+class PostgresSearchBackend(BaseSearchBackend):
+    """
+    Prefix-matches every term against the generated ``document`` tsvector
+    (GIN indexed), falling back to trigram similarity on titles when pg_trgm
+    is installed and the full-text query found nothing (typos).
+    """
+
+    _has_trigram = None
+
+    def has_trigram(self):
+        if self._has_trigram is None:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+                PostgresSearchBackend._has_trigram = cursor.fetchone() is not None
+        return self._has_trigram
+
+    def search(self, owner_id, query, kinds, limit):
+        terms = get_terms(query)
+        if not terms:
+            return []
+
+        tsquery = " & ".join(f"{term}:*" for term in terms)
+        hits = self.fetch(
+            f"""
+            SELECT kind, object_id, title, ts_rank(document, query) AS rank
+            FROM {TABLE}, to_tsquery('simple', %s) query
+            WHERE owner_id = %s AND kind = ANY(%s) AND document @@ query
+            ORDER BY rank DESC, id
+            LIMIT %s
+            """,
+            [tsquery, self.owner_param(owner_id), list(kinds), limit],
+        )
+        if hits or not self.has_trigram():
+            return hits
+
+        return self.fetch(
+            f"""
+            SELECT kind, object_id, title, similarity(title, %s) AS rank
+            FROM {TABLE}
+            WHERE owner_id = %s AND kind = ANY(%s) AND title %% %s
+            ORDER BY rank DESC, id
+            LIMIT %s
+            """,
+            [query, self.owner_param(owner_id), list(kinds), query, limit],
+        )
+
+
+class SqliteSearchBackend(BaseSearchBackend):
+    """Prefix-matches every term through the FTS5 table, ranked by bm25."""
+
+    def search(self, owner_id, query, kinds, limit):
+        terms = get_terms(query)
+        if not terms:
+            return []
+
+        match = " ".join(f'"{term}"*' for term in terms)
+        placeholders = ", ".join(["%s"] * len(kinds))
+        return self.fetch(
+            f"""
+            SELECT document.kind, document.object_id, document.title,
+                   -bm25({FTS_TABLE}, 10.0, 1.0) AS rank
+            FROM {FTS_TABLE}
+            JOIN {TABLE} document ON document.id = {FTS_TABLE}.rowid
+            WHERE {FTS_TABLE} MATCH %s
+              AND document.owner_id = %s
+              AND document.kind IN ({placeholders})
+            ORDER BY rank DESC, document.id
+            LIMIT %s
+            """,
+            [match, self.owner_param(owner_id), *kinds, limit],
+        )
+
+
+class FallbackSearchBackend(BaseSearchBackend):
+    """Substring search for backends without a full-text index."""
+
+    def search(self, owner_id, query, kinds, limit):
+        terms = get_terms(query)
+        if not terms:
+            return []
+
+        documents = SearchDocument.objects.filter(owner_id=owner_id, kind__in=kinds)
+        for term in terms:
+            documents = documents.filter(
+                Q(title__icontains=term) | Q(body__icontains=term)
+            )
+
+        return [
+            {**hit, "rank": 1.0}
+            for hit in documents.order_by("id").values("kind", "object_id", "title")[
+                :limit
+            ]
+        ]
+
+
+def get_search_backend() -> BaseSearchBackend:
+    if connection.vendor == "postgresql":
+        return PostgresSearchBackend()
+    if connection.vendor == "sqlite":
+        return SqliteSearchBackend()
+    return FallbackSearchBackend()
@@ -0,0 +1,67 @@
+from django.apps import apps
+from django.conf import settings
+from django.db.models import Model
+from tasks.models import Task, TaskStep
+from .models import SearchDocument
+
+# Models
+TaskList: Model = apps.get_model(settings.TASKLIST_MODEL)
+GroupList: Model = apps.get_model(settings.GROUP_LIST_MODEL)
+
+INDEXED_MODELS = {
+    Task: SearchDocument.TASK,
+    TaskStep: SearchDocument.STEP,
+    TaskList: SearchDocument.LIST,
+    GroupList: SearchDocument.GROUP,
+}
+
+
+def build_document(instance) -> SearchDocument:
+    kind = INDEXED_MODELS[type(instance)]
+
+    if kind == SearchDocument.TASK:
+        owner_id, title, body = instance.owner_id, instance.text, instance.note
+    elif kind == SearchDocument.STEP:
+        owner_id, title, body = instance.task.owner_id, instance.text, ""
+    else:
+        owner_id, title, body = instance.owner_id, instance.name, ""
+
+    return SearchDocument(
+        owner_id=owner_id,
+        kind=kind,
+        object_id=instance.pk,
+        title=title,
+        body=body or "",
+    )
+
+
+def index_instances(instances, batch_size=1000):
+    """Inserts or refreshes the search documents of ``instances``."""
+    documents = [build_document(instance) for instance in instances]
+    SearchDocument.objects.bulk_create(
+        documents,
+        batch_size=batch_size,
+        update_conflicts=True,
+        unique_fields=["kind", "object_id"],
+        update_fields=["owner_id", "title", "body"],
+    )
+
+
+def unindex(kind, object_ids):
+    SearchDocument.objects.filter(kind=kind, object_id__in=object_ids).delete()
+
+
+def index_tasks(task_ids):
+    """Re-indexes tasks changed through set-based updates or bulk_create."""
+    index_instances(
+        Task.objects.filter(id__in=task_ids).only("id", "owner", "text", "note")
+    )
+
+
+def index_steps(step_ids):
+    """Re-indexes steps changed through set-based updates or bulk_create."""
+    index_instances(
+        TaskStep.objects.filter(id__in=step_ids)
+        .select_related("task")
+        .only("id", "text", "task__owner")
+    )
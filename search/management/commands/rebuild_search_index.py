@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand
+from search.indexing import INDEXED_MODELS, index_instances
+from search.models import SearchDocument
+from tasks.models import TaskStep
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuilds the search documents of every task, step, list and group. "
+        "Documents are upserted in place, so search keeps working during the "
+        "rebuild, then the ones whose row is gone are deleted."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=2000)
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+
+        for model, kind in INDEXED_MODELS.items():
+            queryset = model.objects.order_by("pk")
+            if model is TaskStep:
+                queryset = queryset.select_related("task").only(
+                    "id", "text", "task__owner"
+                )
+
+            batch, total = [], 0
+            for instance in queryset.iterator(chunk_size=batch_size):
+                batch.append(instance)
+                if len(batch) == batch_size:
+                    index_instances(batch, batch_size=batch_size)
+                    total += len(batch)
+                    batch = []
+            index_instances(batch, batch_size=batch_size)
+            total += len(batch)
+
+            stale, _ = (
+                SearchDocument.objects.filter(kind=kind)
+                .exclude(object_id__in=model.objects.values("pk"))
+                .delete()
+            )
+            self.stdout.write(
+                f"Indexed {total} {kind} documents, deleted {stale} stale ones."
+            )
+
+        self.stdout.write(self.style.SUCCESS("Search index rebuilt."))
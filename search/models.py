@@ -0,0 +1,42 @@
+from django.db import models
+
+
+class SearchDocument(models.Model):
+    """
+    One row per searchable task, step, list or group, kept in step with the
+    source rows by ``search.signals``. The full-text index itself lives
+    outside the ORM: a generated ``tsvector`` column with a GIN index on
+    PostgreSQL and an FTS5 external-content table on SQLite, both created
+    by this app's migrations.
+    """
+
+    TASK = "task"
+    STEP = "step"
+    LIST = "list"
+    GROUP = "group"
+
+    KIND_CHOICES = (
+        (TASK, "Task"),
+        (STEP, "Task step"),
+        (LIST, "Task list"),
+        (GROUP, "Group list"),
+    )
+
+    owner_id = models.UUIDField()
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    object_id = models.BigIntegerField()
+    title = models.TextField()
+    body = models.TextField(default="")
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["kind", "object_id"], name="unique_search_document"
+            )
+        ]
+        indexes = [
+            models.Index(fields=["owner_id", "kind"], name="search_owner_kind_idx"),
+        ]
+
+    def __str__(self):
+        return self.title
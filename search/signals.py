@@ -0,0 +1,42 @@
+from collections import defaultdict
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from core.deletions import DeletionBuffer
+from core.streaming import chunked
+from tasks.signals import tasks_bulk_changed, steps_bulk_changed
+from .indexing import INDEXED_MODELS, index_instances, index_steps, index_tasks, unindex
+
+UNINDEX_CHUNK_SIZE = 2000
+
+
+def index_saved_instance(sender, instance, **kwargs):
+    index_instances([instance])
+
+
+def unindex_deleted_instances(instances):
+    # one delete per kind, chunked to stay under the bound parameter limits
+    deleted = defaultdict(list)
+    for model, instance in instances:
+        deleted[INDEXED_MODELS[model]].append(instance.pk)
+    for kind, object_ids in deleted.items():
+        for chunk in chunked(object_ids, UNINDEX_CHUNK_SIZE):
+            unindex(kind, chunk)
+
+
+for model in INDEXED_MODELS:
+    post_save.connect(index_saved_instance, sender=model)
+
+deletions = DeletionBuffer(unindex_deleted_instances)
+deletions.connect(*INDEXED_MODELS)
+
+
+@receiver(tasks_bulk_changed)
+def index_bulk_changed_tasks(sender, task_ids, fields, **kwargs):
+    if fields is None or {"text", "note"} & set(fields):
+        index_tasks(task_ids)
+
+
+@receiver(steps_bulk_changed)
+def index_bulk_changed_steps(sender, step_ids, fields, **kwargs):
+    if fields is None or "text" in fields:
+        index_steps(step_ids)
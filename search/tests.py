@@ -0,0 +1,74 @@
+from io import StringIO
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from core.testing import create_account
+from tasks.models import Task, TaskStep
+from .models import SearchDocument
+
+
+class SearchTests(TestCase):
+    def setUp(self):
+        self.user, self.profile, _, self.task_list, self.client = create_account()
+        for number in range(3):
+            task = Task.objects.create(
+                text=f"Buy groceries {number}",
+                task_list=self.task_list,
+                owner=self.profile,
+            )
+            TaskStep.objects.create(text="Check the groceries list", task=task)
+
+    def search(self, **params):
+        response = self.client.get("/api/search/", params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()["results"]
+
+    def test_search_finds_the_owners_rows(self):
+        other = create_account("other")
+        Task.objects.create(
+            text="Groceries of someone else",
+            task_list=other.task_list,
+            owner=other.profile,
+        )
+
+        self.assertEqual(len(self.search(q="grocer", types="task")), 3)
+        self.assertEqual(len(self.search(q="grocer", types="step")), 3)
+        self.assertEqual(self.client.get("/api/search/", {"q": ""}).status_code, 400)
+
+    def test_cascade_is_unindexed_once_per_kind(self):
+        with CaptureQueriesContext(connection) as context:
+            self.task_list.delete()
+
+        deletes = [
+            query
+            for query in context.captured_queries
+            if query["sql"].startswith('DELETE FROM "search_searchdocument"')
+        ]
+        self.assertEqual(len(deletes), 3)
+        self.assertEqual(
+            list(SearchDocument.objects.values_list("kind", flat=True)),
+            [SearchDocument.GROUP],
+        )
+        self.assertEqual(self.search(q="grocer"), [])
+
+    def test_rebuild_updates_documents_in_place(self):
+        task = Task.objects.filter(owner=self.profile).first()
+        document = SearchDocument.objects.get(
+            kind=SearchDocument.TASK, object_id=task.pk
+        )
+        # set-based writes bypass the signals that keep the index up to date
+        Task.objects.filter(pk=task.pk).update(text="Walk the dog")
+        SearchDocument.objects.create(
+            owner_id=self.profile.pk,
+            kind=SearchDocument.TASK,
+            object_id=0,
+            title="Gone",
+        )
+
+        call_command("rebuild_search_index", stdout=StringIO())
+
+        document.refresh_from_db()
+        self.assertEqual(document.title, "Walk the dog")
+        self.assertFalse(SearchDocument.objects.filter(object_id=0).exists())
+        self.assertEqual(SearchDocument.objects.count(), 8)
@@ -0,0 +1,60 @@
+from rest_framework import serializers, status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.viewsets import ViewSet
+from core.principal import get_principal
+from .backends import get_search_backend
+from .models import SearchDocument
+
+
+class SearchQuerySerializer(serializers.Serializer):
+    q = serializers.CharField(min_length=1, max_length=200, trim_whitespace=True)
+    types = serializers.MultipleChoiceField(
+        choices=[kind for kind, _ in SearchDocument.KIND_CHOICES], required=False
+    )
+    limit = serializers.IntegerField(min_value=1, max_value=100, default=20)
+
+
+class SearchViewSet(ViewSet):
+    """
+    Ranked search across the caller's tasks, steps, lists and groups.
+
+    ``GET /api/search/?q=<text>&types=task,step&limit=20``
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def list(self, request):
+        params = request.query_params.copy()
+        if "types" in params:
+            params.setlist("types", params["types"].split(","))
+        query = SearchQuerySerializer(data=params)
+        query.is_valid(raise_exception=True)
+
+        owner_id = get_principal(request).profile_id
+        if owner_id is None:
+            return Response(
+                {"owner": "Profile is required to search."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        kinds = sorted(
+            query.validated_data.get("types")
+            or [kind for kind, _ in SearchDocument.KIND_CHOICES]
+        )
+        hits = get_search_backend().search(
+            owner_id,
+            query.validated_data["q"],
+            kinds,
+            query.validated_data["limit"],
+        )
+        results = [
+            {
+                "type": hit["kind"],
+                "id": hit["object_id"],
+                "title": hit["title"],
+                "rank": hit["rank"],
+            }
+            for hit in hits
+        ]
+        return Response({"results": results}, status=status.HTTP_200_OK)
@@ -0,0 +1,39 @@
+from django.db import models
+
+
+class Tombstone(models.Model):
+    """
+    Deletion log read by the delta-sync endpoint. ``owner_id`` is a plain
+    column rather than a foreign key so rows written while a profile is
+    being deleted do not block the cascade.
+    """
+
+    GROUP = "group"
+    LIST = "list"
+    TASK = "task"
+    STEP = "step"
+    LABEL = "label"
+
+    KIND_CHOICES = (
+        (GROUP, "Group list"),
+        (LIST, "Task list"),
+        (TASK, "Task"),
+        (STEP, "Task step"),
+        (LABEL, "Label"),
+    )
+
+    owner_id = models.UUIDField()
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    object_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["owner_id", "deleted_at"], name="tombstone_owner_deleted_idx"
+            ),
+            models.Index(fields=["deleted_at"], name="tombstone_deleted_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.kind}:{self.object_id}"
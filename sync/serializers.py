@@ -0,0 +1,68 @@
+import base64
+import binascii
+from datetime import datetime
+from django.apps import apps
+from django.conf import settings
+from django.db.models import Model
+from rest_framework import serializers
+from tasks.models import Task, TaskStep, Label
+
+# Models
+TaskList: Model = apps.get_model(settings.TASKLIST_MODEL)
+GroupList: Model = apps.get_model(settings.GROUP_LIST_MODEL)
+
+
+def encode_sync_token(moment: datetime) -> str:
+    return base64.urlsafe_b64encode(moment.isoformat().encode("utf-8")).decode("ascii")
+
+
+def decode_sync_token(token: str) -> datetime:
+    try:
+        moment = datetime.fromisoformat(base64.urlsafe_b64decode(token).decode("utf-8"))
+    except (binascii.Error, UnicodeError, ValueError) as e:
+        raise serializers.ValidationError({"since": "Invalid sync token."}) from e
+
+    if moment.tzinfo is None:
+        raise serializers.ValidationError({"since": "Invalid sync token."})
+    return moment
+
+
+class GroupSyncSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = GroupList
+        fields = ["id", "name"]
+
+
+class ListSyncSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = TaskList
+        fields = ["id", "name", "emoji", "group"]
+
+
+class TaskSyncSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Task
+        fields = [
+            "id",
+            "text",
+            "note",
+            "is_completed",
+            "is_important",
+            "due_date",
+            "reminder_date",
+            "priority",
+            "label",
+            "task_list",
+        ]
+
+
+class StepSyncSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = TaskStep
+        fields = ["id", "text", "task"]
+
+
+class LabelSyncSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Label
+        fields = ["id", "name"]
@@ -0,0 +1,57 @@
+from django.apps import apps
+from django.conf import settings
+from core.deletions import DeletionBuffer
+from tasks.models import Task, TaskStep, Label
+from .models import Tombstone
+
+# Models
+TaskList = apps.get_model(settings.TASKLIST_MODEL)
+GroupList = apps.get_model(settings.GROUP_LIST_MODEL)
+
+OWNED_KINDS = {
+    GroupList: Tombstone.GROUP,
+    TaskList: Tombstone.LIST,
+    Task: Tombstone.TASK,
+    Label: Tombstone.LABEL,
+}
+
+
+def record_deletions(instances):
+    """
+    Writes the tombstones of one delete with a single ``bulk_create``.
+    Steps deleted along with their task get none, clients drop the steps
+    of deleted tasks.
+    """
+    task_ids = {instance.pk for model, instance in instances if model is Task}
+    tombstones, steps = [], []
+    for model, instance in instances:
+        if model is not TaskStep:
+            tombstones.append(
+                Tombstone(
+                    owner_id=instance.owner_id,
+                    kind=OWNED_KINDS[model],
+                    object_id=instance.pk,
+                )
+            )
+        elif instance.task_id not in task_ids:
+            steps.append(instance)
+
+    if steps:
+        owners = dict(
+            Task.objects.filter(pk__in={step.task_id for step in steps}).values_list(
+                "pk", "owner_id"
+            )
+        )
+        tombstones += [
+            Tombstone(
+                owner_id=owners[step.task_id], kind=Tombstone.STEP, object_id=step.pk
+            )
+            for step in steps
+            if step.task_id in owners
+        ]
+
+    Tombstone.objects.bulk_create(tombstones)
+
+
+deletions = DeletionBuffer(record_deletions)
+deletions.connect(GroupList, TaskList, Task, TaskStep, Label)
@@ -0,0 +1,75 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from core.testing import create_account
+from tasks.models import Label, Task, TaskStep
+from .models import Tombstone
+
+
+class SyncTests(TestCase):
+    def setUp(self):
+        self.user, self.profile, self.group, self.task_list, self.client = (
+            create_account()
+        )
+        self.tasks = [
+            Task.objects.create(
+                text=f"Task {number}", task_list=self.task_list, owner=self.profile
+            )
+            for number in range(3)
+        ]
+        self.steps = [
+            TaskStep.objects.create(text="Step", task=task) for task in self.tasks
+        ]
+
+    def deleted(self, kind):
+        return sorted(
+            Tombstone.objects.filter(kind=kind).values_list("object_id", flat=True)
+        )
+
+    def test_delta_returns_changes_and_deletions(self):
+        response = self.client.get("/api/sync/")
+        self.assertTrue(response.json()["full"])
+        self.assertEqual(len(response.json()["tasks"]), 3)
+        cursor = response.json()["cursor"]
+
+        task_id = self.tasks[0].pk
+        self.tasks[0].delete()
+        response = self.client.get("/api/sync/", {"since": cursor})
+
+        self.assertFalse(response.json()["full"])
+        self.assertEqual(response.json()["deleted"]["tasks"], [task_id])
+        self.assertEqual(response.json()["deleted"]["steps"], [])
+        self.assertEqual(self.client.get("/api/sync/?since=invalid").status_code, 400)
+
+    def test_cascade_is_recorded_in_one_insert(self):
+        group_id, list_id = self.group.pk, self.task_list.pk
+        task_ids = sorted(task.pk for task in self.tasks)
+        with CaptureQueriesContext(connection) as context:
+            self.group.delete()
+
+        inserts = [
+            query
+            for query in context.captured_queries
+            if query["sql"].startswith('INSERT INTO "sync_tombstone"')
+        ]
+        self.assertEqual(len(inserts), 1)
+        self.assertEqual(self.deleted(Tombstone.GROUP), [group_id])
+        self.assertEqual(self.deleted(Tombstone.LIST), [list_id])
+        self.assertEqual(self.deleted(Tombstone.TASK), task_ids)
+        # steps go with their tasks
+        self.assertEqual(self.deleted(Tombstone.STEP), [])
+
+    def test_deleted_steps_and_labels(self):
+        step_ids = [self.steps[0].pk, self.steps[1].pk]
+        self.steps[0].delete()
+        TaskStep.objects.filter(pk=step_ids[1]).delete()
+        label = Label.objects.create(name="Label", owner=self.profile)
+        label_id = label.pk
+        label.delete()
+
+        self.assertEqual(self.deleted(Tombstone.STEP), step_ids)
+        self.assertEqual(
+            list(Tombstone.objects.values_list("owner_id", flat=True).distinct()),
+            [self.profile.pk],
+        )
+        self.assertEqual(self.deleted(Tombstone.LABEL), [label_id])
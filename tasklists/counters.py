@@ -0,0 +1,111 @@
+"""
+Rollup counters stored on TaskList and GroupList.
+
+- ``task_count``: every task in the list
+- ``completed_count``: completed tasks
+- ``important_count``: open tasks marked important
+- ``overdue_count``: open tasks due before today
+
+Single task writes apply deltas with ``F()`` expressions in the task's own
+transaction (see ``tasklists.signals``), set-based writes recompute the
+lists they touched. ``overdue_count`` also changes as days pass, so the
+``repair_list_counters`` command should run daily with ``--due-rollover``.
+"""
+
+from datetime import date
+from django.apps import apps
+from django.conf import settings
+from django.db.models import Count, F, Model, OuterRef, Q, QuerySet, Subquery, Sum
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+# Models
+Task: Model = apps.get_model(settings.TASK_MODEL)
+TaskList: Model = apps.get_model(settings.TASKLIST_MODEL)
+GroupList: Model = apps.get_model(settings.GROUP_LIST_MODEL)
+
+COUNTER_FIELDS = ("task_count", "completed_count", "important_count", "overdue_count")
+
+
+def task_counters(is_completed: bool, is_important: bool, due_date: date | None):
+    """Returns what one task with the given state adds to its list's counters."""
+    today = timezone.localdate()
+    is_open = not is_completed
+    return {
+        "task_count": 1,
+        "completed_count": int(is_completed),
+        "important_count": int(is_open and is_important),
+        "overdue_count": int(is_open and due_date is not None and due_date < today),
+    }
+
+
+def apply_deltas(task_list_id, deltas):
+    """Adds ``deltas`` to a list and to the group it belongs to."""
+    changes = {field: F(field) + delta for field, delta in deltas.items() if delta}
+    if not changes:
+        return
+
+    TaskList.objects.filter(pk=task_list_id).update(**changes)
+    GroupList.objects.filter(lists=task_list_id).update(**changes)
+
+
+def _count(queryset, aggregate, group_by):
+    # correlated ``(SELECT aggregate ... WHERE group_by = outer.id)``
+    return Coalesce(
+        Subquery(
+            queryset.filter(**{group_by: OuterRef("pk")})
+            .order_by()
+            .values(group_by)
+            .annotate(value=aggregate)
+            .values("value")
+        ),
+        0,
+    )
+
+
+def recompute_lists(task_list_ids):
+    """Recounts the given lists from their tasks, then their groups."""
+    task_list_ids = set(task_list_ids)
+    if not task_list_ids:
+        return
+
+    today = timezone.localdate()
+    is_open = Q(is_completed=False)
+    filters = {
+        "task_count": Q(),
+        "completed_count": Q(is_completed=True),
+        "important_count": is_open & Q(is_important=True),
+        "overdue_count": is_open & Q(due_date__lt=today),
+    }
+    TaskList.objects.filter(id__in=task_list_ids).update(
+        **{
+            field: _count(
+                Task.objects.all(), Count("id", filter=condition), "task_list"
+            )
+            for field, condition in filters.items()
+        }
+    )
+
+    recompute_groups(
+        TaskList.objects.filter(id__in=task_list_ids, group__isnull=False).values(
+            "group_id"
+        )
+    )
+
+
+def recompute_groups(group_ids):
+    """
+    Recomputes the given groups (ids or a ``values("group_id")`` queryset)
+    as the sums of their lists' counters.
+    """
+    if not isinstance(group_ids, QuerySet):
+        group_ids = {group_id for group_id in group_ids if group_id is not None}
+        if not group_ids:
+            return
+
+    GroupList.objects.filter(id__in=group_ids).update(
+        **{
+            field: _count(TaskList.objects.all(), Sum(field), "group")
+            for field in COUNTER_FIELDS
+        }
+    )
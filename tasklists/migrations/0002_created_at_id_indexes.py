@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('grouplists', '0002_created_at_id_indexes'),
+        ('profiles', '0002_created_at_id_indexes'),
+        ('tasklists', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='tasklist',
+            index=models.Index(fields=['created_at', 'id'], name='tasklist_created_id_idx'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('grouplists', '0003_updated_at'),
+        ('profiles', '0002_created_at_id_indexes'),
+        ('tasklists', '0002_created_at_id_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tasklist',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddIndex(
+            model_name='tasklist',
+            index=models.Index(fields=['owner', 'updated_at'], name='tasklist_owner_updated_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('grouplists', '0004_owner_scoped_indexes'),
+        ('profiles', '0002_created_at_id_indexes'),
+        ('tasklists', '0003_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='tasklist',
+            index=models.Index(fields=['owner', 'created_at', 'id'], name='tasklist_owner_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tasklist',
+            index=models.Index(fields=['group', 'created_at', 'id'], name='tasklist_group_created_idx'),
+        ),
+    ]
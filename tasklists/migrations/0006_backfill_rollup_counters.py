@@ -0,0 +1,44 @@
+from django.db import migrations
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+COUNTER_FIELDS = ("task_count", "completed_count", "important_count", "overdue_count")
+
+
+def backfill(apps, schema_editor):
+    Task = apps.get_model("tasks", "Task")
+    TaskList = apps.get_model("tasklists", "TaskList")
+    GroupList = apps.get_model("grouplists", "GroupList")
+
+    today = timezone.localdate()
+    is_open = Q(is_completed=False)
+    task_rows = Task.objects.values("task_list_id").annotate(
+        task_count=Count("id"),
+        completed_count=Count("id", filter=Q(is_completed=True)),
+        important_count=Count("id", filter=is_open & Q(is_important=True)),
+        overdue_count=Count("id", filter=is_open & Q(due_date__lt=today)),
+    )
+    for row in task_rows.order_by():
+        TaskList.objects.filter(pk=row.pop("task_list_id")).update(**row)
+
+    list_rows = (
+        TaskList.objects.filter(group__isnull=False)
+        .values("group_id")
+        .annotate(**{field: Coalesce(Sum(field), 0) for field in COUNTER_FIELDS})
+    )
+    for row in list_rows.order_by():
+        GroupList.objects.filter(pk=row.pop("group_id")).update(**row)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasklists', '0005_rollup_counters'),
+        ('grouplists', '0005_rollup_counters'),
+        ('tasks', '0004_owner_scoped_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
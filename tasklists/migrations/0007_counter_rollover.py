@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasklists', '0006_backfill_rollup_counters'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CounterRollover',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(unique=True)),
+                ('ran_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
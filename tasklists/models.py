@@ -1,12 +1,13 @@
 from django.db import models
 from django.conf import settings
+from core.models import AtomicSaveMixin
 
 
 PROFILE_MODEL = settings.PROFILE_MODEL
 GROUP_LIST_MODEL = settings.GROUP_LIST_MODEL
 
 # Create your models here.
-class TaskList(models.Model):
+class TaskList(AtomicSaveMixin, models.Model):
     name = models.CharField(max_length=150)
     group = models.ForeignKey(
         GROUP_LIST_MODEL, related_name="lists", on_delete=models.CASCADE, null=True
@@ -16,7 +17,13 @@ class TaskList(models.Model):
         PROFILE_MODEL, related_name="lists", on_delete=models.CASCADE
     )
     emoji = models.CharField(max_length=100, null=True, default="📃")
+    # rollups maintained by tasklists.counters
+    task_count = models.IntegerField(default=0)
+    completed_count = models.IntegerField(default=0)
+    important_count = models.IntegerField(default=0)
+    overdue_count = models.IntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return self.name
@@ -24,4 +31,30 @@ class TaskList(models.Model):
     class Meta:
         constraints = [
             models.UniqueConstraint(fields=["name", "owner"], name="unique_task_list")
-        ]
\ No newline at end of file
+        ]
+        indexes = [
+            models.Index(fields=["created_at", "id"], name="tasklist_created_id_idx"),
+            models.Index(
+                fields=["owner", "created_at", "id"], name="tasklist_owner_created_idx"
+            ),
+            models.Index(
+                fields=["group", "created_at", "id"], name="tasklist_group_created_idx"
+            ),
+            models.Index(
+                fields=["owner", "updated_at"], name="tasklist_owner_updated_idx"
+            ),
+        ]
+
+
+class CounterRollover(models.Model):
+    """
+    A day ``repair_list_counters --due-rollover`` brought the overdue
+    counters up to, the next rollover recomputes the lists with tasks due
+    since.
+    """
+
+    day = models.DateField(unique=True)
+    ran_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return str(self.day)
@@ -4,9 +4,10 @@ from django.conf import settings
 from django.apps import apps
 from django.utils.module_loading import import_string
 from rest_framework import serializers
+from core.fieldsets import SparseFieldsMixin
+from .counters import COUNTER_FIELDS
 
 # Models
-Profile: Model = apps.get_model(settings.PROFILE_MODEL)
 TaskList: Model = apps.get_model(settings.TASKLIST_MODEL)
 GroupList: Model = apps.get_model(settings.GROUP_LIST_MODEL)
 
@@ -14,7 +15,7 @@ GroupList: Model = apps.get_model(settings.GROUP_LIST_MODEL)
 TaskSerializer: serializers.ModelSerializer = import_string(settings.TASK_SERIALIZER)
 
 
-class TaskListSerializer(serializers.ModelSerializer):
+class TaskListSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     tasks = TaskSerializer(many=True, read_only=True)
 
     class Meta:
@@ -25,7 +26,9 @@ class TaskListSerializer(serializers.ModelSerializer):
             "emoji",
             "group",
             "tasks",
+            *COUNTER_FIELDS,
         ]
+        read_only_fields = COUNTER_FIELDS
 
     def validate_emoji(self, value):
         if not emoji.is_emoji(value):
@@ -33,21 +36,24 @@ class TaskListSerializer(serializers.ModelSerializer):
         return value
 
     def create(self, validated_data):
-        user = self.context.get("user")
-        owner = Profile.objects.filter(user=user).first()
-        if not owner:
+        owner_id = self.context["principal"].profile_id
+        if not owner_id:
             raise serializers.ValidationError(
                 {"owner": "Profile is required to create a task list."}
             )
-        if TaskList.objects.filter(name=validated_data["name"], owner=owner).exists():
+        if TaskList.objects.filter(
+            name=validated_data["name"], owner_id=owner_id
+        ).exists():
             raise serializers.ValidationError(
                 {"name": "List with given name already exists."}
             )
-        validated_data["owner"] = owner
+        validated_data["owner_id"] = owner_id
         return super().create(validated_data)
 
 
-class TaskListWithoutGroupSerializer(serializers.ModelSerializer):
+class TaskListWithoutGroupSerializer(
+    SparseFieldsMixin, serializers.ModelSerializer
+):
     tasks = TaskSerializer(many=True, read_only=True)
 
     def validate_emoji(self, value):
@@ -57,24 +63,25 @@ class TaskListWithoutGroupSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = TaskList
-        fields = ["id", "name", "emoji", "tasks"]
+        fields = ["id", "name", "emoji", "tasks", *COUNTER_FIELDS]
+        read_only_fields = COUNTER_FIELDS
 
     def create(self, validated_data):
-        user = self.context.get("user")
-        owner = Profile.objects.filter(user=user).first()
-        if not owner:
+        owner_id = self.context["principal"].profile_id
+        if not owner_id:
             raise serializers.serializers.ValidationError(
                 {"owner": "Profile is required to create a task list."}
             )
-        if TaskList.objects.filter(name=validated_data["name"], owner=owner).exists():
+        if TaskList.objects.filter(
+            name=validated_data["name"], owner_id=owner_id
+        ).exists():
             raise serializers.ValidationError(
                 {"name": "List with given name already exists."}
             )
 
         group_id = self.context.get("group_id")
-        group = GroupList.objects.filter(id=group_id, owner=owner).first()
-        if group:
-            validated_data["group"] = group
+        if GroupList.objects.filter(id=group_id, owner_id=owner_id).exists():
+            validated_data["group_id"] = group_id
 
-        validated_data["owner"] = owner
+        validated_data["owner_id"] = owner_id
         return super().create(validated_data)
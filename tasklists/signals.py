@@ -0,0 +1,102 @@
+from collections import Counter
+from django.apps import apps
+from django.conf import settings
+from django.db.models import Model
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+from tasks.signals import tasks_bulk_changed
+from .counters import task_counters, apply_deltas, recompute_lists, recompute_groups
+from .models import TaskList
+
+# Models
+Task: Model = apps.get_model(settings.TASK_MODEL)
+
+COUNTED_FIELDS = ("task_list_id", "is_completed", "is_important", "due_date")
+
+
+def skips_counted_fields(update_fields):
+    # save(update_fields=[...]) accepts both "task_list" and "task_list_id"
+    return update_fields is not None and not (
+        {"task_list", *COUNTED_FIELDS} & set(update_fields)
+    )
+
+
+@receiver(pre_save, sender=Task)
+def remember_counted_state(sender, instance, update_fields=None, **kwargs):
+    # read (and lock) the stored row rather than trusting the instance,
+    # which may have been loaded before a concurrent change
+    instance._counted_state = None
+    if instance._state.adding or instance.pk is None:
+        return
+    if skips_counted_fields(update_fields):
+        return
+
+    instance._counted_state = (
+        Task.objects.select_for_update()
+        .filter(pk=instance.pk)
+        .values_list(*COUNTED_FIELDS)
+        .first()
+    )
+
+
+@receiver(post_save, sender=Task)
+def count_saved_task(sender, instance, created, update_fields=None, **kwargs):
+    if not created and skips_counted_fields(update_fields):
+        return
+
+    before = getattr(instance, "_counted_state", None)
+    after = tuple(getattr(instance, field) for field in COUNTED_FIELDS)
+    if before == after:
+        return
+
+    deltas = {}
+    if before is not None:
+        deltas[before[0]] = Counter()
+        deltas[before[0]].subtract(task_counters(*before[1:]))
+    deltas.setdefault(after[0], Counter()).update(task_counters(*after[1:]))
+
+    for task_list_id, delta in deltas.items():
+        apply_deltas(task_list_id, delta)
+
+
+@receiver(post_delete, sender=Task)
+def uncount_deleted_task(sender, instance, origin=None, **kwargs):
+    # deleting a list, group or profile removes every task in it, the list
+    # receiver below recomputes the group once instead
+    if origin is not None and getattr(origin, "model", type(origin)) is not Task:
+        return
+
+    counters = task_counters(
+        instance.is_completed, instance.is_important, instance.due_date
+    )
+    apply_deltas(
+        instance.task_list_id, {field: -value for field, value in counters.items()}
+    )
+
+
+@receiver(pre_save, sender=TaskList)
+def remember_group(sender, instance, **kwargs):
+    instance._counted_group_id = None
+    if not instance._state.adding and instance.pk is not None:
+        instance._counted_group_id = (
+            TaskList.objects.filter(pk=instance.pk)
+            .values_list("group_id", flat=True)
+            .first()
+        )
+
+
+@receiver(post_save, sender=TaskList)
+def regroup_saved_list(sender, instance, created, **kwargs):
+    old_group_id = getattr(instance, "_counted_group_id", None)
+    if not created and old_group_id != instance.group_id:
+        recompute_groups({old_group_id, instance.group_id})
+
+
+@receiver(post_delete, sender=TaskList)
+def regroup_deleted_list(sender, instance, **kwargs):
+    recompute_groups({instance.group_id})
+
+
+@receiver(tasks_bulk_changed)
+def recount_bulk_changed_lists(sender, task_list_ids, **kwargs):
+    recompute_lists(task_list_ids)
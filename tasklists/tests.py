@@ -1,3 +1,138 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+from django.core.management import call_command
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from core.testing import create_account
+from grouplists.models import GroupList
+from tasks.models import Task
+from .counters import COUNTER_FIELDS, recompute_lists
+from .models import CounterRollover, TaskList
 
-# Create your tests here.
+
+class ListCounterTests(TestCase):
+    def setUp(self):
+        self.user, self.profile, self.group, self.task_list, self.client = (
+            create_account()
+        )
+        self.other = TaskList.objects.create(name="Other", owner=self.profile)
+        self.tasks = [
+            Task.objects.create(
+                text=f"Task {number}", task_list=self.task_list, owner=self.profile
+            )
+            for number in range(4)
+        ]
+
+    def counters(self):
+        return [
+            [getattr(row, field) for field in COUNTER_FIELDS]
+            for model in (TaskList, GroupList)
+            for row in model.objects.order_by("id")
+        ]
+
+    def assertCountersCurrent(self):
+        counters = self.counters()
+        recompute_lists(TaskList.objects.values_list("id", flat=True))
+        self.assertEqual(counters, self.counters())
+
+    def test_single_task_writes(self):
+        task = self.tasks[0]
+        task.is_important = True
+        task.due_date = timezone.localdate() - timedelta(days=1)
+        task.save()
+        self.task_list.refresh_from_db()
+        self.assertEqual(self.task_list.important_count, 1)
+        self.assertEqual(self.task_list.overdue_count, 1)
+        self.assertCountersCurrent()
+
+        task.task_list = self.other
+        task.save()
+        self.assertCountersCurrent()
+
+        self.client.patch(
+            f"/api/tasks/{self.tasks[1].pk}/", {"is_completed": True}, format="json"
+        )
+        self.client.delete(f"/api/tasks/{self.tasks[2].pk}/")
+        self.group.refresh_from_db()
+        self.assertEqual(self.group.task_count, 2)
+        self.assertEqual(self.group.completed_count, 1)
+        self.assertCountersCurrent()
+
+    def test_saves_without_counted_fields_skip_the_row_lock(self):
+        task = self.tasks[0]
+        task.text = "Renamed"
+        with CaptureQueriesContext(connection) as context:
+            task.save(update_fields=["text", "updated_at"])
+        self.assertFalse(
+            [
+                query["sql"]
+                for query in context.captured_queries
+                if query["sql"].startswith('SELECT "tasks_task"."task_list_id"')
+            ]
+        )
+
+        task.is_completed = True
+        task.save(update_fields=["is_completed"])
+        self.task_list.refresh_from_db()
+        self.assertEqual(self.task_list.completed_count, 1)
+        self.assertCountersCurrent()
+
+    def test_group_membership(self):
+        self.client.patch(
+            f"/api/groups/{self.group.pk}/manage_lists/?action=add",
+            {"tasklist_ids": [self.other.pk]},
+            format="json",
+        )
+        Task.objects.create(text="Moved", task_list=self.other, owner=self.profile)
+        self.group.refresh_from_db()
+        self.assertEqual(self.group.task_count, 5)
+        self.assertCountersCurrent()
+
+        self.client.delete(f"/api/lists/{self.task_list.pk}/")
+        self.group.refresh_from_db()
+        self.assertEqual(self.group.task_count, 1)
+        self.assertCountersCurrent()
+
+
+class DueRolloverTests(TestCase):
+    def setUp(self):
+        account = create_account()
+        profile, self.task_list = account.profile, account.task_list
+        self.today = timezone.localdate()
+        self.days_ago = lambda days: self.today - timedelta(days=days)
+
+        # written on an earlier day, when none of the tasks was overdue yet
+        with mock.patch.object(timezone, "localdate", return_value=self.days_ago(3)):
+            self.tasks = [
+                Task.objects.create(
+                    text=f"Due {days} days ago",
+                    task_list=self.task_list,
+                    owner=profile,
+                    due_date=self.days_ago(days),
+                )
+                for days in (1, 2)
+            ]
+            call_command("repair_list_counters", "--due-rollover", stdout=StringIO())
+
+    def rollover(self):
+        call_command("repair_list_counters", "--due-rollover", stdout=StringIO())
+        self.task_list.refresh_from_db()
+
+    def test_catches_up_missed_days(self):
+        self.rollover()
+
+        self.assertEqual(self.task_list.overdue_count, 2)
+        self.assertTrue(CounterRollover.objects.filter(day=self.today).exists())
+
+    def test_tasks_completed_before_the_rollover(self):
+        # its delta takes an overdue task off a counter that never had it
+        self.tasks[0].is_completed = True
+        self.tasks[0].save()
+
+        self.rollover()
+
+        self.assertEqual(self.task_list.completed_count, 1)
+        self.assertEqual(self.task_list.overdue_count, 1)
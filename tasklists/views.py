@@ -3,6 +3,10 @@ from rest_framework.viewsets import ModelViewSet
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.permissions import BasePermission
 from django_filters.rest_framework import DjangoFilterBackend
+from core.conditional import ConditionalGetViewMixin
+from core.streaming import StreamingListViewMixin
+from core.response_cache import cache_response
+from core.principal import PrincipalViewMixin
 from .models import TaskList
 from .serializers import TaskListSerializer, TaskListWithoutGroupSerializer
 from .filters import TaskListFilter
@@ -12,7 +16,9 @@ IsSuperUser: BasePermission = import_string("core.permisions.IsSuperUser")
 
 
 # Create your views here.
-class TaskListViewSet(ModelViewSet):
+class TaskListViewSet(
+    ConditionalGetViewMixin, PrincipalViewMixin, StreamingListViewMixin, ModelViewSet
+):
     permission_classes = [IsAuthenticated]
     filter_backends = [DjangoFilterBackend]
     filterset_class = TaskListFilter
@@ -21,32 +27,27 @@ class TaskListViewSet(ModelViewSet):
         user = self.request.user
         group_id = self.kwargs.get("group_pk", None)
 
+        queryset = self.plan_queryset(TaskList.objects.all())
+
         if user.is_superuser:
             if group_id:
-                return (
-                    TaskList.objects.prefetch_related("tasks__steps")
-                    .filter(group_id=group_id)
-                    .order_by("created_at")
-                )
+                return queryset.filter(group_id=group_id).order_by("created_at")
 
-            return TaskList.objects.prefetch_related("tasks__steps").order_by(
-                "created_at"
-            )
+            return queryset.order_by("created_at")
         else:
+            owner_id = self.principal.profile_id
             # if group_id was provided by url
             if group_id:
-                return (
-                    TaskList.objects.prefetch_related("tasks__steps")
-                    .filter(owner__user=user, group_id=group_id)
-                    .order_by("created_at")
+                return queryset.filter(owner_id=owner_id, group_id=group_id).order_by(
+                    "created_at"
                 )
 
             # if group_id was not provided
-            return (
-                TaskList.objects.prefetch_related("tasks__steps")
-                .filter(owner__user=user)
-                .order_by("created_at")
-            )
+            return queryset.filter(owner_id=owner_id).order_by("created_at")
+
+    @cache_response
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
 
     def get_serializer_class(self):
         group_id = self.kwargs.get("group_pk", None)
@@ -59,5 +60,7 @@ class TaskListViewSet(ModelViewSet):
         # validation will be done in the serializer
         return {
             "user": self.request.user,
+            "principal": self.principal,
             "group_id": self.kwargs.get("group_pk", None),
+            "fieldset": self.get_fieldset(),
         }
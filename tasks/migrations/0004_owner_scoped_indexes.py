@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('profiles', '0002_created_at_id_indexes'),
+        ('tasklists', '0004_owner_scoped_indexes'),
+        ('tasks', '0003_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='label',
+            index=models.Index(fields=['owner', 'created_at', 'id'], name='label_owner_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['owner', 'created_at', 'id'], name='task_owner_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['task_list', 'created_at', 'id'], name='task_list_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('is_completed', False)), fields=['owner', 'created_at', 'id'], name='task_owner_open_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('is_completed', False)), fields=['task_list', 'created_at', 'id'], name='task_list_open_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='taskstep',
+            index=models.Index(fields=['task', 'created_at', 'id'], name='step_task_created_idx'),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('profiles', '0002_created_at_id_indexes'),
+        ('tasklists', '0006_backfill_rollup_counters'),
+        ('tasks', '0004_owner_scoped_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('is_completed', False), ('is_important', True)), fields=['owner', 'created_at', 'id'], name='task_owner_important_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('due_date__isnull', False), ('is_completed', False)), fields=['owner', 'due_date', 'id'], name='task_owner_planned_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('is_completed', False), ('reminder_date__isnull', False)), fields=['owner', 'reminder_date'], name='task_owner_reminder_idx'),
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:52
+
+from django.db import migrations, models
+from django.db.models import F
+from django.utils import timezone
+
+
+def skip_past_reminders(apps, schema_editor):
+    # reminders stored before the dispatcher existed are not fired late
+    Task = apps.get_model('tasks', 'Task')
+    Task.objects.filter(reminder_date__lt=timezone.now()).update(
+        reminder_sent_at=F('reminder_date')
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('profiles', '0002_created_at_id_indexes'),
+        ('tasklists', '0006_backfill_rollup_counters'),
+        ('tasks', '0005_smart_list_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='reminder_claimed_until',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='reminder_sent_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('is_completed', False), ('reminder_date__isnull', False), ('reminder_sent_at__isnull', True)), fields=['reminder_date'], name='task_pending_reminder_idx'),
+        ),
+        migrations.RunPython(skip_past_reminders, migrations.RunPython.noop),
+    ]
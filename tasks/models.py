@@ -1,28 +1,39 @@
 from django.db import models
 from django.conf import settings
+from core.models import AtomicSaveMixin
 
 
 PROFILE_MODEL = settings.PROFILE_MODEL
 TASK_LIST_MODEL = settings.TASKLIST_MODEL
 
 
-class Label(models.Model):
+class Label(AtomicSaveMixin, models.Model):
     name = models.CharField(max_length=100)
     owner = models.ForeignKey(
         PROFILE_MODEL, related_name="labels", on_delete=models.PROTECT
     )
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         constraints = [
             models.UniqueConstraint(fields=["name", "owner"], name="unique_label")
         ]
+        indexes = [
+            models.Index(fields=["created_at", "id"], name="label_created_id_idx"),
+            models.Index(
+                fields=["owner", "created_at", "id"], name="label_owner_created_idx"
+            ),
+            models.Index(
+                fields=["owner", "updated_at"], name="label_owner_updated_idx"
+            ),
+        ]
 
     def __str__(self):
         return self.name
 
 
-class Task(models.Model):
+class Task(AtomicSaveMixin, models.Model):
     PRIORITY_1 = "1"
     PRIORITY_2 = "2"
     PRIORITY_3 = "3"
@@ -41,6 +52,9 @@ class Task(models.Model):
     is_important = models.BooleanField(default=False, db_index=True)
     due_date = models.DateField(null=True, db_index=True)
     reminder_date = models.DateTimeField(null=True)
+    # set by the reminder dispatcher, cleared whenever reminder_date changes
+    reminder_sent_at = models.DateTimeField(null=True, blank=True)
+    reminder_claimed_until = models.DateTimeField(null=True, blank=True)
     priority = models.CharField(
         max_length=1, choices=PRIORITY_CHOICES, default=PRIORITY_4, db_index=True
     )
@@ -54,16 +68,74 @@ class Task(models.Model):
         PROFILE_MODEL, related_name="tasks", on_delete=models.CASCADE
     )
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     archived = models.BooleanField(default=False)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["created_at", "id"], name="task_created_id_idx"),
+            # TaskViewSet: owner (optionally list) scoped, keyset on created_at
+            models.Index(
+                fields=["owner", "created_at", "id"], name="task_owner_created_idx"
+            ),
+            models.Index(
+                fields=["task_list", "created_at", "id"], name="task_list_created_idx"
+            ),
+            models.Index(
+                fields=["owner", "created_at", "id"],
+                condition=models.Q(is_completed=False),
+                name="task_owner_open_idx",
+            ),
+            models.Index(
+                fields=["task_list", "created_at", "id"],
+                condition=models.Q(is_completed=False),
+                name="task_list_open_idx",
+            ),
+            models.Index(fields=["owner", "updated_at"], name="task_owner_updated_idx"),
+            # smart lists, see tasks.smart_lists
+            models.Index(
+                fields=["owner", "created_at", "id"],
+                condition=models.Q(is_completed=False, is_important=True),
+                name="task_owner_important_idx",
+            ),
+            models.Index(
+                fields=["owner", "due_date", "id"],
+                condition=models.Q(is_completed=False, due_date__isnull=False),
+                name="task_owner_planned_idx",
+            ),
+            models.Index(
+                fields=["owner", "reminder_date"],
+                condition=models.Q(is_completed=False, reminder_date__isnull=False),
+                name="task_owner_reminder_idx",
+            ),
+            # reminders.dispatcher claims due reminders off this index
+            models.Index(
+                fields=["reminder_date"],
+                condition=models.Q(
+                    is_completed=False,
+                    reminder_date__isnull=False,
+                    reminder_sent_at__isnull=True,
+                ),
+                name="task_pending_reminder_idx",
+            ),
+        ]
+
     def __str__(self):
         return self.text
 
 
-class TaskStep(models.Model):
+class TaskStep(AtomicSaveMixin, models.Model):
     text = models.TextField()
     task = models.ForeignKey(Task, related_name="steps", on_delete=models.CASCADE)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["task", "created_at", "id"], name="step_task_created_idx"
+            ),
+        ]
 
     def __str__(self):
         return self.text
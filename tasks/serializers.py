@@ -1,40 +1,42 @@
-from django.db.models import Model
+from django.db import transaction
+from django.db.models import BigIntegerField, F, Model, Value
 from django.apps import apps
 from django.conf import settings
+from django.utils import timezone
 from rest_framework import serializers
+from rest_framework.exceptions import NotFound
+from core.fieldsets import SparseFieldsMixin
 from .models import Task, TaskStep, Label
+from .signals import tasks_bulk_changed
 
 
 # Models
-Profile: Model = apps.get_model(settings.PROFILE_MODEL)
 TaskList: Model = apps.get_model(settings.TASKLIST_MODEL)
 
 
-class TaskStepSerializer(serializers.ModelSerializer):
+class TaskStepSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = TaskStep
         fields = ["id", "text"]
 
     def create(self, validated_data):
-        user = self.context.get("user")
-        owner = Profile.objects.filter(user=user).first()
-        if not owner:
+        owner_id = self.context["principal"].profile_id
+        if not owner_id:
             raise serializers.ValidationError(
                 {"owner": "Profile is required to create a task."}
             )
 
         task_id = self.context.get("task_id")
-        task = Task.objects.filter(id=task_id, owner=owner).first()
-        if not task:
+        if not Task.objects.filter(id=task_id, owner_id=owner_id).exists():
             raise serializers.ValidationError(
                 {"task": "Task is required to create a step."}
             )
 
-        validated_data["task"] = task
+        validated_data["task_id"] = task_id
         return super().create(validated_data)
 
 
-class TaskSerializer(serializers.ModelSerializer):
+class TaskSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     steps = TaskStepSerializer(many=True, read_only=True, required=False)
 
     class Meta:
@@ -54,45 +56,289 @@ class TaskSerializer(serializers.ModelSerializer):
         read_only_fields = ["owner"]
 
     def create(self, validated_data):
-        user = self.context.get("user")
-        owner = Profile.objects.filter(user=user).first()
-        if not owner:
+        owner_id = self.context["principal"].profile_id
+        if not owner_id:
             raise serializers.ValidationError(
                 {"owner": "Profile is required to create a task."}
             )
 
         task_list_id = self.context.get("task_list_id")
-        task_list = TaskList.objects.filter(id=task_list_id, owner=owner).first()
-        if not task_list:
+        if not TaskList.objects.filter(id=task_list_id, owner_id=owner_id).exists():
             raise serializers.ValidationError(
                 {"task_list": "Task list is required to create a task."}
             )
 
-        validated_data["owner"] = owner
-        validated_data["task_list"] = task_list
+        validated_data["owner_id"] = owner_id
+        validated_data["task_list_id"] = task_list_id
         return super().create(validated_data)
 
+    def update(self, instance, validated_data):
+        if validated_data.get("reminder_date", instance.reminder_date) != (
+            instance.reminder_date
+        ):
+            # a moved reminder fires again
+            validated_data["reminder_sent_at"] = None
+            validated_data["reminder_claimed_until"] = None
+        return super().update(instance, validated_data)
+
     def save(self, **kwargs):
         return super().save(**kwargs)
 
 
-class LabelSerializer(serializers.ModelSerializer):
+class LabelSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Label
         fields = ["name"]
 
     def create(self, validated_data):
-        user = self.context.get("user")
-        if not user:
+        principal = self.context.get("principal")
+        if not principal or not principal.user:
             raise serializers.ValidationError(
                 {"user_id": "User ID is required to create a label."}
             )
 
-        owner = Profile.objects.filter(user=user).first()
-        if not owner:
+        owner_id = principal.profile_id
+        if not owner_id:
             raise serializers.ValidationError(
                 {"owner": "Profile is required to create a label."}
             )
-        validated_data["owner"] = owner
+        validated_data["owner_id"] = owner_id
 
         return super().create(validated_data)
+
+
+class BulkTaskChangesSerializer(serializers.ModelSerializer):
+    """
+    Validates the task fields of one bulk operation. Relations are plain ids,
+    their ownership is checked for the whole batch at once.
+    """
+
+    label = serializers.IntegerField(source="label_id", allow_null=True)
+    task_list = serializers.IntegerField(source="task_list_id")
+
+    class Meta:
+        model = Task
+        fields = [
+            "text",
+            "note",
+            "is_completed",
+            "is_important",
+            "due_date",
+            "reminder_date",
+            "priority",
+            "label",
+            "task_list",
+        ]
+
+
+class BulkTaskSerializer(serializers.Serializer):
+    """
+    Applies a batch of task operations in a single transaction.
+
+    Each operation is ``{"op": ..., ...}`` where ``op`` is one of:
+
+    - ``create``: task fields, ``task_list`` and ``text`` required
+    - ``update``: ``id`` and any task fields
+    - ``complete``: ``id`` and optionally ``is_completed`` (defaults to true)
+    - ``move``: ``id`` and ``task_list``
+    - ``reschedule``: ``id`` and ``due_date`` (null clears it)
+
+    Invalid operations are reported per item and skipped, the rest are
+    applied with one ``bulk_create`` and one ``UPDATE`` per distinct change.
+
+    Under ``/api/lists/{list_pk}/tasks/bulk/`` the batch is scoped to that
+    list: creates go into it and other operations only find its tasks.
+    """
+
+    MAX_OPERATIONS = 500
+
+    CREATE = "create"
+    UPDATE = "update"
+    COMPLETE = "complete"
+    MOVE = "move"
+    RESCHEDULE = "reschedule"
+
+    # fields each operation may change, and the ones it requires
+    OPERATION_FIELDS = {
+        CREATE: (BulkTaskChangesSerializer.Meta.fields, ["text", "task_list"]),
+        UPDATE: (BulkTaskChangesSerializer.Meta.fields, []),
+        COMPLETE: (["is_completed"], []),
+        MOVE: (["task_list"], ["task_list"]),
+        RESCHEDULE: (["due_date"], ["due_date"]),
+    }
+
+    operations = serializers.ListField(
+        child=serializers.DictField(),
+        allow_empty=False,
+        max_length=MAX_OPERATIONS,
+    )
+
+    def validate_operation(self, item, task_list_id=None):
+        op = item.get("op")
+        if op not in self.OPERATION_FIELDS:
+            raise serializers.ValidationError(
+                {"op": f"Expected one of: {', '.join(self.OPERATION_FIELDS)}."}
+            )
+
+        allowed, required = self.OPERATION_FIELDS[op]
+        changes = {field: item[field] for field in allowed if field in item}
+        if op == self.COMPLETE:
+            changes.setdefault("is_completed", True)
+        if op == self.CREATE and task_list_id is not None:
+            if changes.setdefault("task_list", task_list_id) != task_list_id:
+                raise serializers.ValidationError(
+                    {"task_list": "Tasks are created in the list of the URL."}
+                )
+
+        missing = [field for field in required if field not in changes]
+        if missing:
+            raise serializers.ValidationError(
+                {field: "This field is required." for field in missing}
+            )
+
+        task_id = None
+        if op != self.CREATE:
+            task_id = item.get("id")
+            if not isinstance(task_id, int) or isinstance(task_id, bool):
+                raise serializers.ValidationError({"id": "A task id is required."})
+
+        serializer = BulkTaskChangesSerializer(data=changes, partial=True)
+        serializer.is_valid(raise_exception=True)
+        return op, task_id, serializer.validated_data
+
+    def get_owned_ids(self, owner_id, task_ids, list_ids, label_ids):
+        """
+        Returns the owned ids among the ones referenced by the batch, in one
+        round trip. Tasks map to the list they currently belong to.
+        """
+        no_parent = Value(None, output_field=BigIntegerField())
+        owned = (
+            Task.objects.filter(owner_id=owner_id, id__in=task_ids)
+            .annotate(kind=Value("task"), parent=F("task_list_id"))
+            .values_list("kind", "id", "parent")
+            .union(
+                TaskList.objects.filter(owner_id=owner_id, id__in=list_ids)
+                .annotate(kind=Value("list"), parent=no_parent)
+                .values_list("kind", "id", "parent"),
+                Label.objects.filter(owner_id=owner_id, id__in=label_ids)
+                .annotate(kind=Value("label"), parent=no_parent)
+                .values_list("kind", "id", "parent"),
+                all=True,
+            )
+        )
+        ids = {"task": {}, "list": set(), "label": set()}
+        for kind, object_id, parent in owned:
+            if kind == "task":
+                ids["task"][object_id] = parent
+            else:
+                ids[kind].add(object_id)
+        return ids
+
+    def save(self, **kwargs):
+        owner_id = self.context["principal"].profile_id
+        if not owner_id:
+            raise serializers.ValidationError(
+                {"owner": "Profile is required to change tasks."}
+            )
+
+        task_list_id = self.context.get("task_list_id")
+        if task_list_id is not None:
+            try:
+                task_list_id = int(task_list_id)
+            except ValueError:
+                raise NotFound("Task list not found.")
+
+        results = []
+        operations = []
+        for index, item in enumerate(self.validated_data["operations"]):
+            result = {"index": index, "op": item.get("op"), "id": item.get("id")}
+            results.append(result)
+            try:
+                op, task_id, changes = self.validate_operation(item, task_list_id)
+            except serializers.ValidationError as e:
+                result.update(status="error", errors=e.detail)
+                continue
+            operations.append((result, task_id, changes))
+
+        list_ids = {c["task_list_id"] for *_, c in operations if "task_list_id" in c}
+        if task_list_id is not None:
+            list_ids.add(task_list_id)
+        owned = self.get_owned_ids(
+            owner_id,
+            task_ids={task_id for _, task_id, _ in operations if task_id},
+            list_ids=list_ids,
+            label_ids={c["label_id"] for *_, c in operations if c.get("label_id")},
+        )
+        if task_list_id is not None and task_list_id not in owned["list"]:
+            raise NotFound("Task list not found.")
+
+        creates = []
+        updates = {}
+        seen = set()
+        for result, task_id, changes in operations:
+            errors = {}
+            if task_id is not None and (
+                task_id not in owned["task"]
+                or task_list_id not in (None, owned["task"][task_id])
+            ):
+                errors["id"] = "Task not found."
+            elif task_id is not None and task_id in seen:
+                errors["id"] = "Task appears in more than one operation."
+            if (
+                "task_list_id" in changes
+                and changes["task_list_id"] not in owned["list"]
+            ):
+                errors["task_list"] = "Task list not found."
+            if changes.get("label_id") and changes["label_id"] not in owned["label"]:
+                errors["label"] = "Label not found."
+            if errors:
+                result.update(status="error", errors=errors)
+                continue
+
+            result["status"] = "ok"
+            if task_id is None:
+                creates.append((result, Task(owner_id=owner_id, **changes)))
+            else:
+                seen.add(task_id)
+                # identical changes collapse into one set-based UPDATE
+                key = tuple(sorted(changes.items()))
+                updates.setdefault(key, []).append(task_id)
+
+        with transaction.atomic():
+            created = Task.objects.bulk_create([task for _, task in creates])
+            for (result, _), task in zip(creates, created):
+                result["id"] = task.pk
+            if created:
+                tasks_bulk_changed.send(
+                    sender=Task,
+                    task_ids=[task.pk for task in created],
+                    task_list_ids={task.task_list_id for task in created},
+                    fields=None,
+                )
+
+            now = timezone.now()
+            changed_ids, changed_fields, changed_list_ids = [], set(), set()
+            for key, task_ids in updates.items():
+                if key:
+                    changed = dict(key)
+                    if "reminder_date" in changed:
+                        changed.update(
+                            reminder_sent_at=None, reminder_claimed_until=None
+                        )
+                    Task.objects.filter(id__in=task_ids).update(
+                        **changed, updated_at=now
+                    )
+                    changed_ids += task_ids
+                    changed_fields.update(changed)
+                    changed_list_ids.update(owned["task"][pk] for pk in task_ids)
+                    if "task_list_id" in changed:
+                        changed_list_ids.add(changed["task_list_id"])
+            if changed_ids:
+                tasks_bulk_changed.send(
+                    sender=Task,
+                    task_ids=changed_ids,
+                    task_list_ids=changed_list_ids,
+                    fields=sorted(changed_fields),
+                )
+
+        return results
@@ -0,0 +1,13 @@
+from django.dispatch import Signal
+
+# Sent inside the transaction after tasks were created or changed without
+# going through Model.save() (bulk_create, QuerySet.update()).
+# Arguments: ``task_ids``, ``task_list_ids`` (the lists those tasks belonged
+# to before or after the change) and ``fields``, the attnames of the changed
+# fields, or None for newly created tasks.
+tasks_bulk_changed = Signal()
+
+# Sent inside the transaction after steps were created or changed without
+# going through Model.save(). Arguments: ``step_ids``, ``task_ids`` (the
+# tasks those steps belong to) and ``fields``, as for tasks_bulk_changed.
+steps_bulk_changed = Signal()
@@ -0,0 +1,51 @@
+"""
+Virtual lists computed from task fields rather than stored memberships.
+
+Each smart list filters the owner's open tasks and pages them with its own
+keyset ordering. The filters repeat the predicates of the partial indexes
+declared on ``Task`` so the planner can match them.
+"""
+
+from datetime import datetime, time, timedelta
+from django.db.models import Q
+from django.utils import timezone
+
+
+class SmartList:
+    def __init__(self, name, ordering, get_filter):
+        self.name = name
+        self.ordering = ordering
+        self.get_filter = get_filter
+
+
+def _my_day():
+    # tasks due today or with a reminder set for today
+    today = timezone.localdate()
+    start = timezone.make_aware(datetime.combine(today, time.min))
+    return Q(is_completed=False) & (
+        Q(due_date=today)
+        | Q(reminder_date__gte=start, reminder_date__lt=start + timedelta(days=1))
+    )
+
+
+def _important():
+    return Q(is_completed=False, is_important=True)
+
+
+def _planned():
+    return Q(is_completed=False, due_date__isnull=False)
+
+
+def _overdue():
+    return _planned() & Q(due_date__lt=timezone.localdate())
+
+
+SMART_LISTS = {
+    smart_list.name: smart_list
+    for smart_list in [
+        SmartList("my_day", ("created_at", "id"), _my_day),
+        SmartList("important", ("created_at", "id"), _important),
+        SmartList("planned", ("due_date", "id"), _planned),
+        SmartList("overdue", ("due_date", "id"), _overdue),
+    ]
+}
@@ -1,3 +1,212 @@
+from datetime import datetime, time, timedelta
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from core.testing import create_account
+from tasklists.models import TaskList
+from .models import Label, Task
 
-# Create your tests here.
+
+class BulkTaskTests(TestCase):
+    def setUp(self):
+        self.user, self.profile, _, self.task_list, self.client = create_account()
+        self.other_list = TaskList.objects.create(name="Other", owner=self.profile)
+        self.label = Label.objects.create(name="Label", owner=self.profile)
+        self.tasks = [
+            Task.objects.create(
+                text=f"Task {number}", task_list=self.task_list, owner=self.profile
+            )
+            for number in range(5)
+        ]
+
+    def bulk(self, operations):
+        response = self.client.post(
+            "/api/tasks/bulk/", {"operations": operations}, format="json"
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()["results"]
+
+    def test_operations_are_applied(self):
+        tasks = self.tasks
+        results = self.bulk(
+            [
+                {"op": "complete", "id": tasks[0].pk},
+                {"op": "move", "id": tasks[1].pk, "task_list": self.other_list.pk},
+                {"op": "reschedule", "id": tasks[2].pk, "due_date": "2030-01-01"},
+                {"op": "update", "id": tasks[3].pk, "priority": "1"},
+                {
+                    "op": "create",
+                    "task_list": self.task_list.pk,
+                    "text": "Created",
+                    "label": self.label.pk,
+                },
+            ]
+        )
+
+        self.assertEqual([result["status"] for result in results], ["ok"] * 5)
+        self.assertTrue(Task.objects.get(pk=tasks[0].pk).is_completed)
+        self.assertEqual(
+            Task.objects.get(pk=tasks[1].pk).task_list_id, self.other_list.pk
+        )
+        self.assertEqual(str(Task.objects.get(pk=tasks[2].pk).due_date), "2030-01-01")
+        self.assertEqual(Task.objects.get(pk=tasks[3].pk).priority, "1")
+        created = Task.objects.get(pk=results[4]["id"])
+        self.assertEqual((created.text, created.label_id), ("Created", self.label.pk))
+
+    def test_invalid_operations_are_reported_and_skipped(self):
+        other = create_account("other")
+        foreign = Task.objects.create(
+            text="Foreign", task_list=other.task_list, owner=other.profile
+        )
+
+        results = self.bulk(
+            [
+                {"op": "complete", "id": self.tasks[0].pk},
+                {"op": "create", "task_list": self.task_list.pk},
+                {"op": "complete", "id": foreign.pk},
+                {"op": "unknown"},
+                {"op": "update", "id": self.tasks[1].pk, "priority": "9"},
+            ]
+        )
+
+        self.assertEqual(
+            [result["status"] for result in results],
+            ["ok", "error", "error", "error", "error"],
+        )
+        self.assertFalse(Task.objects.get(pk=foreign.pk).is_completed)
+        self.assertEqual(Task.objects.count(), 6)
+
+    def test_nested_route_is_scoped_to_its_list(self):
+        moved = Task.objects.create(
+            text="Elsewhere", task_list=self.other_list, owner=self.profile
+        )
+        response = self.client.post(
+            f"/api/lists/{self.task_list.pk}/tasks/bulk/",
+            {
+                "operations": [
+                    {"op": "create", "text": "Created"},
+                    {"op": "complete", "id": moved.pk},
+                    {"op": "complete", "id": self.tasks[0].pk},
+                    {"op": "create", "text": "Other", "task_list": self.other_list.pk},
+                ]
+            },
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 200, response.content)
+        results = response.json()["results"]
+        self.assertEqual(
+            [result["status"] for result in results], ["ok", "error", "ok", "error"]
+        )
+        created = Task.objects.get(pk=results[0]["id"])
+        self.assertEqual(created.task_list_id, self.task_list.pk)
+        self.assertFalse(Task.objects.get(pk=moved.pk).is_completed)
+
+    def test_nested_route_requires_an_owned_list(self):
+        foreign_list = create_account("other").task_list
+
+        response = self.client.post(
+            f"/api/lists/{foreign_list.pk}/tasks/bulk/",
+            {"operations": [{"op": "create", "text": "Created"}]},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 404)
+        self.assertFalse(Task.objects.filter(text="Created").exists())
+
+    def test_queries_do_not_grow_with_the_batch(self):
+        def count(tasks):
+            operations = [{"op": "complete", "id": task.pk} for task in tasks]
+            operations.append(
+                {"op": "create", "task_list": self.task_list.pk, "text": "New"}
+            )
+            with CaptureQueriesContext(connection) as context:
+                self.bulk(operations)
+            return len(context)
+
+        self.assertEqual(count(self.tasks[:1]), count(self.tasks[1:]))
+
+    def test_counters_follow_bulk_changes(self):
+        self.bulk(
+            [
+                {"op": "complete", "id": self.tasks[0].pk},
+                {"op": "move", "id": self.tasks[1].pk, "task_list": self.other_list.pk},
+            ]
+        )
+
+        self.task_list.refresh_from_db()
+        self.other_list.refresh_from_db()
+        self.assertEqual(
+            (self.task_list.task_count, self.task_list.completed_count), (4, 1)
+        )
+        self.assertEqual(self.other_list.task_count, 1)
+
+
+class SmartListTests(TestCase):
+    def setUp(self):
+        self.user, self.profile, _, self.task_list, self.client = create_account()
+        other_list = TaskList.objects.create(name="Other", owner=self.profile)
+
+        today = timezone.localdate()
+        noon = timezone.make_aware(datetime.combine(today, time(12)))
+        # created out of due date order, so the keyset order is not the id order
+        for text, task_list, fields in [
+            ("Next week", other_list, {"due_date": today + timedelta(days=7)}),
+            ("Due today", self.task_list, {"due_date": today}),
+            ("Reminder today", other_list, {"reminder_date": noon}),
+            ("Important", self.task_list, {"is_important": True}),
+            (
+                "Done",
+                self.task_list,
+                {"is_completed": True, "is_important": True, "due_date": today},
+            ),
+            ("Yesterday", self.task_list, {"due_date": today - timedelta(days=1)}),
+            ("Also today", other_list, {"due_date": today}),
+            ("Plain", self.task_list, {}),
+        ]:
+            Task.objects.create(
+                text=text, task_list=task_list, owner=self.profile, **fields
+            )
+
+        other = create_account("other")
+        Task.objects.create(
+            text="Foreign",
+            task_list=other.task_list,
+            owner=other.profile,
+            is_important=True,
+            due_date=today - timedelta(days=1),
+        )
+
+    def texts(self, url):
+        texts = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200, response.content)
+            texts += [task["text"] for task in response.json()["results"]]
+            url = response.json()["next"]
+        return texts
+
+    def test_smart_lists(self):
+        self.assertEqual(
+            sorted(self.texts("/api/tasks/my-day/")),
+            ["Also today", "Due today", "Reminder today"],
+        )
+        self.assertEqual(self.texts("/api/tasks/important/"), ["Important"])
+        self.assertEqual(
+            self.texts("/api/tasks/planned/"),
+            ["Yesterday", "Due today", "Also today", "Next week"],
+        )
+        self.assertEqual(self.texts("/api/tasks/overdue/"), ["Yesterday"])
+
+    def test_nested_smart_lists_are_scoped_to_the_list(self):
+        prefix = f"/api/lists/{self.task_list.pk}/tasks"
+        self.assertEqual(self.texts(f"{prefix}/my-day/"), ["Due today"])
+        self.assertEqual(self.texts(f"{prefix}/planned/"), ["Yesterday", "Due today"])
+
+    def test_keyset_pages_follow_due_date_then_id(self):
+        self.assertEqual(
+            self.texts("/api/tasks/planned/?page_size=1"),
+            self.texts("/api/tasks/planned/"),
+        )
+        self.assertEqual(len(self.texts("/api/tasks/planned/?page_size=3")), 4)
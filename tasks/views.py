@@ -1,16 +1,31 @@
 from rest_framework import status
+from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.viewsets import ModelViewSet
 from rest_framework.permissions import IsAuthenticated
 from django_filters.rest_framework import DjangoFilterBackend
+from core.conditional import ConditionalGetViewMixin
+from core.planner import QueryPlanViewMixin
+from core.streaming import StreamingListViewMixin
+from core.principal import PrincipalViewMixin
 from .models import Task, TaskStep, Label
-from .serializers import TaskSerializer, TaskStepSerializer, LabelSerializer
+from .serializers import (
+    TaskSerializer,
+    TaskStepSerializer,
+    LabelSerializer,
+    BulkTaskSerializer,
+)
 from .filters import TaskFilter, TaskStepFilter
+from .smart_lists import SMART_LISTS
 
 
 # Create your views here.
-class TaskViewSet(ModelViewSet):
+class TaskViewSet(
+    ConditionalGetViewMixin, PrincipalViewMixin, StreamingListViewMixin, ModelViewSet
+):
     permission_classes = [IsAuthenticated]
+    # my-day and overdue also depend on today's date
+    conditional_actions = ("list", "retrieve", "important", "planned")
     serializer_class = TaskSerializer
     filter_backends = [DjangoFilterBackend]
     filterset_class = TaskFilter
@@ -19,34 +34,34 @@ class TaskViewSet(ModelViewSet):
         user = self.request.user
         task_list_id = self.kwargs.get("list_pk", None)
 
+        queryset = self.plan_queryset(Task.objects.all())
+
         if user.is_superuser:
             if task_list_id:
-                return (
-                    Task.objects.prefetch_related("steps")
-                    .filter(task_list=task_list_id)
-                    .order_by("created_at")
-                )
+                return queryset.filter(task_list=task_list_id).order_by("created_at")
 
-            return Task.objects.prefetch_related("steps").order_by("created_at")
+            return queryset.order_by("created_at")
 
         else:
+            owner_id = self.principal.profile_id
             if not task_list_id:
-                return (
-                    Task.objects.prefetch_related("steps")
-                    .filter(owner__user=user)
-                    .order_by("created_at")
-                )
-
-            return (
-                Task.objects.prefetch_related("steps")
-                .filter(owner__user=user, task_list=task_list_id)
-                .order_by("created_at")
+                return queryset.filter(owner_id=owner_id).order_by("created_at")
+
+            return queryset.filter(owner_id=owner_id, task_list=task_list_id).order_by(
+                "created_at"
             )
 
+    def get_serializer_class(self):
+        if self.action == "bulk":
+            return BulkTaskSerializer
+        return TaskSerializer
+
     def get_serializer_context(self):
         return {
             "user": self.request.user,
+            "principal": self.principal,
             "task_list_id": self.kwargs.get("list_pk", None),
+            "fieldset": self.get_fieldset(),
         }
 
     def create(self, request, *args, **kwargs):
@@ -62,34 +77,89 @@ class TaskViewSet(ModelViewSet):
 
         return super().create(request, *args, **kwargs)
 
+    @action(detail=False, methods=["post"])
+    def bulk(self, request, *args, **kwargs):
+        serializer = BulkTaskSerializer(
+            data=request.data, context=self.get_serializer_context()
+        )
+        serializer.is_valid(raise_exception=True)
+        results = serializer.save()
+        return Response({"results": results}, status=status.HTTP_200_OK)
+
+    def smart_list(self, name):
+        # smart lists are always owner scoped, superusers included
+        smart_list = SMART_LISTS[name]
+        self.cursor_ordering = smart_list.ordering
+
+        queryset = Task.objects.filter(owner_id=self.principal.profile_id)
+        task_list_id = self.kwargs.get("list_pk", None)
+        if task_list_id:
+            queryset = queryset.filter(task_list=task_list_id)
+
+        queryset = self.plan_queryset(queryset.filter(smart_list.get_filter()))
+        queryset = self.filter_queryset(queryset)
+
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+    @action(detail=False, methods=["get"], url_path="my-day")
+    def my_day(self, request, *args, **kwargs):
+        return self.smart_list("my_day")
+
+    @action(detail=False, methods=["get"])
+    def important(self, request, *args, **kwargs):
+        return self.smart_list("important")
 
-class TaskStepViewSet(ModelViewSet):
+    @action(detail=False, methods=["get"])
+    def planned(self, request, *args, **kwargs):
+        return self.smart_list("planned")
+
+    @action(detail=False, methods=["get"])
+    def overdue(self, request, *args, **kwargs):
+        return self.smart_list("overdue")
+
+
+class TaskStepViewSet(
+    ConditionalGetViewMixin, PrincipalViewMixin, QueryPlanViewMixin, ModelViewSet
+):
     serializer_class = TaskStepSerializer
     permission_classes = [IsAuthenticated]
     filter_backends = [DjangoFilterBackend]
     filterset_class = TaskStepFilter
 
     def get_queryset(self):
-        user = self.request.user
         task_id = self.kwargs.get("task_pk", None)
 
-        return TaskStep.objects.filter(task=task_id, task__owner__user=user).order_by(
-            "created_at"
-        )
+        return self.plan_queryset(
+            TaskStep.objects.filter(
+                task=task_id, task__owner_id=self.principal.profile_id
+            )
+        ).order_by("created_at")
 
     def get_serializer_context(self):
         return {
             "user": self.request.user,
+            "principal": self.principal,
             "task_id": self.kwargs.get("task_pk", None),
+            "fieldset": self.get_fieldset(),
         }
 
 
-class LabelViewSet(ModelViewSet):
+class LabelViewSet(
+    ConditionalGetViewMixin, PrincipalViewMixin, QueryPlanViewMixin, ModelViewSet
+):
     permission_classes = [IsAuthenticated]
     serializer_class = LabelSerializer
 
     def get_serializer_context(self):
-        return {"user": self.request.user}
+        return {
+            "user": self.request.user,
+            "principal": self.principal,
+            "fieldset": self.get_fieldset(),
+        }
 
     def get_queryset(self):
-        return Label.objects.filter(owner__user=self.request.user)
+        return self.plan_queryset(
+            Label.objects.filter(owner_id=self.principal.profile_id)
+        )